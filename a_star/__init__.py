@@ -0,0 +1,47 @@
+"""A* pathfinding over GridWorld maps.
+
+The search core (grid + engines) never imports pygame, so it can be used from
+batch workers and display-less servers. The interactive visualizer lives in
+``a_star.visual`` and is only imported when one of its names is accessed.
+"""
+import importlib
+
+from .grid import (GridWorld, DEFAULT_N, MIN_N, MAX_N, MAX_CELLS, DEFAULT_DENSITY, FREE, OBSTACLE, START, GOAL,
+                   MIN_COST, MAX_COST)
+from .search import neighbors_of, manhattan_cost, reconstruct_path, astar_generator, astar, astar_steps, SearchResult
+from .heuristics import HEURISTICS, Heuristic, get_heuristic, register_heuristic, scale_heuristic, DEFAULT_HEURISTIC
+from .flat import FlatGrid, astar_flat
+from .jps import jps, jps_steps
+from .bidir import bidirectional_astar, bidirectional_steps
+from .hpa import HPAGraph, hpa
+from .anyangle import line_of_sight, theta_star, lazy_theta_star, smooth_path, SmoothedPath, path_length, densify
+from .anytime import ara_star, ara_star_iter
+from .engines import ENGINES, STEPPERS, DEFAULT_ENGINE, find_path, engine_steps, no_path_result, default_heuristic
+from .stats import SearchStats, INSTRUMENTED_ENGINES, register_hook, unregister_hook, hooks_enabled
+from .cache import PathCache, cached_find_path
+from .dstar import DStarLite
+from .components import ComponentIndex
+from .multi import nearest_goals, distance_matrix, DistanceMatrix
+from .export import (ExportRecord, NdjsonWriter, BinaryWriter, open_writer, read_ndjson, read_binary,
+                     read_export, encode_rle, decode_rle)
+
+# names imported on first access: the visualizer, so pygame is only loaded when
+# the UI is requested, and the modules with a CLI, so `python -m a_star.batch`
+# (mapfile, trace) does not find its module already imported by the package
+_LAZY_NAMES = {
+    "visual": ("main", "draw_grid", "Button", "Slider"),
+    "batch": ("batch_search",),
+    "mapfile": ("MapFile", "MapFormatError", "save_map", "open_map", "create_map"),
+    "trace": ("TraceWriter", "Trace", "TraceReplayer", "record", "record_search", "read_trace"),
+}
+_LAZY = {name: module for module, names in _LAZY_NAMES.items() for name in names}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is not None:
+        return getattr(importlib.import_module(f".{module}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,220 @@
+"""
+Any-angle paths: Theta*, Lazy Theta* and line-of-sight smoothing.
+
+Cells are unit squares centred on integer coordinates and a path is a list of
+waypoints joined by straight segments. A segment is walkable when every cell
+it crosses is free; where it passes exactly through a grid corner both cells
+beside the corner must be free, which is the no-corner-cutting rule of
+neighbors_of. Costs are 10 x Euclidean length (a grid step still costs 10, a
+diagonal one 14.14), rounded to an int in the results.
+
+    theta       Theta*: a neighbor takes the parent of the expanded cell as
+                its own parent whenever the two see each other
+    lazytheta   Lazy Theta*: assumes line of sight when generating and only
+                checks it on expansion (far fewer checks, near-identical paths)
+    smooth_path post-processing for any engine's path: keeps a waypoint
+                only where the line of sight from the previous one breaks
+
+Any-angle costs are not comparable with the grid costs of the other engines
+and come with no optimality bound (bound=inf). Terrain weights are not
+supported: a straight segment would ignore them.
+"""
+import heapq
+import math
+import time
+from collections import namedtuple
+
+from .grid import GridWorld, OBSTACLE
+from .search import SearchResult, neighbors_of, _entry_node
+from .heuristics import get_heuristic
+from .stats import HeapCounter
+
+INF = float('inf')
+
+# the heuristic that is admissible for straight segments
+DEFAULT_ANY_ANGLE_HEURISTIC = "euclidean"
+
+SmoothedPath = namedtuple("SmoothedPath", ["path", "cost", "original_cost"])
+
+
+def line_of_sight(gw: GridWorld, a, b):
+    """
+    True if the straight segment between the centres of cells a and b is
+    walkable. cells may be a bytearray or a memoryview (from_buffer grids).
+    """
+    cells, W = gw.cells, gw.width
+    x0, y0 = a
+    x1, y1 = b
+    if y0 == y1:
+        lo, hi = (x0, x1) if x0 <= x1 else (x1, x0)
+        return OBSTACLE not in cells[y0*W + lo:y0*W + hi + 1]
+    if x0 == x1:
+        lo, hi = (y0, y1) if y0 <= y1 else (y1, y0)
+        return OBSTACLE not in cells[lo*W + x0:hi*W + x0 + 1:W]
+    # supercover walk with integer error terms (Amanatides-Woo on doubled coordinates)
+    dx, dy = abs(x1 - x0), abs(y1 - y0)
+    sx = 1 if x1 > x0 else -1
+    sy = W if y1 > y0 else -W
+    i = y0*W + x0
+    err = dx - dy
+    dx *= 2
+    dy *= 2
+    n = dx // 2 + dy // 2
+    if cells[i] == OBSTACLE:
+        return False
+    while n > 0:
+        if err > 0:
+            i += sx
+            err -= dy
+        elif err < 0:
+            i += sy
+            err += dx
+        else:
+            # exactly through a corner: both cells beside it must be free
+            if cells[i + sx] == OBSTACLE or cells[i + sy] == OBSTACLE:
+                return False
+            i += sx + sy
+            err += dx - dy
+            n -= 1
+        n -= 1
+        if cells[i] == OBSTACLE:
+            return False
+    return True
+
+def _dist(a, b):
+    return 10 * math.hypot(a[0] - b[0], a[1] - b[1])
+
+def path_length(path):
+    """Any-angle cost of a waypoint (or grid) path: 10 x Euclidean length, rounded."""
+    return round(sum(_dist(a, b) for a, b in zip(path, path[1:])))
+
+def _check_uniform(gw):
+    if gw.costs is not None:
+        raise ValueError("any-angle paths need uniform cell costs")
+
+
+def _theta(gw, start, goal, heuristic, weight, lazy, stats):
+    start_time = time.perf_counter()
+    _check_uniform(gw)
+    heur = get_heuristic(heuristic, weight)
+    h = heur.fn
+    gx, gy = goal
+    g_score = {start: 0.0}
+    parent = {start: start}
+    closed = set()
+    open_heap = [(h(abs(start[0]-gx), abs(start[1]-gy)), 0, start)]
+    counter = 0
+    nodes_expanded = 0
+    evals = 0
+    push, pop = heapq.heappush, heapq.heappop
+    if stats is not None:
+        hc = HeapCounter(stats, start_time, closed.__contains__, _entry_node, (start,))
+        push, pop = hc.push, hc.pop
+    while open_heap:
+        _, _, cur = pop(open_heap)
+        if cur in closed:
+            continue
+        closed.add(cur)
+        if lazy and parent[cur] != cur:
+            if not line_of_sight(gw, parent[cur], cur):
+                # the assumed shortcut is blocked: best closed neighbor instead
+                best, best_g = None, INF
+                for nb, _ in neighbors_of(cur, gw):
+                    if nb in closed and g_score[nb] + _dist(nb, cur) < best_g:
+                        best, best_g = nb, g_score[nb] + _dist(nb, cur)
+                parent[cur], g_score[cur] = best, best_g
+        if cur == goal:
+            if stats is not None:
+                hc.found()
+            path = [cur]
+            while parent[cur] != cur:
+                cur = parent[cur]
+                path.append(cur)
+            path.reverse()
+            t_ms = (time.perf_counter() - start_time) * 1000
+            if stats is not None:
+                closed.discard(goal)  # closed before the goal test, never expanded
+                hc.finish(nodes_expanded, counter + 1, evals)
+            return SearchResult(path, round(g_score[goal]), nodes_expanded, t_ms, INF, counter + 1)
+        nodes_expanded += 1
+        pc = parent[cur]
+        g_pc = g_score[pc]
+        for nb, _ in neighbors_of(cur, gw):
+            nx, ny = nb
+            if gw.grid[ny][nx] == OBSTACLE:
+                continue
+            if stats is not None:
+                evals += 1
+            if nb in closed:
+                continue
+            if lazy:
+                # path 2 assumed; verified when nb is expanded
+                cand, tentative_g = pc, g_pc + _dist(pc, nb)
+            elif line_of_sight(gw, pc, nb):
+                cand, tentative_g = pc, g_pc + _dist(pc, nb)
+            else:
+                cand, tentative_g = cur, g_score[cur] + _dist(cur, nb)
+            if tentative_g < g_score.get(nb, INF):
+                g_score[nb] = tentative_g
+                parent[nb] = cand
+                counter += 1
+                push(open_heap, (tentative_g + h(abs(nx-gx), abs(ny-gy)), counter, nb))
+    t_ms = (time.perf_counter() - start_time) * 1000
+    if stats is not None:
+        hc.finish(nodes_expanded, counter + 1, evals)
+    return SearchResult(None, None, nodes_expanded, t_ms, INF, counter + 1)
+
+def theta_star(gw: GridWorld, start, goal, heuristic=DEFAULT_ANY_ANGLE_HEURISTIC, weight=1.0, stats=None):
+    """Theta*. Returns a SearchResult whose path is a waypoint list."""
+    return _theta(gw, start, goal, heuristic, weight, lazy=False, stats=stats)
+
+def lazy_theta_star(gw: GridWorld, start, goal, heuristic=DEFAULT_ANY_ANGLE_HEURISTIC, weight=1.0, stats=None):
+    """Lazy Theta*. Returns a SearchResult whose path is a waypoint list."""
+    return _theta(gw, start, goal, heuristic, weight, lazy=True, stats=stats)
+
+
+def smooth_path(gw: GridWorld, path):
+    """
+    Shortcut path (from any engine) by line of sight. Returns a SmoothedPath
+    with the waypoints and both costs in the any-angle metric.
+    """
+    _check_uniform(gw)
+    if not path:
+        return SmoothedPath(path, None, None)
+    out = [path[0]]
+    for k in range(1, len(path) - 1):
+        if not line_of_sight(gw, out[-1], path[k + 1]):
+            out.append(path[k])
+    if len(path) > 1:
+        out.append(path[-1])
+    return SmoothedPath(out, path_length(out), path_length(path))
+
+def densify(path):
+    """
+    Waypoints back to one cell per grid move: the cells each segment crosses,
+    in order (the walk of line_of_sight), so every move is legal on the grid.
+    """
+    if not path:
+        return path
+    out = [path[0]]
+    for (x1, y1) in path[1:]:
+        x, y = out[-1]
+        dx, dy = abs(x1 - x), abs(y1 - y)
+        sx = (x1 > x) - (x1 < x)
+        sy = (y1 > y) - (y1 < y)
+        err = dx - dy
+        dx *= 2
+        dy *= 2
+        while (x, y) != (x1, y1):
+            if err > 0:
+                x += sx
+                err -= dy
+            elif err < 0:
+                y += sy
+                err += dx
+            else:
+                x += sx
+                y += sy
+                err += dx - dy
+            out.append((x, y))
+    return out
@@ -0,0 +1,164 @@
+"""
+Anytime search: ARA* (Anytime Repairing A*) on the FlatGrid tables.
+
+ARA* runs weighted A* with a large inflation first (f = g + e*h), which finds
+a path within e times the optimum after few expansions, then lowers e and
+repairs the same search instead of starting over: cells whose g improved
+after they were expanded are kept aside (INCONS) and only those and the open
+list are reconsidered. Every pass yields a SearchResult whose bound is the
+proven suboptimality of that path, min(e, cost / min over open and INCONS of
+g + h), times the heuristic's own bound. Passes continue until the bound
+reaches weight (1.0: optimal) or a budget runs out:
+    deadline_ms   wall-clock budget from the call, checked every 64 expansions
+    max_nodes     expansion budget over all passes
+    cancel        any object with is_set() (e.g. threading.Event), for
+                  cooperative cancellation from another thread
+The last result yielded before a budget stops the search is the best one;
+closing the generator cancels it too.
+"""
+import heapq
+import time
+
+from .grid import GridWorld
+from .flat import FlatGrid, _UNSEEN, _ID_BITS, _ID_MASK, _KEY_SHIFT
+from .search import SearchResult
+from .heuristics import get_heuristic, scale_heuristic, DEFAULT_HEURISTIC
+
+DEFAULT_INITIAL_WEIGHT = 3.0
+DEFAULT_WEIGHT_STEP = 0.5
+# budgets and cancellation are checked every this many expansions
+_CHECK_EVERY = 64
+
+
+def ara_star_iter(gw: GridWorld, start, goal, heuristic=DEFAULT_HEURISTIC, weight=1.0,
+                  initial_weight=DEFAULT_INITIAL_WEIGHT, weight_step=DEFAULT_WEIGHT_STEP,
+                  deadline_ms=None, max_nodes=None, cancel=None, fg=None):
+    """
+    Yield a SearchResult per ARA* pass, each with a cost no higher and a bound
+    no looser than the previous one; nodes_expanded and time_ms count from the
+    call. Nothing is yielded if the goal is unreachable or the budget runs out
+    before the first path. Returns (nodes_expanded, heap_pushes).
+    """
+    start_time = time.perf_counter()
+    if weight < 1:
+        raise ValueError("weight must be >= 1")
+    if weight_step <= 0:
+        raise ValueError("weight_step must be positive")
+    heur = get_heuristic(heuristic)
+    if fg is None:
+        fg = FlatGrid(gw)
+    hfn = scale_heuristic(heur, fg.w_min).fn
+    deadline = None if deadline_ms is None else start_time + deadline_ms / 1000
+    limit = _UNSEEN if max_nodes is None else max_nodes
+    W = fg.W
+    moves, mask, weights = fg.moves, fg.mask, fg.weights
+    size = len(fg.blocked)
+    g_score = [_UNSEEN] * size
+    parent = [-1] * size
+    in_open = bytearray(size)
+    s, t = fg.to_id(start), fg.to_id(goal)
+    gy, gx = divmod(t, W)
+    to_xy = fg.to_xy
+
+    def h(i):
+        y, x = divmod(i, W)
+        return hfn(abs(x-gx), abs(y-gy))
+
+    g_score[s] = 0
+    if s == t:
+        yield SearchResult([start], 0, 0, (time.perf_counter() - start_time) * 1000, heur.bound, 1)
+        return 0, 1
+    eps = max(initial_weight, weight)
+    open_ids = {s}
+    in_open[s] = 1
+    counter = 0
+    expanded = 0
+    push, pop = heapq.heappush, heapq.heappop
+
+    while True:
+        # OPEN (with INCONS merged in) keyed for this pass's inflation
+        heap = []
+        for i in open_ids:
+            counter += 1
+            heap.append((g_score[i] + int(eps * h(i))) << _KEY_SHIFT | counter << _ID_BITS | i)
+        heapq.heapify(heap)
+        closed = bytearray(size)
+        incons = set()
+        while heap and g_score[t] > heap[0] >> _KEY_SHIFT:
+            cur = pop(heap) & _ID_MASK
+            if not in_open[cur]:
+                continue
+            if expanded >= limit:
+                return expanded, counter + 1
+            if not expanded % _CHECK_EVERY and (
+                    deadline is not None and time.perf_counter() > deadline
+                    or cancel is not None and cancel.is_set()):
+                return expanded, counter + 1
+            in_open[cur] = 0
+            closed[cur] = 1
+            expanded += 1
+            g_cur = g_score[cur]
+            for off, cost in moves[mask[cur]]:
+                nb = cur + off
+                if weights is not None:
+                    cost = cost // 2 * (weights[cur] + weights[nb])
+                tentative_g = g_cur + cost
+                if tentative_g < g_score[nb]:
+                    g_score[nb] = tentative_g
+                    parent[nb] = cur
+                    if closed[nb]:
+                        # already expanded in this pass: reconsidered in the next one
+                        incons.add(nb)
+                    else:
+                        in_open[nb] = 1
+                        counter += 1
+                        push(heap, (tentative_g + int(eps * h(nb))) << _KEY_SHIFT | counter << _ID_BITS | nb)
+        if g_score[t] == _UNSEEN:
+            return expanded, counter + 1
+        open_ids = {e & _ID_MASK for e in heap if in_open[e & _ID_MASK]}
+        open_ids |= incons
+        for i in incons:
+            in_open[i] = 1
+        # the parents of cells improved after their expansion already point to
+        # the better routes, so the path can cost less than g(goal): walk it
+        path = [to_xy(t)]
+        cost = 0
+        cur = t
+        while cur != s:
+            prev = parent[cur]
+            step = 10 if abs(cur - prev) in (1, W) else 14
+            cost += step if weights is None else step // 2 * (weights[prev] + weights[cur])
+            path.append(to_xy(prev))
+            cur = prev
+        path.reverse()
+        # every cell still to reconsider bounds the optimal cost from below
+        lower = min((g_score[i] + h(i) for i in open_ids), default=cost)
+        bound = 1.0 if lower >= cost else min(eps, cost / lower)
+        t_ms = (time.perf_counter() - start_time) * 1000
+        yield SearchResult(path, cost, expanded, t_ms, bound * heur.bound, counter + 1)
+        if bound <= weight:
+            return expanded, counter + 1
+        # no point inflating beyond what is already proven
+        eps = max(weight, min(eps - weight_step, bound))
+
+def ara_star(gw: GridWorld, start, goal, heuristic=DEFAULT_HEURISTIC, weight=1.0,
+             initial_weight=DEFAULT_INITIAL_WEIGHT, weight_step=DEFAULT_WEIGHT_STEP,
+             deadline_ms=None, max_nodes=None, cancel=None, fg=None):
+    """
+    Engine entry point: the best path ARA* finds within the budgets (optimal
+    within weight if they allow). nodes_expanded and time_ms cover the whole run.
+    """
+    start_time = time.perf_counter()
+    it = ara_star_iter(gw, start, goal, heuristic, weight, initial_weight, weight_step,
+                       deadline_ms, max_nodes, cancel, fg)
+    best = None
+    while True:
+        try:
+            best = next(it)
+        except StopIteration as stop:
+            expanded, pushes = stop.value
+            break
+    t_ms = (time.perf_counter() - start_time) * 1000
+    if best is None:
+        return SearchResult(None, None, expanded, t_ms, get_heuristic(heuristic).bound * weight, pushes)
+    return best._replace(nodes_expanded=expanded, time_ms=t_ms, heap_pushes=pushes)
@@ -0,0 +1,311 @@
+"""
+Batch queries: many start/goal pairs over one GridWorld in a process pool.
+
+The grid (and its terrain cost layer, if any) is copied once into shared
+memory; every worker maps that block read-only, wraps it with
+GridWorld.from_buffer and builds its FlatGrid once,
+so tasks only carry the query coordinates. A GridWorld opened from a map
+file (a_star.mapfile) is not copied at all: each worker maps the same file,
+sharing the page cache. Results are streamed back in query order
+(ordered=True) or as soon as each chunk completes.
+
+CLI:
+    python -m a_star.batch --size 500 --density 0.25 --seed 1 --random-queries 10000
+    python -m a_star.batch --map mapa.txt --queries consultas.txt --workers 8 > out.ndjson
+    python -m a_star.batch --map mapa.astm --random-queries 1000
+    python -m a_star.batch --size 2000 --format binary --path-encoding rle --out rutas.bin
+    python -m a_star.batch --map mapa.astm --trace-dir trazas --trace-every 100
+Each query line is "sx sy gx gy". Output is NDJSON (one object per query) or
+the binary format of a_star.export, streamed as results arrive. With a trace
+directory every trace_every-th query is run through its stepper and recorded
+to <dir>/<index>.astt (a_star.trace) for offline replay.
+"""
+import argparse
+import os
+import queue
+import random
+import sys
+from contextlib import ExitStack, contextmanager
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+from .grid import GridWorld, FREE, OBSTACLE
+from .flat import FlatGrid
+from .hpa import HPAGraph
+from .mapfile import MAGIC, open_map
+from .export import open_writer
+from .anyangle import densify
+from .trace import record_search
+from .engines import get_engine, no_path_result, default_heuristic, DEFAULT_ENGINE
+from .components import ComponentIndex
+
+# engines that can reuse a prebuilt FlatGrid through fg=
+_FG_ENGINES = ("flat", "jps", "bidir")
+# engines returning any-angle waypoints, densified for the "rle" encodings
+_WAYPOINT_ENGINES = ("theta", "lazytheta")
+
+# per-process state set by _init_worker
+_WORKER = {}
+
+
+def _setup(gw, engine, heuristic, weight, components, trace=None):
+    if heuristic is None:
+        heuristic = default_heuristic(engine)
+    _WORKER["gw"] = gw
+    _WORKER["query"] = (engine, heuristic, weight)
+    # (directory, every) when sampled queries are recorded as traces
+    _WORKER["trace"] = trace
+    _WORKER["fn"] = get_engine(engine)
+    _WORKER["kwargs"] = {"heuristic": heuristic, "weight": weight}
+    # unreachable queries are answered from the component labels without searching
+    _WORKER["components"] = ComponentIndex(gw) if components else None
+    _WORKER["no_path"] = no_path_result(heuristic, weight)
+    if engine in _FG_ENGINES:
+        _WORKER["kwargs"]["fg"] = FlatGrid(gw)
+    elif engine == "hpa":
+        # abstract graph built once per worker
+        _WORKER["kwargs"]["graph"] = HPAGraph(gw)
+
+def _costs_offset(size):
+    # the uint16 cost layer starts at the first even offset after the cells
+    return size + (size & 1)
+
+def _init_worker(shm_name, width, height, costs, engine, heuristic, weight, components, trace=None):
+    # pool workers share the parent's resource tracker, and the parent unlinks the block
+    shm = SharedMemory(name=shm_name)
+    _WORKER["shm"] = shm
+    size = width * height
+    gw = GridWorld.from_buffer(width, shm.buf[:size], height=height)
+    if costs:
+        off = _costs_offset(size)
+        gw.costs = shm.buf[off:off + 2*size].cast('H')
+    _setup(gw, engine, heuristic, weight, components, trace)
+
+def _init_worker_file(path, engine, heuristic, weight, components, trace=None):
+    _setup(open_map(path), engine, heuristic, weight, components, trace)
+
+def _run_chunk(chunk):
+    gw, fn, kwargs = _WORKER["gw"], _WORKER["fn"], _WORKER["kwargs"]
+    comp, no_path = _WORKER["components"], _WORKER["no_path"]
+    trace = _WORKER["trace"]
+    out = []
+    for i, s, t in chunk:
+        if comp is not None and not comp.connected(s, t):
+            res = no_path
+        elif trace is not None and i % trace[1] == 0:
+            with open(os.path.join(trace[0], f"{i}.astt"), "wb") as f:
+                res = record_search(gw, s, t, f, *_WORKER["query"])
+        else:
+            res = fn(gw, s, t, **kwargs)
+        out.append((i, s, t, res))
+    return out
+
+def _chunks(queries, size):
+    chunk = []
+    for i, (s, t) in enumerate(queries):
+        chunk.append((i, tuple(s), tuple(t)))
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def batch_search(gw: GridWorld, queries, engine=DEFAULT_ENGINE, heuristic=None, weight=1.0,
+                 workers=None, ordered=True, chunksize=64, components=True, trace_dir=None, trace_every=1):
+    """
+    Run every (start, goal) pair in queries against gw.
+
+    Yields (index, start, goal, SearchResult). queries may be any iterable,
+    including an unbounded stream: at most a few chunks per worker are in
+    flight at once. workers=None uses every core; workers<=1 runs in-process.
+    components=True labels the grid once per worker so unreachable queries
+    return immediately (nodes_expanded 0). trace_dir records every
+    trace_every-th query as <trace_dir>/<index>.astt.
+    """
+    get_engine(engine)  # fail fast on a bad name
+    trace = None
+    if trace_dir is not None:
+        os.makedirs(trace_dir, exist_ok=True)
+        trace = (trace_dir, max(1, trace_every))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        _setup(gw, engine, heuristic, weight, components, trace)
+        for chunk in _chunks(queries, chunksize):
+            yield from _run_chunk(chunk)
+        return
+
+    with worker_pool(gw, workers, engine, heuristic, weight, components, trace) as pool:
+        yield from _stream(pool, queries, workers * 4, ordered, chunksize)
+
+@contextmanager
+def worker_pool(gw: GridWorld, workers, engine=DEFAULT_ENGINE, heuristic=None, weight=1.0,
+                components=False, trace=None):
+    """
+    Pool whose workers hold gw (shared memory or the mapped map file) and the
+    per-engine state in _WORKER, for any task function that reads it.
+    """
+    map_file = getattr(gw, "map_file", None)
+    if map_file is not None and gw.version == gw.map_version:
+        # unmodified since it was opened: the workers map the file themselves
+        with Pool(workers, initializer=_init_worker_file, initargs=(map_file.path, engine, heuristic, weight, components, trace)) as pool:
+            yield pool
+        return
+
+    size = len(gw.cells)
+    costs = gw.costs is not None
+    shm = SharedMemory(create=True, size=_costs_offset(size) + 2*size if costs else size)
+    try:
+        shm.buf[:size] = gw.cells
+        if costs:
+            off = _costs_offset(size)
+            shm.buf[off:off + 2*size] = memoryview(gw.costs).cast('B')
+        with Pool(workers, initializer=_init_worker,
+                  initargs=(shm.name, gw.width, gw.height, costs, engine, heuristic, weight, components, trace)) as pool:
+            yield pool
+    finally:
+        shm.close()
+        shm.unlink()
+
+def _stream(pool, queries, window, ordered, chunksize):
+    # keep at most `window` chunks in flight; reorder results if asked to
+    done = queue.Queue()
+    in_flight = 0
+    pending = {}
+    next_index = 0
+
+    def collect(block):
+        nonlocal in_flight, next_index
+        try:
+            ok, payload = done.get(block=block)
+        except queue.Empty:
+            return
+        in_flight -= 1
+        if not ok:
+            raise payload
+        if not ordered:
+            yield from payload
+            return
+        for item in payload:
+            pending[item[0]] = item
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
+
+    for chunk in _chunks(queries, chunksize):
+        pool.apply_async(_run_chunk, (chunk,),
+                         callback=lambda r: done.put((True, r)),
+                         error_callback=lambda e: done.put((False, e)))
+        in_flight += 1
+        while in_flight >= window:
+            yield from collect(True)
+        yield from collect(False)
+    while in_flight:
+        yield from collect(True)
+
+
+# --- CLI ---
+def load_map(path):
+    """Binary .astm map (memory-mapped) or ASCII map, detected from the file's first bytes."""
+    with open(path, "rb") as f:
+        binary = f.read(len(MAGIC)) == MAGIC
+    return open_map(path) if binary else load_ascii_map(path)
+
+def load_ascii_map(path):
+    """Map as text, one line per row: '#' obstacle, anything else free. Returns a GridWorld."""
+    with open(path, encoding="utf-8") as f:
+        rows = [line.rstrip("\n") for line in f if line.strip()]
+    if not rows:
+        raise ValueError(f"{path}: empty map")
+    W = len(rows[0])
+    gw = GridWorld(width=W, height=len(rows))
+    for y, row in enumerate(rows):
+        if len(row) != W:
+            raise ValueError(f"{path}: row {y} has {len(row)} cells, expected {W}")
+        gw.cells[y*W:(y+1)*W] = bytes(OBSTACLE if c == "#" else FREE for c in row)
+    return gw
+
+def _read_queries(f):
+    for line in f:
+        parts = line.split()
+        if len(parts) == 4:
+            sx, sy, gx, gy = map(int, parts)
+            yield (sx, sy), (gx, gy)
+
+def _random_queries(gw, count, seed):
+    # rejection sampling: no list of free cells, so huge mapped maps stay untouched
+    rng = random.Random(seed)
+    W = gw.width
+    cells = gw.cells
+    def free_cell():
+        for _ in range(1000):
+            i = rng.randrange(len(cells))
+            if cells[i] != OBSTACLE:
+                return (i % W, i // W)
+        raise ValueError("could not find free cells for random queries")
+    for _ in range(count):
+        yield free_cell(), free_cell()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m a_star.batch", description="Batch A* queries over one map.")
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--map", help="binary .astm map or ASCII map file ('#' = obstacle)")
+    src.add_argument("--size", type=int, default=200, help="width of the random map")
+    ap.add_argument("--height", type=int, default=None, help="height of the random map (default: --size)")
+    ap.add_argument("--density", type=float, default=0.2)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--queries", help="file with 'sx sy gx gy' per line ('-' = stdin)")
+    ap.add_argument("--random-queries", type=int, default=1000, help="number of random queries if --queries is not given")
+    ap.add_argument("--engine", default=DEFAULT_ENGINE)
+    ap.add_argument("--heuristic", default=None, help="default: the engine's own (octile; euclidean for theta)")
+    ap.add_argument("--weight", type=float, default=1.0)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--unordered", action="store_true", help="emit results as they complete")
+    ap.add_argument("--no-components", action="store_true", help="search unreachable queries instead of rejecting them")
+    ap.add_argument("--paths", action="store_true", help="include the full path (same as --path-encoding coords)")
+    ap.add_argument("--path-encoding", choices=("coords", "rle", "none"), default=None,
+                    help="path in each record: coordinate list, run-length directions (any-angle "
+                         "paths are densified first), or none (default)")
+    ap.add_argument("--format", choices=("ndjson", "binary"), default="ndjson")
+    ap.add_argument("--out", help="output file (default: stdout)")
+    ap.add_argument("--trace-dir", help="record search traces (a_star.trace) of sampled queries in this directory")
+    ap.add_argument("--trace-every", type=int, default=1, help="record one query in N (with --trace-dir)")
+    args = ap.parse_args(argv)
+
+    if args.map:
+        gw = load_map(args.map)
+    else:
+        gw = GridWorld(width=args.size, height=args.height or args.size, density=args.density)
+        gw.randomize_obstacles(seed=args.seed)
+
+    with ExitStack() as stack:
+        # queries are streamed to the workers: the file stays open for the whole run
+        if args.queries == "-":
+            queries = _read_queries(sys.stdin)
+        elif args.queries:
+            queries = _read_queries(stack.enter_context(open(args.queries, encoding="utf-8")))
+        else:
+            queries = _random_queries(gw, args.random_queries, args.seed)
+
+        encoding = args.path_encoding or ("coords" if args.paths else "none")
+        binary = args.format == "binary"
+        if args.out:
+            out = stack.enter_context(open(args.out, "wb" if binary else "w",
+                                           encoding=None if binary else "utf-8"))
+        else:
+            out = sys.stdout.buffer if binary else sys.stdout
+        writer = open_writer(out, args.format, None if encoding == "none" else encoding, width=gw.width)
+        dense = encoding == "rle" and args.engine in _WAYPOINT_ENGINES
+        try:
+            for i, s, t, res in batch_search(gw, queries, args.engine, args.heuristic, args.weight,
+                                             workers=args.workers, ordered=not args.unordered,
+                                             components=not args.no_components,
+                                             trace_dir=args.trace_dir, trace_every=args.trace_every):
+                if dense and res.path:
+                    res = res._replace(path=densify(res.path))
+                writer.write_result(i, s, t, res)
+        finally:
+            writer.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Reproducible benchmark suite for the search engines.
+
+Every map and query set is derived from --seed, so two runs on the same
+version measure exactly the same work. For each (map, engine, heuristic)
+the suite reports nodes expanded and heap pushes (deterministic), wall-time
+percentiles over --repeats passes, and the tracemalloc peak of one extra
+pass. Results are written as JSON; --baseline compares against a previous
+file and exits with status 1 on regressions.
+
+    python -m a_star.bench --sizes 64,256,1024 --engines flat,jps --out bench.json
+    python -m a_star.bench --out new.json --baseline bench.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from .grid import GridWorld, OBSTACLE, FREE
+from .engines import ENGINES, get_engine
+from .heuristics import get_heuristic
+
+
+# --- map generators (all seeded) ---
+def random_map(N, density, seed):
+    gw = GridWorld(N=N, density=density)
+    gw.randomize_obstacles(density, seed=seed)
+    return gw
+
+def open_map(N, seed=0):
+    # open field: no obstacles at all
+    return GridWorld(N=N, density=0.0)
+
+def maze_map(N, seed):
+    """Perfect maze (iterative backtracker): rooms on even coordinates, walls elsewhere."""
+    rng = random.Random(seed)
+    gw = GridWorld(N=N, density=0.0)
+    gw.cells[:] = bytes([OBSTACLE]) * (N * N)
+    rooms = (N + 1) // 2
+    seen = bytearray(rooms * rooms)
+    stack = [(0, 0)]
+    seen[0] = 1
+    gw.cells[0] = FREE
+    while stack:
+        cx, cy = stack[-1]
+        options = [(dx, dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                   if 0 <= cx + dx < rooms and 0 <= cy + dy < rooms and not seen[(cy + dy) * rooms + cx + dx]]
+        if not options:
+            stack.pop()
+            continue
+        dx, dy = rng.choice(options)
+        nx, ny = cx + dx, cy + dy
+        seen[ny * rooms + nx] = 1
+        # open the wall between the rooms and the new room itself
+        gw.cells[(2*cy + dy) * N + 2*cx + dx] = FREE
+        gw.cells[2*ny * N + 2*nx] = FREE
+        stack.append((nx, ny))
+    gw.touch()
+    return gw
+
+def make_queries(gw, count, seed):
+    rng = random.Random(seed)
+    W = gw.width
+    free = [i for i, c in enumerate(gw.cells) if c != OBSTACLE]
+    out = []
+    for _ in range(count):
+        a, b = rng.choice(free), rng.choice(free)
+        out.append(((a % W, a // W), (b % W, b // W)))
+    return out
+
+def build_maps(sizes, densities, kinds, seed):
+    """Yields (label, GridWorld, meta) for every requested map."""
+    for N in sizes:
+        if "random" in kinds:
+            for d in densities:
+                yield f"random-{N}-{d:g}", random_map(N, d, seed), {"kind": "random", "size": N, "density": d}
+        if "maze" in kinds:
+            yield f"maze-{N}", maze_map(N, seed), {"kind": "maze", "size": N, "density": None}
+        if "open" in kinds:
+            yield f"open-{N}", open_map(N), {"kind": "open", "size": N, "density": 0.0}
+
+
+# --- measurement ---
+def percentile(sorted_vals, p):
+    if not sorted_vals:
+        return None
+    k = (len(sorted_vals) - 1) * p
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+def run_case(gw, queries, engine, heuristic, repeats, mem_queries):
+    fn = get_engine(engine)
+    kwargs = {"heuristic": heuristic}
+    if engine in ("flat", "jps", "bidir"):
+        # tables are built once per map, like the batch workers do
+        from .flat import FlatGrid
+        kwargs["fg"] = FlatGrid(gw)
+    elif engine == "hpa":
+        # precomputation is not part of the per-query time
+        from .hpa import HPAGraph
+        kwargs["graph"] = HPAGraph(gw)
+    times = []
+    nodes = pushes = found = 0
+    cost_sum = 0
+    for rep in range(repeats):
+        for s, t in queries:
+            t0 = time.perf_counter()
+            res = fn(gw, s, t, **kwargs)
+            times.append((time.perf_counter() - t0) * 1000)
+            if rep == 0:
+                nodes += res.nodes_expanded
+                pushes += res.heap_pushes or 0
+                if res.path is not None:
+                    found += 1
+                    cost_sum += res.cost
+    peak = 0
+    for s, t in queries[:mem_queries]:
+        tracemalloc.start()
+        fn(gw, s, t, **kwargs)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    times.sort()
+    return {
+        "queries": len(queries),
+        "found": found,
+        "cost_sum": cost_sum,
+        "nodes_expanded": nodes,
+        "heap_pushes": pushes,
+        "time_ms": {
+            "p50": percentile(times, 0.5),
+            "p90": percentile(times, 0.9),
+            "p99": percentile(times, 0.99),
+            "mean": sum(times) / len(times) if times else None,
+            "total": sum(times),
+        },
+        "peak_kb": peak / 1024,
+    }
+
+def compare(current, baseline, tolerance):
+    """List of human-readable regressions of current vs baseline results."""
+    old = {(r["map"], r["engine"], r["heuristic"]): r for r in baseline["results"]}
+    problems = []
+    for r in current["results"]:
+        key = (r["map"], r["engine"], r["heuristic"])
+        b = old.get(key)
+        if b is None:
+            continue
+        name = "/".join(key)
+        if r["cost_sum"] != b["cost_sum"] or r["found"] != b["found"]:
+            problems.append(f"{name}: results changed (cost_sum {b['cost_sum']} -> {r['cost_sum']})")
+        if r["nodes_expanded"] > b["nodes_expanded"]:
+            problems.append(f"{name}: nodes_expanded {b['nodes_expanded']} -> {r['nodes_expanded']}")
+        bt, ct = b["time_ms"]["p50"], r["time_ms"]["p50"]
+        if bt and ct > bt * (1 + tolerance):
+            problems.append(f"{name}: p50 {bt:.3f} ms -> {ct:.3f} ms")
+    return problems
+
+
+def _csv(value, cast=str):
+    return [cast(v) for v in value.split(",") if v]
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m a_star.bench", description="Benchmark the A* engines.")
+    ap.add_argument("--sizes", default="64,256,512", help="comma-separated map sizes")
+    ap.add_argument("--densities", default="0.1,0.25,0.35", help="obstacle densities for random maps")
+    ap.add_argument("--kinds", default="random,maze,open", help="map kinds: random, maze, open")
+    ap.add_argument("--engines", default="flat,jps", help=f"any of {','.join(ENGINES)}")
+    ap.add_argument("--heuristics", default="octile")
+    ap.add_argument("--queries", type=int, default=20, help="queries per map")
+    ap.add_argument("--repeats", type=int, default=3, help="timed passes over the queries")
+    ap.add_argument("--mem-queries", type=int, default=3, help="queries re-run under tracemalloc")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", help="write JSON results here (default: stdout)")
+    ap.add_argument("--baseline", help="previous JSON results to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown vs baseline")
+    args = ap.parse_args(argv)
+
+    engines = _csv(args.engines)
+    heuristics = _csv(args.heuristics)
+    for e in engines:
+        get_engine(e)
+    for h in heuristics:
+        get_heuristic(h)
+
+    results = []
+    for label, gw, meta in build_maps(_csv(args.sizes, int), _csv(args.densities, float),
+                                      _csv(args.kinds), args.seed):
+        queries = make_queries(gw, args.queries, args.seed)
+        for engine in engines:
+            for heuristic in heuristics:
+                r = run_case(gw, queries, engine, heuristic, args.repeats, args.mem_queries)
+                r.update(meta, map=label, engine=engine, heuristic=heuristic)
+                results.append(r)
+                print(f"{label:>18} {engine:>6} {heuristic:>10}  nodes={r['nodes_expanded']:>9}  "
+                      f"p50={r['time_ms']['p50']:9.3f}ms  p99={r['time_ms']['p99']:9.3f}ms  "
+                      f"peak={r['peak_kb']:9.1f}KB", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=1)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = compare(report, json.load(f), args.tolerance)
+        for p in problems:
+            print("REGRESSION " + p, file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
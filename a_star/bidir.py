@@ -0,0 +1,242 @@
+"""
+Bidirectional A*.
+
+A forward search from the start and a backward search from the goal run on
+the FlatGrid move tables (same neighbors and 10/14 costs as neighbors_of;
+moves are symmetric, so the backward search uses the same table). mu is the
+cost of the best start->goal path seen through any cell reached by both
+sides. With a consistent heuristic the minimum f of either open list is a
+lower bound on every path not yet found, so the search stops as soon as
+max(min_f_forward, min_f_backward) >= mu and mu is optimal. Two prunings
+keep the frontiers from sweeping past each other: cells whose f already
+reaches mu are not pushed, and a cell the other side has closed is not
+expanded again (BS* "nipping"; safe with a consistent heuristic).
+Terrain weights (FlatGrid.weights) are symmetric per move, so both sides use
+the same mean-weight costs.
+
+parallel=True runs each frontier in its own thread. The meeting test and mu
+are shared under a lock; on CPython with the GIL this mostly overlaps the
+two searches rather than speeding them up. stats= counts both frontiers
+(peak_open is their combined open list; approximate with parallel=True).
+"""
+import heapq
+import threading
+import time
+
+from .grid import GridWorld
+from .flat import FlatGrid, _UNSEEN, _ID_BITS, _ID_MASK, _KEY_SHIFT, _entry_id
+from .search import SearchResult
+from .heuristics import get_heuristic, scale_heuristic, DEFAULT_HEURISTIC
+from .stats import HeapCounter
+
+FORWARD, BACKWARD = 0, 1
+
+# ties on f go to the larger g (deeper cell), which keeps both frontiers narrow
+_G_TIE = (1 << (_KEY_SHIFT - _ID_BITS)) - 1
+
+
+class _Frontier:
+    def __init__(self, fg, size, source, target, h):
+        self.fg = fg
+        self.W = fg.W
+        self.h = h
+        self.ty, self.tx = divmod(target, fg.W)
+        self.g = [_UNSEEN] * size
+        self.parent = [-1] * size
+        self.closed = bytearray(size)
+        self.g[source] = 0
+        self.heap = [self._h(source) << _KEY_SHIFT | source]
+        self.counter = 0
+        self.expanded = 0
+        self.evals = 0
+        # set by _Search.count when stats are collected
+        self.hc = None
+        self.push, self.pop = heapq.heappush, heapq.heappop
+    def _h(self, i):
+        y, x = divmod(i, self.W)
+        return self.h(abs(x - self.tx), abs(y - self.ty))
+    def top_f(self):
+        # stale entries can only under-estimate, which keeps the stop test safe
+        return self.heap[0] >> _KEY_SHIFT if self.heap else _UNSEEN
+    def expand(self, other, search):
+        """
+        Pop and expand one cell, reporting meetings to search.meet().
+        Returns (cell, new_open), (cell, []) for a nipped cell, or None.
+        """
+        heap, g, closed, pop = self.heap, self.g, self.closed, self.pop
+        while heap:
+            cur = pop(heap) & _ID_MASK
+            if not closed[cur]:
+                break
+        else:
+            return None
+        closed[cur] = 1
+        if other.closed[cur]:
+            # the other side already expanded it: its meeting is already in mu
+            return cur, []
+        self.expanded += 1
+        g_cur = g[cur]
+        other_g = other.g
+        parent = self.parent
+        h, W, tx, ty = self.h, self.W, self.tx, self.ty
+        push = self.push
+        new_open = []
+        weights = self.fg.weights
+        w_cur = weights[cur] if weights is not None else 0
+        cur_moves = self.fg.moves[self.fg.mask[cur]]
+        if self.hc is not None:
+            self.evals += len(cur_moves)
+        for off, cost in cur_moves:
+            nb = cur + off
+            if weights is None:
+                tentative_g = g_cur + cost
+            else:
+                tentative_g = g_cur + cost // 2 * (w_cur + weights[nb])
+            if tentative_g < g[nb]:
+                g[nb] = tentative_g
+                parent[nb] = cur
+                if other_g[nb] != _UNSEEN:
+                    search.meet(nb, tentative_g + other_g[nb])
+                y, x = divmod(nb, W)
+                f = tentative_g + h(abs(x - tx), abs(y - ty))
+                if f >= search.mu:
+                    continue  # cannot beat the best path found so far
+                self.counter += 1
+                push(heap, f << _KEY_SHIFT | (_G_TIE - tentative_g) << _ID_BITS | nb)
+                new_open.append(nb)
+        return cur, new_open
+
+
+class _Search:
+    def __init__(self, gw, start, goal, heuristic, weight, fg):
+        heur = get_heuristic(heuristic, weight)
+        if heur.bound != 1:
+            raise ValueError("bidirectional A* needs an admissible, consistent heuristic (bound 1)")
+        self.heur = heur
+        self.fg = fg = fg or FlatGrid(gw)
+        size = len(fg.blocked)
+        s, t = fg.to_id(start), fg.to_id(goal)
+        self.s, self.t = s, t
+        h = scale_heuristic(heur, fg.w_min).fn
+        self.sides = (_Frontier(fg, size, s, t, h), _Frontier(fg, size, t, s, h))
+        self.mu = 0 if s == t else _UNSEEN
+        self.meet_cell = s if s == t else -1
+        self.lock = threading.Lock()
+    def count(self, stats, start_time):
+        """Bind both frontiers' push / pop to HeapCounters filling stats."""
+        fwd, bwd = self.sides
+        fwd.hc = HeapCounter(stats, start_time, fwd.closed.__getitem__, _entry_id, (self.s,))
+        bwd.hc = HeapCounter(stats, start_time, bwd.closed.__getitem__, _entry_id, (self.t,), total=fwd.hc)
+        for side in self.sides:
+            side.push, side.pop = side.hc.push, side.hc.pop
+    def finish_stats(self):
+        fwd, bwd = self.sides
+        fwd.hc.finish(fwd.expanded + bwd.expanded, fwd.counter + bwd.counter + 2, fwd.evals + bwd.evals,
+                      others=(bwd.hc,))
+    def meet(self, v, cost):
+        if cost < self.mu:
+            with self.lock:
+                if cost < self.mu:
+                    self.mu = cost
+                    self.meet_cell = v
+    def finished(self):
+        fwd, bwd = self.sides
+        if not fwd.heap or not bwd.heap:
+            return True
+        return max(fwd.top_f(), bwd.top_f()) >= self.mu
+    def step(self):
+        # expand the side with the smaller open list
+        fwd, bwd = self.sides
+        side = FORWARD if len(fwd.heap) <= len(bwd.heap) else BACKWARD
+        out = self.sides[side].expand(self.sides[1 - side], self)
+        return side, out
+    def path(self):
+        if self.meet_cell < 0:
+            return None, None
+        fwd, bwd = self.sides
+        m = self.meet_cell
+        head = []
+        n = m
+        while n != -1:
+            head.append(n)
+            n = fwd.parent[n]
+        head.reverse()
+        n = bwd.parent[m]
+        while n != -1:
+            head.append(n)
+            n = bwd.parent[n]
+        cost = fwd.g[m] + bwd.g[m]
+        return [self.fg.to_xy(i) for i in head], cost
+    def run_parallel(self):
+        stop = threading.Event()
+        def worker(side):
+            me, other = self.sides[side], self.sides[1 - side]
+            while not stop.is_set():
+                if not me.heap or me.top_f() >= self.mu:
+                    # either bound alone proves mu optimal (or this side is exhausted)
+                    stop.set()
+                    break
+                me.expand(other, self)
+        threads = [threading.Thread(target=worker, args=(side,)) for side in (FORWARD, BACKWARD)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+
+
+def bidirectional_astar(gw: GridWorld, start, goal, heuristic=DEFAULT_HEURISTIC, weight=1.0, fg=None, parallel=False,
+                        stats=None):
+    """One-shot bidirectional A*. Returns a SearchResult (nodes_expanded counts both sides)."""
+    start_time = time.perf_counter()
+    search = _Search(gw, start, goal, heuristic, weight, fg)
+    fwd, bwd = search.sides
+    if stats is not None:
+        search.count(stats, start_time)
+    if parallel:
+        search.run_parallel()
+    else:
+        # finished()/step() inlined: this loop runs once per expansion
+        while fwd.heap and bwd.heap and max(fwd.heap[0], bwd.heap[0]) >> _KEY_SHIFT < search.mu:
+            if len(fwd.heap) <= len(bwd.heap):
+                fwd.expand(bwd, search)
+            else:
+                bwd.expand(fwd, search)
+    if stats is not None and search.meet_cell >= 0:
+        fwd.hc.found()
+    path, cost = search.path()
+    t_ms = (time.perf_counter() - start_time) * 1000
+    if stats is not None:
+        search.finish_stats()
+    return SearchResult(path, cost, fwd.expanded + bwd.expanded, t_ms, search.heur.bound,
+                        fwd.counter + bwd.counter + 2)
+
+def bidirectional_steps(gw: GridWorld, start, goal, heuristic=DEFAULT_HEURISTIC, weight=1.0, fg=None, stats=None):
+    """
+    astar_steps protocol with the side added to each delta, so the visualizer
+    can draw both open sets:
+        ('delta', current, new_open, side)   side 0 = from start, 1 = from goal
+        ('done', path, nodes_expanded, g_cost, time_ms)
+        ('no_path', nodes_expanded, time_ms)
+    stats is filled before the final event.
+    """
+    start_time = time.perf_counter()
+    search = _Search(gw, start, goal, heuristic, weight, fg)
+    if stats is not None:
+        search.count(stats, start_time)
+    to_xy = search.fg.to_xy
+    while not search.finished():
+        side, out = search.step()
+        if out is not None:
+            cur, new_open = out
+            yield ('delta', to_xy(cur), [to_xy(i) for i in new_open], side)
+    fwd, bwd = search.sides
+    if stats is not None and search.meet_cell >= 0:
+        fwd.hc.found()
+    path, cost = search.path()
+    t_ms = int((time.perf_counter() - start_time) * 1000)
+    if stats is not None:
+        search.finish_stats()
+    if path is None:
+        yield ('no_path', fwd.expanded + bwd.expanded, t_ms)
+    else:
+        yield ('done', path, fwd.expanded + bwd.expanded, cost, t_ms)
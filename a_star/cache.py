@@ -0,0 +1,125 @@
+"""
+LRU cache of search results keyed by (grid version, start, goal, query).
+
+The query is everything that changes the answer: engine, heuristic (with its
+weight) and the engine's result-affecting kwargs, so results of inexact
+engines (hpa, ara with weight > 1, theta) are never served to other queries.
+Precomputed tables (fg=, components=) are left out; ara runs bounded by a
+deadline or a cancel event depend on timing and bypass the cache.
+
+Move costs are symmetric, so a cached start->goal answer also answers
+goal->start: the reversed path has the same cost and the same optimality
+bound. The memory bound is an estimate of the Python objects held by the
+cached paths.
+"""
+import sys
+from collections import OrderedDict
+
+from .engines import find_path, default_heuristic, DEFAULT_ENGINE
+from .heuristics import get_heuristic
+from .hpa import HPAGraph
+from .search import SearchResult
+
+# rough per-step cost of a cached path: list slot + (x, y) tuple
+_BYTES_PER_STEP = 8 + sys.getsizeof((0, 0))
+_BYTES_PER_ENTRY = 256
+
+# kwargs that never change the result
+_NEUTRAL_KWARGS = ("fg", "components", "stats")
+# kwargs that make the result depend on timing
+_UNCACHEABLE_KWARGS = ("deadline_ms", "cancel")
+
+def _entry_size(res):
+    return _BYTES_PER_ENTRY + (len(res.path) * _BYTES_PER_STEP if res.path else 0)
+
+
+class PathCache:
+    def __init__(self, max_bytes=32 << 20):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.reverse_hits = 0
+        self.misses = 0
+        self.evictions = 0
+    def __len__(self):
+        return len(self._entries)
+    def get(self, version, start, goal, query):
+        """Cached SearchResult for the query (or its reverse), else None."""
+        key = (version, start, goal, query)
+        res = self._entries.get(key)
+        if res is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return res
+        rkey = (version, goal, start, query)
+        res = self._entries.get(rkey)
+        if res is not None:
+            self._entries.move_to_end(rkey)
+            self.reverse_hits += 1
+            path = res.path[::-1] if res.path else res.path
+            return res._replace(path=path)
+        self.misses += 1
+        return None
+    def put(self, version, start, goal, query, res: SearchResult):
+        key = (version, start, goal, query)
+        size = _entry_size(res)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= _entry_size(old)
+        self._entries[key] = res
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= _entry_size(evicted)
+            self.evictions += 1
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+    def stats(self):
+        lookups = self.hits + self.reverse_hits + self.misses
+        return {
+            "hits": self.hits,
+            "reverse_hits": self.reverse_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.reverse_hits) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def cached_find_path(gw, start, goal, cache: PathCache, engine=DEFAULT_ENGINE,
+                     heuristic=None, weight=1.0, **kwargs):
+    """find_path() through cache; entries from older grid versions are never returned."""
+    if heuristic is None:
+        heuristic = default_heuristic(engine)
+    query = query_key(engine, heuristic, weight, kwargs)
+    if query is None:
+        return find_path(gw, start, goal, engine, heuristic, weight, **kwargs)
+    res = cache.get(gw.version, start, goal, query)
+    if res is None:
+        res = find_path(gw, start, goal, engine, heuristic, weight, **kwargs)
+        cache.put(gw.version, start, goal, query, res)
+    return res
+
+def query_key(engine, heuristic, weight, kwargs):
+    """Hashable description of a query's result, None if it must not be cached."""
+    extra = []
+    for name, value in sorted(kwargs.items()):
+        if name in _NEUTRAL_KWARGS:
+            continue
+        if name in _UNCACHEABLE_KWARGS and value is not None:
+            return None
+        if isinstance(value, HPAGraph):
+            # a graph answers by its parameters, whatever the object
+            value = ("HPAGraph", value.cluster_size, value.entrance_width)
+        try:
+            hash(value)
+        except TypeError:
+            return None
+        extra.append((name, value))
+    return (engine, get_heuristic(heuristic, weight).name) + tuple(extra)
@@ -0,0 +1,251 @@
+"""
+Connected-component index for O(1) "no path" answers.
+
+With the no-corner-cutting rule a diagonal move is only legal when both
+orthogonal cells are free, so two cells are connected exactly when they are
+4-connected through non-obstacle cells. ComponentIndex labels every cell once
+(run-based union-find over rows, the run scanning is done by re) and keeps the
+labels current under single-cell edits:
+  - an obstacle removed joins the components around it (the smaller ones are
+    relabeled into the largest)
+  - an obstacle added can only split its own component; if its free
+    neighbors are still connected around the 3x3 ring nothing changes,
+    otherwise one BFS per side runs in lockstep and stops as soon as all but
+    one side is exhausted, so the cost is proportional to the smaller parts
+"""
+import re
+from array import array
+from collections import deque
+
+from .grid import GridWorld, OBSTACLE
+
+_FREE_RUN = re.compile(b"[^" + re.escape(bytes([OBSTACLE])) + b"]+")
+
+# 3x3 ring around a cell, clockwise from E; orthogonal cells at even positions
+_RING = [(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)]
+
+
+class ComponentIndex:
+    def __init__(self, gw: GridWorld):
+        self.gw = gw
+        self.rebuild()
+
+    def rebuild(self):
+        """Label every cell from scratch (-1 for obstacles)."""
+        gw = self.gw
+        W = self.width = gw.width
+        H = self.height = gw.height
+        cells = bytes(gw.cells)
+        parent = []
+
+        def find(r):
+            while parent[r] != r:
+                parent[r] = parent[parent[r]]
+                r = parent[r]
+            return r
+
+        runs = []
+        prev = []
+        for y in range(H):
+            base = y * W
+            cur = []
+            j = 0
+            for m in _FREE_RUN.finditer(cells, base, base + W):
+                s, e = m.span()
+                rid = len(parent)
+                parent.append(rid)
+                # previous-row runs that end before s cannot touch this or later runs
+                while j < len(prev) and prev[j][1] <= s - W:
+                    j += 1
+                k = j
+                while k < len(prev) and prev[k][0] < e - W:
+                    a, b = find(rid), find(prev[k][2])
+                    if a != b:
+                        parent[a] = b
+                    k += 1
+                cur.append((s, e, rid))
+                runs.append((s, e, rid))
+            prev = cur
+        labels = array('i', [-1]) * (W * H)
+        ids = {}
+        sizes = {}
+        for s, e, rid in runs:
+            root = find(rid)
+            lab = ids.get(root)
+            if lab is None:
+                lab = ids[root] = len(ids)
+                sizes[lab] = 0
+            labels[s:e] = array('i', [lab]) * (e - s)
+            sizes[lab] += e - s
+        self.labels = labels
+        self.sizes = sizes
+        self._next = len(ids)
+        self.version = gw.version
+
+    # --- queries ---
+    def label(self, cell):
+        x, y = cell
+        return self.labels[y * self.width + x]
+    def connected(self, a, b):
+        """True if a path between the cells can exist. Rebuilds first if gw changed behind our back."""
+        if self.version != self.gw.version or (self.width, self.height) != (self.gw.width, self.gw.height):
+            self.rebuild()
+        W = self.width
+        la = self.labels[a[1] * W + a[0]]
+        return la >= 0 and la == self.labels[b[1] * W + b[0]]
+    def component_size(self, cell):
+        lab = self.label(cell)
+        return self.sizes[lab] if lab >= 0 else 0
+    def __len__(self):
+        return len(self.sizes)
+
+    # --- incremental updates ---
+    def _neighbors(self, i):
+        W = self.width
+        x = i % W
+        if x + 1 < W:
+            yield i + 1
+        if x > 0:
+            yield i - 1
+        if i + W < len(self.labels):
+            yield i + W
+        if i >= W:
+            yield i - W
+    def _relabel(self, seed, old, new):
+        labels = self.labels
+        labels[seed] = new
+        stack = [seed]
+        while stack:
+            i = stack.pop()
+            for n in self._neighbors(i):
+                if labels[n] == old:
+                    labels[n] = new
+                    stack.append(n)
+    def _free_cell(self, i):
+        labels, sizes = self.labels, self.sizes
+        around = {labels[n] for n in self._neighbors(i)} - {-1}
+        if not around:
+            labels[i] = self._next
+            sizes[self._next] = 1
+            self._next += 1
+            return
+        keep = max(around, key=sizes.__getitem__)
+        labels[i] = keep
+        sizes[keep] += 1
+        for old in around - {keep}:
+            seed = next(n for n in self._neighbors(i) if labels[n] == old)
+            self._relabel(seed, old, keep)
+            sizes[keep] += sizes.pop(old)
+    def _ring_groups(self, i):
+        # free orthogonal neighbors of i, grouped when a free corner cell joins them
+        W, H = self.width, self.height
+        y, x = divmod(i, W)
+        labels = self.labels
+        ring = []
+        for dx, dy in _RING:
+            nx, ny = x + dx, y + dy
+            ring.append(ny * W + nx if 0 <= nx < W and 0 <= ny < H and labels[ny * W + nx] >= 0 else -1)
+        group = {k: k for k in range(0, 8, 2) if ring[k] >= 0}
+        for k in range(0, 8, 2):
+            nxt = (k + 2) % 8
+            if k in group and nxt in group and ring[k + 1] >= 0:
+                a, b = group[k], group[nxt]
+                for j, g in group.items():
+                    if g == b:
+                        group[j] = a
+        out = {}
+        for k, g in group.items():
+            out.setdefault(g, []).append(ring[k])
+        return list(out.values())
+    def _block_cell(self, i):
+        labels, sizes = self.labels, self.sizes
+        old = labels[i]
+        groups = self._ring_groups(i)
+        labels[i] = -1
+        sizes[old] -= 1
+        if not sizes[old]:
+            del sizes[old]
+        if len(groups) <= 1:
+            return
+        # lockstep BFS, one per side; sides that meet are merged
+        k = len(groups)
+        root = list(range(k))
+
+        def find(r):
+            while root[r] != r:
+                r = root[r]
+            return r
+
+        owner = {}
+        queues = []
+        members = []
+        for s, g in enumerate(groups):
+            seed = g[0]
+            owner[seed] = s
+            queues.append(deque([seed]))
+            members.append([seed])
+        done = [False] * k
+        while True:
+            live = [s for s in range(k) if root[s] == s and not done[s]]
+            if len(live) <= 1 or sum(1 for s in range(k) if root[s] == s) == 1:
+                break
+            for s in live:
+                if root[s] != s:
+                    continue
+                q = queues[s]
+                if not q:
+                    done[s] = True
+                    continue
+                cur = q.popleft()
+                for n in self._neighbors(cur):
+                    if labels[n] != old:
+                        continue
+                    o = owner.get(n)
+                    if o is None:
+                        owner[n] = s
+                        q.append(n)
+                        members[s].append(n)
+                        continue
+                    o = find(o)
+                    if o != s:
+                        # both sides reach each other: still one component
+                        root[o] = s
+                        q.extend(queues[o])
+                        members[s].extend(members[o])
+        roots = [s for s in range(k) if root[s] == s]
+        if len(roots) == 1:
+            return
+        finished = [s for s in roots if done[s]]
+        if len(finished) == len(roots):
+            # every side was fully explored: the largest keeps the old label
+            finished.remove(max(finished, key=lambda s: len(members[s])))
+        for s in finished:
+            lab = self._next
+            self._next += 1
+            for c in members[s]:
+                labels[c] = lab
+            sizes[lab] = len(members[s])
+            sizes[old] -= len(members[s])
+        if not sizes[old]:
+            del sizes[old]
+    def update(self, changed_cells):
+        """
+        Re-read changed_cells from the grid and patch the labels. Only valid
+        if the index was current before those cells changed; large edits
+        simply relabel everything.
+        """
+        changed_cells = list(changed_cells)
+        gw = self.gw
+        W = self.width
+        if (gw.width, gw.height) != (W, self.height) or len(changed_cells) > len(self.labels) // 8:
+            self.rebuild()
+            return
+        labels = self.labels
+        for (x, y) in changed_cells:
+            i = y * W + x
+            blocked = gw.cells[i] == OBSTACLE
+            if blocked and labels[i] >= 0:
+                self._block_cell(i)
+            elif not blocked and labels[i] < 0:
+                self._free_cell(i)
+        self.version = gw.version
@@ -0,0 +1,183 @@
+"""
+Incremental replanning with D* Lite.
+
+DStarLite searches backwards from the goal and keeps its g/rhs values between
+calls. After obstacles change, update(changed_cells) only re-examines the
+cells whose edges touched those cells (the cell and its 8 neighbors, which
+covers the corner-cutting diagonals) and repairs the part of the search that
+depended on them. move_start() supports a robot that advances along the path.
+Returned costs always equal a fresh search with the same admissible heuristic.
+Terrain weight changes are repaired the same way; the heuristic is scaled by
+the smallest weight, so if an edit lowers it the search restarts from scratch.
+"""
+import heapq
+import time
+
+from .grid import GridWorld
+from .flat import FlatGrid
+from .search import SearchResult
+from .heuristics import get_heuristic, scale_heuristic, DEFAULT_HEURISTIC
+
+INF = float('inf')
+
+
+class DStarLite:
+    def __init__(self, gw: GridWorld, start, goal, heuristic=DEFAULT_HEURISTIC):
+        heur = get_heuristic(heuristic)
+        if heur.bound != 1:
+            raise ValueError("D* Lite needs an admissible heuristic (bound 1)")
+        self.gw = gw
+        # private FlatGrid: update() patches it instead of rebuilding
+        self.fg = fg = FlatGrid(gw)
+        self.W = fg.W
+        self.bound = heur.bound
+        self._heur = heur
+        self.start = start
+        self.goal = goal
+        self._s = fg.to_id(start)
+        self._t = fg.to_id(goal)
+        self.nodes_expanded = 0
+        self._counter = 0
+        self._reset()
+
+    def _reset(self):
+        fg = self.fg
+        self._w_min = fg.w_min
+        self._h = scale_heuristic(self._heur, fg.w_min).fn
+        self.km = 0
+        size = len(fg.blocked)
+        self.g = [INF] * size
+        self.rhs = [INF] * size
+        self.rhs[self._t] = 0
+        self._open = {}      # id -> key currently in the heap
+        self._heap = []
+        self._last = self._s  # start position when km was last updated
+        self._push(self._t, self._key(self._t))
+
+    # --- D* Lite internals (flat ids) ---
+    def _key(self, u):
+        m = min(self.g[u], self.rhs[u])
+        uy, ux = divmod(u, self.W)
+        sy, sx = divmod(self._s, self.W)
+        return (m + self._h(abs(ux - sx), abs(uy - sy)) + self.km, m)
+    def _push(self, u, key):
+        self._open[u] = key
+        self._counter += 1
+        heapq.heappush(self._heap, (key, self._counter, u))
+    def _top(self):
+        # drop entries that were removed or re-keyed since they were pushed
+        heap = self._heap
+        while heap:
+            key, _, u = heap[0]
+            if self._open.get(u) == key:
+                return key, u
+            heapq.heappop(heap)
+        return (INF, INF), None
+    def _update_vertex(self, u):
+        g = self.g
+        if u != self._t:
+            best = INF
+            weights = self.fg.weights
+            for off, c in self.fg.moves[self.fg.mask[u]]:
+                if weights is not None:
+                    c = c // 2 * (weights[u] + weights[u + off])
+                if c + g[u + off] < best:
+                    best = c + g[u + off]
+            self.rhs[u] = best
+        self._open.pop(u, None)
+        if g[u] != self.rhs[u]:
+            self._push(u, self._key(u))
+    def _compute(self):
+        g, rhs = self.g, self.rhs
+        moves, mask = self.fg.moves, self.fg.mask
+        s = self._s
+        expanded = 0
+        while True:
+            k_old, u = self._top()
+            if u is None or (k_old >= self._key(s) and rhs[s] == g[s]):
+                break
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u, k_new)
+                continue
+            heapq.heappop(self._heap)
+            del self._open[u]
+            expanded += 1
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]
+                for off, _ in moves[mask[u]]:
+                    self._update_vertex(u + off)
+            else:
+                g[u] = INF
+                self._update_vertex(u)
+                for off, _ in moves[mask[u]]:
+                    self._update_vertex(u + off)
+        self.nodes_expanded += expanded
+        return expanded
+
+    def _extract(self):
+        s, t = self._s, self._t
+        cost = self.g[s]
+        if cost == INF:
+            return None, None
+        g, moves, mask, weights = self.g, self.fg.moves, self.fg.mask, self.fg.weights
+        path = [self.fg.to_xy(s)]
+        while s != t:
+            # follow the cheapest c(s, s') + g(s')
+            if weights is None:
+                off = min(moves[mask[s]], key=lambda m: m[1] + g[s + m[0]])[0]
+            else:
+                off = min(moves[mask[s]], key=lambda m: m[1] // 2 * (weights[s] + weights[s + m[0]]) + g[s + m[0]])[0]
+            s += off
+            path.append(self.fg.to_xy(s))
+        return path, cost
+
+    def _result(self, expanded, pushes, start_time):
+        path, cost = self._extract()
+        t_ms = (time.perf_counter() - start_time) * 1000
+        return SearchResult(path, cost, expanded, t_ms, self.bound, pushes)
+
+    # --- public API ---
+    def plan(self):
+        """(Re)compute the path from the current start. Returns a SearchResult."""
+        start_time = time.perf_counter()
+        pushes = self._counter
+        expanded = self._compute()
+        return self._result(expanded, self._counter - pushes, start_time)
+    def update(self, changed_cells):
+        """
+        Repair the plan after the obstacle state or terrain weight of
+        changed_cells was modified in the grid. Returns the new SearchResult;
+        nodes_expanded only counts the repair work.
+        """
+        start_time = time.perf_counter()
+        pushes = self._counter
+        changed_cells = list(changed_cells)
+        fg = self.fg
+        W = self.W
+        affected = set()
+        for cell in changed_cells:
+            i = fg.to_id(cell)
+            for dy in (-W, 0, W):
+                for dx in (-1, 0, 1):
+                    affected.add(i + dy + dx)
+        fg.refresh(self.gw, changed_cells)
+        if fg.w_min < self._w_min:
+            # the scaled heuristic would overestimate: start over
+            self._reset()
+            expanded = self._compute()
+            return self._result(expanded, self._counter - pushes, start_time)
+        for u in affected:
+            if not fg.blocked[u] or self.g[u] != INF or self.rhs[u] != INF:
+                self._update_vertex(u)
+        expanded = self._compute()
+        return self._result(expanded, self._counter - pushes, start_time)
+    def move_start(self, new_start):
+        """The agent moved: keep the search, shifting keys by the heuristic change."""
+        W = self.W
+        ly, lx = divmod(self._last, W)
+        self._s = self.fg.to_id(new_start)
+        sy, sx = divmod(self._s, W)
+        self.km += self._h(abs(lx - sx), abs(ly - sy))
+        self._last = self._s
+        self.start = new_start
@@ -0,0 +1,153 @@
+"""
+Engine registry: every search engine behind one call signature.
+
+    find_path(gw, start, goal, engine="flat", heuristic=None, weight=1.0)
+
+ENGINES maps a name to a one-shot function returning a SearchResult.
+STEPPERS maps the names that can be animated to their delta generator
+(the astar_steps event protocol; bidir deltas add the side as a 4th field).
+heuristic=None picks the engine's own default (default_heuristic): octile,
+except euclidean for theta / lazytheta, which return any-angle waypoint paths
+(see a_star.anyangle).
+ara is ARA* run to completion unless deadline_ms / max_nodes / cancel are
+passed (see a_star.anytime).
+Passing components=ComponentIndex(gw) answers unreachable queries without
+searching. Passing stats=SearchStats() (or registering a hook in a_star.stats)
+collects the search counters, counted by the engines in INSTRUMENTED_ENGINES
+themselves; without either the engines run unchanged.
+"""
+import time
+
+from .search import astar, astar_steps, SearchResult
+from .flat import astar_flat
+from .jps import jps, jps_steps
+from .bidir import bidirectional_astar, bidirectional_steps
+from .hpa import hpa
+from .anyangle import theta_star, lazy_theta_star, DEFAULT_ANY_ANGLE_HEURISTIC
+from .anytime import ara_star
+from .heuristics import get_heuristic, DEFAULT_HEURISTIC
+from .stats import _HOOKS, INSTRUMENTED_ENGINES, new_stats, emit
+
+ENGINES = {
+    "astar": astar,
+    "flat": astar_flat,
+    "jps": jps,
+    "bidir": bidirectional_astar,
+    "hpa": hpa,
+    "theta": theta_star,
+    "lazytheta": lazy_theta_star,
+    "ara": ara_star,
+}
+
+STEPPERS = {
+    "astar": astar_steps,
+    "jps": jps_steps,
+    "bidir": bidirectional_steps,
+}
+
+DEFAULT_ENGINE = "flat"
+
+# engines whose own default heuristic is not DEFAULT_HEURISTIC
+ENGINE_HEURISTICS = {
+    "theta": DEFAULT_ANY_ANGLE_HEURISTIC,
+    "lazytheta": DEFAULT_ANY_ANGLE_HEURISTIC,
+}
+
+def get_engine(name):
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"unknown engine {name!r}; choose one of {sorted(ENGINES)}") from None
+
+def default_heuristic(engine):
+    """The heuristic an engine uses when the caller does not name one."""
+    return ENGINE_HEURISTICS.get(engine, DEFAULT_HEURISTIC)
+
+def no_path_result(heuristic=DEFAULT_HEURISTIC, weight=1.0):
+    """SearchResult for a query rejected before searching (nothing expanded)."""
+    return SearchResult(None, None, 0, 0.0, get_heuristic(heuristic, weight).bound, 0)
+
+def find_path(gw, start, goal, engine=DEFAULT_ENGINE, heuristic=None, weight=1.0,
+              components=None, stats=None, **kwargs):
+    """
+    Run one query with the named engine; extra kwargs (e.g. fg=) go to the
+    engine. A SearchStats passed as stats is filled with the query's counters.
+    """
+    fn = get_engine(engine)
+    if heuristic is None:
+        heuristic = default_heuristic(engine)
+    if stats is None and _HOOKS:
+        stats = new_stats(engine)
+    if stats is not None:
+        return _find_path_stats(fn, gw, start, goal, engine, heuristic, weight, components, stats, kwargs)
+    if components is not None and not components.connected(start, goal):
+        return no_path_result(heuristic, weight)
+    return fn(gw, start, goal, heuristic=heuristic, weight=weight, **kwargs)
+
+def _find_path_stats(fn, gw, start, goal, engine, heuristic, weight, components, stats, kwargs):
+    stats.engine = engine
+    if components is not None and not components.connected(start, goal):
+        res = no_path_result(heuristic, weight)
+    elif engine in INSTRUMENTED_ENGINES:
+        res = fn(gw, start, goal, heuristic=heuristic, weight=weight, stats=stats, **kwargs)
+    else:
+        res = fn(gw, start, goal, heuristic=heuristic, weight=weight, **kwargs)
+        stats.nodes_expanded = res.nodes_expanded
+        stats.heap_pushes = res.heap_pushes
+        stats.time_ms = res.time_ms
+        stats.partial()
+    emit(stats)
+    return res
+
+def engine_steps(gw, start, goal, engine=DEFAULT_ENGINE, heuristic=None, weight=1.0,
+                 components=None, stats=None):
+    """
+    Event generator for any engine. Engines without a stepper run in one shot
+    and only yield the final 'done' / 'no_path' event. stats is filled when
+    the search ends.
+    """
+    if heuristic is None:
+        heuristic = default_heuristic(engine)
+    if stats is None and _HOOKS:
+        stats = new_stats(engine)
+    if stats is not None:
+        yield from _engine_steps_stats(gw, start, goal, engine, heuristic, weight, components, stats)
+        return
+    if components is not None and not components.connected(start, goal):
+        yield ('no_path', 0, 0)
+        return
+    if engine in STEPPERS:
+        yield from STEPPERS[engine](gw, start, goal, heuristic=heuristic, weight=weight)
+        return
+    res = find_path(gw, start, goal, engine, heuristic, weight)
+    if res.path is None:
+        yield ('no_path', res.nodes_expanded, int(res.time_ms))
+    else:
+        yield ('done', res.path, res.nodes_expanded, res.cost, int(res.time_ms))
+
+def _engine_steps_stats(gw, start, goal, engine, heuristic, weight, components, stats):
+    if engine not in STEPPERS:
+        # find_path fills and emits the stats
+        res = find_path(gw, start, goal, engine, heuristic, weight, components, stats)
+        yield ('no_path', res.nodes_expanded, int(res.time_ms)) if res.path is None else \
+              ('done', res.path, res.nodes_expanded, res.cost, int(res.time_ms))
+        return
+    stats.engine = engine
+    if components is not None and not components.connected(start, goal):
+        emit(stats)
+        yield ('no_path', 0, 0)
+        return
+    # the stepper fills stats before its last event; time spent suspended at
+    # the yields belongs to the consumer
+    paused = 0.0
+    for ev in STEPPERS[engine](gw, start, goal, heuristic=heuristic, weight=weight, stats=stats):
+        if ev[0] != 'delta':
+            break
+        yielded = time.perf_counter()
+        yield ev
+        paused += time.perf_counter() - yielded
+    stats.time_ms -= paused * 1000
+    if stats.phases is not None:
+        stats.phases["search"] -= paused * 1000
+    emit(stats)
+    yield ev
@@ -0,0 +1,221 @@
+"""
+Streaming path exporters and their readers.
+
+Every record carries the query and the metrics of the 'done' event: index,
+start, goal, cost, nodes_expanded, time_ms and the path (cost None and path
+None when there is no route). Writers take any binary/text file object, so
+they stream to files and pipes alike; readers are generators.
+
+Formats:
+  - NDJSON: one JSON object per line. The path is a coordinate list
+    ("coords"), a run-length direction string ("rle", e.g. "3E2SE1N": count
+    and compass direction of each run of equal moves) or left out (None).
+  - binary: 12-byte header (magic b"ASTP", version, path encoding, width),
+    then per record a fixed struct followed by the path, either as
+    little-endian uint32 cell ids y*width+x ("cells") or one byte per
+    direction run ("rle": 3 bits direction, 5 bits run length - 1).
+
+Paths must be 8-connected step by step for the "rle" encodings; any-angle
+waypoint paths (a_star.anyangle) go through densify() first or use "coords".
+"""
+import json
+import re
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+from .flat import _DIRS
+
+ExportRecord = namedtuple("ExportRecord", ["index", "start", "goal", "cost", "nodes_expanded", "time_ms", "path"])
+
+_DIR_NAMES = ("E", "W", "S", "N", "SE", "NE", "SW", "NW")
+_DIR_INDEX = {d: k for k, d in enumerate(_DIRS)}
+# the count is always written, otherwise "N" + "W" would read as "NW"
+_RLE_TOKEN = re.compile(r"(\d+)(SE|NE|SW|NW|E|W|S|N)")
+
+MAGIC = b"ASTP"
+FORMAT_VERSION = 1
+_ENCODINGS = {None: 0, "cells": 1, "rle": 2}
+_HEADER = struct.Struct("<4sHBxI")
+# index, sx, sy, gx, gy, cost (-1: no path), nodes_expanded, time_ms, path length in words/bytes
+_RECORD = struct.Struct("<IiiiiqQdI")
+_RUN_MAX = 32
+
+
+# --- direction runs ---
+def _runs(path):
+    # (direction index, run length) for each maximal run of equal moves
+    runs = []
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        d = _DIR_INDEX.get((x1 - x0, y1 - y0))
+        if d is None:
+            raise ValueError(f"path step {(x0, y0)} -> {(x1, y1)} is not a single move")
+        if runs and runs[-1][0] == d:
+            runs[-1][1] += 1
+        else:
+            runs.append([d, 1])
+    return runs
+
+def _replay(start, runs):
+    x, y = start
+    path = [(x, y)]
+    for d, n in runs:
+        dx, dy = _DIRS[d]
+        for _ in range(n):
+            x += dx
+            y += dy
+            path.append((x, y))
+    return path
+
+def encode_rle(path):
+    """Run-length direction string for path, e.g. [(0,0),(1,0),(2,0),(3,1)] -> '2E1SE'."""
+    return "".join(f"{n}{_DIR_NAMES[d]}" for d, n in _runs(path))
+
+def decode_rle(start, text):
+    """Inverse of encode_rle: the path starting at start."""
+    runs = []
+    pos = 0
+    for m in _RLE_TOKEN.finditer(text):
+        if m.start() != pos:
+            raise ValueError(f"bad run-length path at offset {pos}: {text[pos:pos+8]!r}")
+        runs.append((_DIR_NAMES.index(m.group(2)), int(m.group(1))))
+        pos = m.end()
+    if pos != len(text):
+        raise ValueError(f"bad run-length path at offset {pos}: {text[pos:pos+8]!r}")
+    return _replay(tuple(start), runs)
+
+
+# --- NDJSON ---
+class NdjsonWriter:
+    def __init__(self, f, path="coords"):
+        if path not in ("coords", "rle", None):
+            raise ValueError(f"unknown NDJSON path encoding {path!r}")
+        self.f = f
+        self.path = path
+        self.count = 0
+    def write(self, start, goal, path, cost, nodes_expanded, time_ms, index=None):
+        rec = {"i": self.count if index is None else index, "start": start, "goal": goal, "cost": cost,
+               "nodes_expanded": nodes_expanded, "time_ms": round(time_ms, 3)}
+        if self.path == "coords":
+            rec["path"] = path
+        elif self.path == "rle":
+            rec["path_rle"] = encode_rle(path) if path else None
+        self.f.write(json.dumps(rec) + "\n")
+        self.count += 1
+    def write_result(self, index, start, goal, res):
+        self.write(start, goal, res.path, res.cost, res.nodes_expanded, res.time_ms, index)
+    def close(self):
+        self.f.flush()
+
+def read_ndjson(f):
+    """Yield ExportRecords from an NDJSON export (either path encoding)."""
+    for line in f:
+        if not line.strip():
+            continue
+        rec = json.loads(line)
+        start = tuple(rec["start"])
+        if rec.get("path_rle") is not None:
+            path = decode_rle(start, rec["path_rle"])
+        elif rec.get("path") is not None:
+            path = [tuple(p) for p in rec["path"]]
+        else:
+            path = None
+        yield ExportRecord(rec["i"], start, tuple(rec["goal"]), rec["cost"], rec["nodes_expanded"],
+                           rec["time_ms"], path)
+
+
+# --- binary ---
+def _le(words):
+    if sys.byteorder != "little":
+        words.byteswap()
+    return words
+
+class BinaryWriter:
+    def __init__(self, f, width, path="cells"):
+        if path not in _ENCODINGS:
+            raise ValueError(f"unknown binary path encoding {path!r}")
+        self.f = f
+        self.width = width
+        self.path = path
+        self.count = 0
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, _ENCODINGS[path], width))
+    def write(self, start, goal, path, cost, nodes_expanded, time_ms, index=None):
+        if path is None or self.path is None:
+            payload = b""
+        elif self.path == "cells":
+            W = self.width
+            payload = _le(array("I", [y * W + x for x, y in path])).tobytes()
+        else:
+            out = bytearray()
+            for d, n in _runs(path):
+                while n:
+                    run = min(n, _RUN_MAX)
+                    out.append(d << 5 | (run - 1))
+                    n -= run
+            payload = bytes(out)
+        count = len(payload) // 4 if self.path == "cells" else len(payload)
+        self.f.write(_RECORD.pack(self.count if index is None else index, *start, *goal,
+                                  -1 if cost is None else cost, nodes_expanded, time_ms, count))
+        self.f.write(payload)
+        self.count += 1
+    def write_result(self, index, start, goal, res):
+        self.write(start, goal, res.path, res.cost, res.nodes_expanded, res.time_ms, index)
+    def close(self):
+        self.f.flush()
+
+def _read_exact(f, n):
+    data = f.read(n)
+    if len(data) != n:
+        raise ValueError("truncated binary path export")
+    return data
+
+def read_binary(f):
+    """Yield ExportRecords from a binary export."""
+    magic, version, encoding, width = _HEADER.unpack(_read_exact(f, _HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"not a binary path export (magic {magic!r})")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported export format version {version}")
+    while True:
+        head = f.read(_RECORD.size)
+        if not head:
+            return
+        if len(head) != _RECORD.size:
+            raise ValueError("truncated binary path export")
+        i, sx, sy, gx, gy, cost, nodes, t_ms, count = _RECORD.unpack(head)
+        if cost < 0:
+            cost = path = None
+        if encoding == 1:
+            words = array("I")
+            words.frombytes(_read_exact(f, 4 * count))
+            _le(words)
+            path = [(c % width, c // width) for c in words] if cost is not None else None
+        elif encoding == 2:
+            data = _read_exact(f, count)
+            path = _replay((sx, sy), [(b >> 5, (b & 31) + 1) for b in data]) if cost is not None else None
+        else:
+            path = None
+        yield ExportRecord(i, (sx, sy), (gx, gy), cost, nodes, t_ms, path)
+
+
+def open_writer(f, fmt="ndjson", path="coords", width=None):
+    """Writer for fmt ('ndjson' or 'binary'); binary needs the map width."""
+    if fmt == "ndjson":
+        return NdjsonWriter(f, path)
+    if fmt == "binary":
+        if width is None:
+            raise ValueError("binary export needs the map width")
+        return BinaryWriter(f, width, "cells" if path == "coords" else path)
+    raise ValueError(f"unknown export format {fmt!r}")
+
+def read_export(path):
+    """Yield ExportRecords from an export file, detecting binary vs NDJSON."""
+    with open(path, "rb") as f:
+        binary = f.read(len(MAGIC)) == MAGIC
+    if binary:
+        with open(path, "rb") as f:
+            yield from read_binary(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            yield from read_ndjson(f)
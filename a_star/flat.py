@@ -0,0 +1,287 @@
+"""
+Flat-index A* engine.
+
+Cells are addressed by a single integer id on a grid padded with a one-cell
+border of obstacles. FlatGrid precomputes, once per grid, a bitmask of legal
+moves for every cell (bounds, obstacles and the corner-cutting rule already
+applied), so an expansion just walks the (offset, cost) entries for its mask.
+Per-search state lives in flat lists and a bytearray instead of dicts and sets.
+
+Expansion order, tie-breaking and move order match astar_generator, so paths
+and costs are identical. Weighted-terrain grids keep a padded copy of the
+cost layer (FlatGrid.weights) and run a separate loop, so uniform grids pay
+nothing for it. Given stats=, both loops count into a stats.HeapCounter.
+"""
+import heapq
+import time
+from array import array
+
+from .grid import GridWorld, OBSTACLE
+from .search import SearchResult
+from .heuristics import get_heuristic, scale_heuristic, DEFAULT_HEURISTIC
+from .stats import HeapCounter
+
+# obstacle -> 1, everything else (FREE/START/GOAL) -> 0
+_BLOCKED_TABLE = bytes(1 if i == OBSTACLE else 0 for i in range(256))
+
+# padded blocked flag -> free flag
+_FREE_TABLE = bytes([1, 0]) + bytes(254)
+
+# same order as neighbors_of
+_DIRS = [(1,0),(-1,0),(0,1),(0,-1),(1,1),(1,-1),(-1,1),(-1,-1)]
+
+# heap key layout: f | counter (40 bits) | cell id (32 bits)
+_ID_BITS = 32
+_ID_MASK = (1 << _ID_BITS) - 1
+_KEY_SHIFT = _ID_BITS + 40
+# g-score of unreached cells; an int so comparisons stay int-int
+_UNSEEN = 1 << 62
+
+
+def _entry_id(entry):
+    return entry & _ID_MASK
+
+
+def _move_tables(W):
+    # table[mask] -> tuple of (offset, cost) for the moves whose bit is set
+    moves = [(dy*W + dx, 14 if dx and dy else 10) for dx, dy in _DIRS]
+    return tuple(tuple(m for k, m in enumerate(moves) if mask >> k & 1) for mask in range(256))
+
+def _move_masks(blocked, W):
+    """
+    Per-cell bitmask of legal moves (bit k = _DIRS[k]), built with big-int
+    shifts over the whole buffer so no Python loop runs per cell.
+    """
+    L = len(blocked)
+    full = (1 << (8 * L)) - 1
+    free = int.from_bytes(bytes(blocked).translate(_FREE_TABLE), 'big')
+    def at(off):
+        # byte i of the result holds free[i + off]
+        return (free << (8 * off)) & full if off >= 0 else free >> (-8 * off)
+    mask = 0
+    for k, (dx, dy) in enumerate(_DIRS):
+        ok = at(dy*W + dx)
+        if dx and dy:
+            # anti-corner-cutting: both orthogonal neighbors must be free
+            ok &= at(dx) & at(dy*W)
+        mask |= ok << k
+    # blocked cells never expand
+    return bytearray((mask & free * 0xFF).to_bytes(L, 'big'))
+
+def _pad_weights(gw, W):
+    # padded copy of gw.costs (border weight 1, never entered)
+    w = gw.width
+    weights = array('H', [1]) * (W * (gw.height + 2))
+    for y in range(gw.height):
+        i = (y + 1) * W + 1
+        weights[i:i+w] = array('H', bytes(gw.costs[y*w:(y+1)*w]))
+    return weights
+
+
+class FlatGrid:
+    """
+    Padded obstacle buffer and per-cell move masks for one GridWorld snapshot.
+    weights is the padded cost layer (None on uniform grids), w_min its minimum.
+    """
+    def __init__(self, gw: GridWorld):
+        w = gw.width
+        W = w + 2
+        self.width = w
+        self.height = gw.height
+        self.W = W
+        wall = b'\x01' * W
+        rows = [wall]
+        for y in range(gw.height):
+            rows.append(b'\x01' + bytes(gw.cells[y*w:(y+1)*w]).translate(_BLOCKED_TABLE) + b'\x01')
+        rows.append(wall)
+        self.blocked = bytearray(b''.join(rows))
+        self.mask = _move_masks(self.blocked, W)
+        self.moves = _move_tables(W)
+        self._dirs = [(k, dy*W + dx, dx, dy*W) for k, (dx, dy) in enumerate(_DIRS)]
+        self.weights = None if gw.costs is None else _pad_weights(gw, W)
+        self.w_min = gw.min_cost()
+    def refresh(self, gw: GridWorld, cells):
+        """
+        Re-read the given (x, y) cells from gw and patch blocked/mask locally
+        (a cell's change only affects the masks of its 3x3 neighborhood).
+        Weights of those cells are re-read too.
+        """
+        W = self.W
+        blocked = self.blocked
+        costs = gw.costs
+        if (costs is None) != (self.weights is None):
+            # the cost layer appeared or went away
+            self.weights = None if costs is None else _pad_weights(gw, W)
+            costs = None
+        weights = self.weights
+        self.w_min = gw.min_cost()
+        w = gw.width
+        touched = set()
+        for (x, y) in cells:
+            i = (y + 1) * W + (x + 1)
+            blocked[i] = _BLOCKED_TABLE[gw.grid[y][x]]
+            if costs is not None:
+                weights[i] = costs[y*w + x]
+            for dy in (-W, 0, W):
+                for dx in (-1, 0, 1):
+                    touched.add(i + dy + dx)
+        mask = self.mask
+        for i in touched:
+            if blocked[i]:
+                mask[i] = 0
+                continue
+            m = 0
+            for k, off, oa, ob in self._dirs:
+                if not blocked[i + off] and not (oa and (blocked[i + oa] or blocked[i + ob])):
+                    m |= 1 << k
+            mask[i] = m
+    def to_id(self, node):
+        x, y = node
+        return (y + 1) * self.W + (x + 1)
+    def to_xy(self, i):
+        y, x = divmod(i, self.W)
+        return (x - 1, y - 1)
+
+
+def astar_flat(gw: GridWorld, start, goal, heuristic=DEFAULT_HEURISTIC, weight=1.0, fg=None, stats=None):
+    """
+    A* on flat cell ids. Pass a prebuilt FlatGrid as fg to reuse the tables
+    across queries on an unchanged grid. Returns a SearchResult and fills
+    stats (a SearchStats) if given.
+    """
+    start_time = time.perf_counter()
+    heur = get_heuristic(heuristic, weight)
+    if fg is None:
+        fg = FlatGrid(gw)
+    if fg.weights is not None:
+        return _astar_flat_weighted(fg, start, goal, heur, start_time, stats)
+    h = heur.fn
+    W = fg.W
+    moves = fg.moves
+    mask = fg.mask
+    size = len(fg.blocked)
+    g_score = [_UNSEEN] * size
+    parent = [-1] * size
+    closed = bytearray(size)
+    s = fg.to_id(start)
+    t = fg.to_id(goal)
+    gy, gx = divmod(t, W)
+    sy, sx = divmod(s, W)
+    g_score[s] = 0
+    # heap keys pack (f, counter, id) into one int: same order as the tuples, cheaper to compare
+    open_heap = [h(abs(sx-gx), abs(sy-gy)) << _KEY_SHIFT | s]
+    counter = 0
+    nodes_expanded = 0
+    evals = 0
+    push, pop = heapq.heappush, heapq.heappop
+    if stats is not None:
+        hc = HeapCounter(stats, start_time, closed.__getitem__, _entry_id, (s,))
+        push, pop = hc.push, hc.pop
+
+    while open_heap:
+        cur = pop(open_heap) & _ID_MASK
+        if closed[cur]:
+            continue
+        if cur == t:
+            if stats is not None:
+                hc.found()
+            # walk the parents for the cost too: with an inconsistent or
+            # inflated heuristic they can improve after g(goal) was set
+            path = [fg.to_xy(t)]
+            cost = 0
+            while cur != s:
+                prev = parent[cur]
+                cost += 10 if abs(cur - prev) in (1, W) else 14
+                path.append(fg.to_xy(prev))
+                cur = prev
+            path.reverse()
+            t_ms = (time.perf_counter() - start_time) * 1000
+            if stats is not None:
+                hc.finish(nodes_expanded, counter + 1, evals)
+            return SearchResult(path, cost, nodes_expanded, t_ms, heur.bound, counter + 1)
+        closed[cur] = 1
+        nodes_expanded += 1
+        g_cur = g_score[cur]
+        cur_moves = moves[mask[cur]]
+        if stats is not None:
+            # moves examined: the legal moves of every expanded cell
+            evals += len(cur_moves)
+        for off, cost in cur_moves:
+            nb = cur + off
+            tentative_g = g_cur + cost
+            if tentative_g < g_score[nb]:
+                parent[nb] = cur
+                g_score[nb] = tentative_g
+                y, x = divmod(nb, W)
+                counter += 1
+                push(open_heap, (tentative_g + h(abs(x-gx), abs(y-gy))) << _KEY_SHIFT | counter << _ID_BITS | nb)
+    t_ms = (time.perf_counter() - start_time) * 1000
+    if stats is not None:
+        hc.finish(nodes_expanded, counter + 1, evals)
+    return SearchResult(None, None, nodes_expanded, t_ms, heur.bound, counter + 1)
+
+def _astar_flat_weighted(fg, start, goal, heur, start_time, stats):
+    # astar_flat's loop with terrain costs: base cost times the mean weight of both cells
+    h = scale_heuristic(heur, fg.w_min).fn
+    W = fg.W
+    moves = fg.moves
+    mask = fg.mask
+    weights = fg.weights
+    size = len(fg.blocked)
+    g_score = [_UNSEEN] * size
+    parent = [-1] * size
+    closed = bytearray(size)
+    s = fg.to_id(start)
+    t = fg.to_id(goal)
+    gy, gx = divmod(t, W)
+    sy, sx = divmod(s, W)
+    g_score[s] = 0
+    open_heap = [h(abs(sx-gx), abs(sy-gy)) << _KEY_SHIFT | s]
+    counter = 0
+    nodes_expanded = 0
+    evals = 0
+    push, pop = heapq.heappush, heapq.heappop
+    if stats is not None:
+        hc = HeapCounter(stats, start_time, closed.__getitem__, _entry_id, (s,))
+        push, pop = hc.push, hc.pop
+
+    while open_heap:
+        cur = pop(open_heap) & _ID_MASK
+        if closed[cur]:
+            continue
+        if cur == t:
+            if stats is not None:
+                hc.found()
+            path = [fg.to_xy(t)]
+            cost = 0
+            while cur != s:
+                prev = parent[cur]
+                step = 10 if abs(cur - prev) in (1, W) else 14
+                cost += step // 2 * (weights[prev] + weights[cur])
+                path.append(fg.to_xy(prev))
+                cur = prev
+            path.reverse()
+            t_ms = (time.perf_counter() - start_time) * 1000
+            if stats is not None:
+                hc.finish(nodes_expanded, counter + 1, evals)
+            return SearchResult(path, cost, nodes_expanded, t_ms, heur.bound, counter + 1)
+        closed[cur] = 1
+        nodes_expanded += 1
+        g_cur = g_score[cur]
+        w_cur = weights[cur]
+        cur_moves = moves[mask[cur]]
+        if stats is not None:
+            evals += len(cur_moves)
+        for off, cost in cur_moves:
+            nb = cur + off
+            tentative_g = g_cur + cost // 2 * (w_cur + weights[nb])
+            if tentative_g < g_score[nb]:
+                parent[nb] = cur
+                g_score[nb] = tentative_g
+                y, x = divmod(nb, W)
+                counter += 1
+                push(open_heap, (tentative_g + h(abs(x-gx), abs(y-gy))) << _KEY_SHIFT | counter << _ID_BITS | nb)
+    t_ms = (time.perf_counter() - start_time) * 1000
+    if stats is not None:
+        hc.finish(nodes_expanded, counter + 1, evals)
+    return SearchResult(None, None, nodes_expanded, t_ms, heur.bound, counter + 1)
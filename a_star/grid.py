@@ -0,0 +1,248 @@
+import itertools
+import random
+from array import array
+
+# Grid initial params
+DEFAULT_N = 13
+MIN_N = 6
+MAX_N = 60  # side limit of the original square grids, kept for callers; sizes are bounded by MAX_CELLS
+DEFAULT_DENSITY = 0.2  # 20% obstacles
+# upper bound on width*height (cell ids and the engines' per-cell tables stay small)
+MAX_CELLS = 1 << 24
+
+# Cell types
+FREE = 0
+OBSTACLE = 1
+START = 2
+GOAL = 3
+
+# terrain weights: a cell with weight w costs w times a plain cell to cross
+MIN_COST = 1
+MAX_COST = 0xFFFF
+
+# versions come from one process-wide counter, so two grids never share a version
+_versions = itertools.count(1)
+
+# byte translation tables for the bulk operations
+_CLEAR_TABLE = bytes(FREE if i == OBSTACLE else i for i in range(256))
+
+
+def _check_size(width, height):
+    if width < 1 or height < 1:
+        raise ValueError(f"grid sides must be positive, got {width}x{height}")
+    if width * height > MAX_CELLS:
+        raise ValueError(f"{width}x{height} grid exceeds MAX_CELLS ({MAX_CELLS})")
+
+def _density_table(density):
+    # random byte b becomes an obstacle when b < density*256
+    thr = int(round(max(0.0, min(1.0, density)) * 256))
+    return bytes(OBSTACLE if i < thr else FREE for i in range(256))
+
+
+class GridWorld:
+    """
+    width x height map stored as one row-major uint8 buffer (``cells``);
+    cell (x, y) is ``cells[y*width + x]``. ``N`` is the side of a square grid.
+
+    ``grid`` keeps the historical ``gw.grid[y][x]`` access, but each row is a
+    memoryview into ``cells``, so reads and writes go straight to the buffer.
+    ``as_array()`` exposes the same memory as a NumPy array without copying.
+
+    ``costs`` is an optional terrain layer: None for a uniform grid, else a
+    uint16 weight per cell (row-major, >= 1). A move between two cells costs
+    its base cost (10/14) times the mean weight of both cells.
+
+    ``version`` increases on every mutation made through the methods below;
+    code that writes ``cells``/``grid``/``costs`` directly must call ``touch()``.
+    """
+    def __init__(self, N=DEFAULT_N, density=DEFAULT_DENSITY, width=None, height=None):
+        self.width = N if width is None else width
+        self.height = N if height is None else height
+        _check_size(self.width, self.height)
+        self.density = density
+        self._alloc()
+        self.start = None
+        self.goal = None
+    @property
+    def N(self):
+        if self.width != self.height:
+            raise ValueError(f"N is only defined for square grids; this one is {self.width}x{self.height}")
+        return self.width
+    def _alloc(self):
+        self._bind(bytearray(self.width * self.height))
+    def _bind(self, buf):
+        W = self.width
+        self.version = next(_versions)
+        self.cells = buf
+        self.costs = None
+        self._min_cost = (None, MIN_COST)
+        view = memoryview(buf)
+        self.grid = [view[y*W:(y+1)*W] for y in range(self.height)]
+    # pickling/copying stores the cells and weights by value (the row views
+    # and a mapped file cannot be pickled) and rebinds them on load; the
+    # copy is an in-memory grid with a version of its own
+    _UNPICKLED = ("cells", "costs", "grid", "version", "_min_cost", "map_file", "map_version")
+    def __getstate__(self):
+        state = {k: v for k, v in self.__dict__.items() if k not in self._UNPICKLED}
+        state["cells"] = bytes(self.cells)
+        state["costs"] = None if self.costs is None else array('H', self.costs)
+        return state
+    def __setstate__(self, state):
+        state = dict(state)
+        cells, costs = state.pop("cells"), state.pop("costs")
+        self.__dict__.update(state)
+        self._bind(bytearray(cells))
+        self.costs = costs
+    @classmethod
+    def from_buffer(cls, width, buf, density=DEFAULT_DENSITY, height=None):
+        """Wrap an existing width*height byte buffer (e.g. shared memory) without copying."""
+        height = width if height is None else height
+        _check_size(width, height)
+        if len(buf) != width * height:
+            raise ValueError(f"buffer holds {len(buf)} cells, a {width}x{height} grid needs {width * height}")
+        gw = cls.__new__(cls)
+        gw.width = width
+        gw.height = height
+        gw.density = density
+        gw._bind(buf)
+        gw.start = None
+        gw.goal = None
+        return gw
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+    def touch(self):
+        """Mark the grid as modified (bumps version)."""
+        self.version = next(_versions)
+    def set_cell(self, x, y, value):
+        if self.grid[y][x] != value:
+            self.grid[y][x] = value
+            self.touch()
+    def set_start(self, pos):
+        # clears the previous START marker, if it is still there
+        if self.start and self.grid[self.start[1]][self.start[0]] == START:
+            self.grid[self.start[1]][self.start[0]] = FREE
+        self.start = pos
+        if pos:
+            self.grid[pos[1]][pos[0]] = START
+        self.touch()
+    def set_goal(self, pos):
+        if self.goal and self.grid[self.goal[1]][self.goal[0]] == GOAL:
+            self.grid[self.goal[1]][self.goal[0]] = FREE
+        self.goal = pos
+        if pos:
+            self.grid[pos[1]][pos[0]] = GOAL
+        self.touch()
+    def set_cost(self, x, y, w):
+        """Terrain weight of one cell; the first weight other than 1 creates the cost layer."""
+        if not MIN_COST <= w <= MAX_COST:
+            raise ValueError(f"cell weight must be in [{MIN_COST}, {MAX_COST}], got {w}")
+        if self.costs is None:
+            if w == MIN_COST:
+                return
+            self.costs = array('H', [MIN_COST]) * (self.width * self.height)
+        i = y * self.width + x
+        if self.costs[i] != w:
+            self.costs[i] = w
+            self.touch()
+    def cost_at(self, x, y):
+        return MIN_COST if self.costs is None else self.costs[y * self.width + x]
+    def fill_costs(self, x0, y0, x1, y1, w):
+        """Set the weight of every cell in [x0, x1) x [y0, y1)."""
+        x0, x1 = max(0, x0), min(self.width, x1)
+        y0, y1 = max(0, y0), min(self.height, y1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        self.set_cost(x0, y0, w)
+        if self.costs is None:
+            return
+        row = array('H', [w]) * (x1 - x0)
+        for y in range(y0, y1):
+            i = y * self.width
+            self.costs[i+x0:i+x1] = row
+        self.touch()
+    def clear_costs(self):
+        """Back to uniform costs."""
+        if self.costs is not None:
+            self.costs = None
+            self.touch()
+    def min_cost(self):
+        """Smallest cell weight (cached per version); admissible heuristics are scaled by it."""
+        if self.costs is None:
+            return MIN_COST
+        version, value = self._min_cost
+        if version != self.version:
+            value = min(self.costs)
+            self._min_cost = (self.version, value)
+        return value
+    def as_array(self):
+        # zero-copy (height, width) uint8 view; numpy is only needed by callers that use it
+        import numpy as np
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height, self.width)
+    def resize(self, width, height=None):
+        """
+        Change the size keeping the map: the overlapping top-left part (cells
+        and weights) is copied, new cells are free, and a start/goal that falls
+        outside is dropped.
+        """
+        width = int(width)
+        height = width if height is None else int(height)
+        _check_size(width, height)
+        old_w, old_cells, old_costs = self.width, self.cells, self.costs
+        w = min(width, old_w)
+        cells = bytearray(width * height)
+        costs = None if old_costs is None else array('H', [MIN_COST]) * (width * height)
+        for y in range(min(height, self.height)):
+            cells[y*width:y*width + w] = old_cells[y*old_w:y*old_w + w]
+            if costs is not None:
+                costs[y*width:y*width + w] = old_costs[y*old_w:y*old_w + w]
+        self.width, self.height = width, height
+        self._bind(cells)
+        self.costs = costs
+        if self.start and not self.in_bounds(*self.start):
+            self.start = None
+        if self.goal and not self.in_bounds(*self.goal):
+            self.goal = None
+    def clear_all(self):
+        self._alloc()
+        self.start = None
+        self.goal = None
+    def clear_obstacles(self):
+        # bytes() also covers cells that are a memoryview (from_buffer grids)
+        self.cells[:] = bytes(self.cells).translate(_CLEAR_TABLE)
+        self.touch()
+    def randomize_obstacles(self, density=None, seed=None):
+        if density is None:
+            density = self.density
+        rng = random if seed is None else random.Random(seed)
+        # after clear_obstacles only start/goal are non-free, and they are re-marked below
+        self.cells[:] = rng.randbytes(len(self.cells)).translate(_density_table(density))
+        self._mark_endpoints()
+        self.touch()
+    def fill_region(self, x0, y0, x1, y1, value=OBSTACLE):
+        """Set every cell in [x0, x1) x [y0, y1) to value, keeping start/goal."""
+        x0, x1 = max(0, x0), min(self.width, x1)
+        y0, y1 = max(0, y0), min(self.height, y1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        row = bytes([value]) * (x1 - x0)
+        for y in range(y0, y1):
+            i = y * self.width
+            self.cells[i+x0:i+x1] = row
+        self._mark_endpoints()
+        self.touch()
+    def erase_region(self, x0, y0, x1, y1):
+        """Remove obstacles in [x0, x1) x [y0, y1)."""
+        x0, x1 = max(0, x0), min(self.width, x1)
+        y0, y1 = max(0, y0), min(self.height, y1)
+        for y in range(y0, y1):
+            i = y * self.width
+            self.cells[i+x0:i+x1] = bytes(self.cells[i+x0:i+x1]).translate(_CLEAR_TABLE)
+        self.touch()
+    def _mark_endpoints(self):
+        # ensure start and goal cells are free if set
+        if self.start:
+            sx, sy = self.start
+            self.grid[sy][sx] = START
+        if self.goal:
+            gx, gy = self.goal
+            self.grid[gy][gx] = GOAL
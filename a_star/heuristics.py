@@ -0,0 +1,88 @@
+"""
+Heuristic registry for the 8-connected grid (straight moves cost 10, diagonals 14).
+
+Every heuristic is a function of the absolute deltas (dx, dy) to the goal and
+returns an int, so the engines can keep integer f-scores. Each entry carries
+``bound``: the worst-case ratio between the cost A* returns with it and the
+optimal cost (1.0 means the path is optimal).
+
+    octile     exact distance on an empty map: admissible and consistent (bound 1)
+    chebyshev  10*max(dx, dy): admissible, weaker than octile (bound 1)
+    euclidean  10*hypot(dx, dy): overestimates a diagonal step (14.14 > 14),
+               so it is slightly inadmissible (bound 10*sqrt(2)/14 ~ 1.0102)
+    zero       Dijkstra (bound 1)
+    manhattan  10*(dx + dy): overestimates diagonals, bound 20/14 ~ 1.4286
+
+Any of them can be inflated per call with ``weight`` (weighted A*), which
+multiplies the bound by the weight.
+
+On weighted-terrain grids (GridWorld.costs) every move costs at least its
+base cost times the cheapest cell weight, so the engines multiply h by that
+weight (scale_heuristic): admissibility, consistency and bound are unchanged.
+"""
+import math
+from collections import namedtuple
+
+Heuristic = namedtuple("Heuristic", ["name", "fn", "bound", "description"])
+
+def octile(dx, dy):
+    if dx > dy:
+        return 10 * dx + 4 * dy
+    return 10 * dy + 4 * dx
+
+def chebyshev(dx, dy):
+    return 10 * max(dx, dy)
+
+def euclidean(dx, dy):
+    return int(10 * math.hypot(dx, dy))
+
+def zero(dx, dy):
+    return 0
+
+def manhattan(dx, dy):
+    return 10 * (dx + dy)
+
+HEURISTICS = {}
+
+def register_heuristic(name, fn, bound, description=""):
+    """Add (or replace) a heuristic; fn(dx, dy) must return an int."""
+    HEURISTICS[name] = Heuristic(name, fn, bound, description)
+
+register_heuristic("octile", octile, 1.0, "admisible y consistente: ruta óptima")
+register_heuristic("chebyshev", chebyshev, 1.0, "admisible: ruta óptima, más expansiones que octile")
+register_heuristic("euclidean", euclidean, 10 * math.sqrt(2) / 14, "sobreestima diagonales: ~1% subóptima como mucho")
+register_heuristic("zero", zero, 1.0, "Dijkstra: ruta óptima, sin guía")
+register_heuristic("manhattan", manhattan, 20 / 14, "inadmisible en 8-conexión: hasta ~43% subóptima")
+
+DEFAULT_HEURISTIC = "octile"
+
+def get_heuristic(heuristic=DEFAULT_HEURISTIC, weight=1.0):
+    """
+    Resolve a registry name (or a Heuristic) plus an optional weight into a
+    Heuristic whose fn already includes the weight and whose bound reflects it.
+    """
+    if isinstance(heuristic, Heuristic):
+        h = heuristic
+    else:
+        try:
+            h = HEURISTICS[heuristic]
+        except KeyError:
+            raise ValueError(f"unknown heuristic {heuristic!r}; choose one of {sorted(HEURISTICS)}") from None
+    if weight == 1:
+        return h
+    if weight < 1:
+        raise ValueError("weight must be >= 1")
+    base = h.fn
+    def weighted(dx, dy):
+        return int(weight * base(dx, dy))
+    return Heuristic(f"{h.name}*{weight:g}", weighted, h.bound * weight,
+                     f"{h.description}; inflada x{weight:g}")
+
+def scale_heuristic(h, factor):
+    """h times an integer factor (the grid's minimum cell weight); same bound."""
+    if factor == 1:
+        return h
+    base = h.fn
+    def scaled(dx, dy):
+        return factor * base(dx, dy)
+    return Heuristic(h.name, scaled, h.bound, h.description)
@@ -0,0 +1,354 @@
+"""
+Hierarchical pathfinding (HPA*).
+
+HPAGraph splits the grid into square clusters. Along every border between two
+clusters, each maximal run of cell pairs that are free on both sides is an
+entrance: runs shorter than entrance_width get one transition in the middle,
+longer ones one at each end. Transition cells are the abstract nodes; the two
+cells of a transition are joined by an inter edge (cost 10, times the mean
+terrain weight of both cells), and the nodes of one cluster are joined by intra
+edges whose cost is a search restricted to that cluster (same moves and costs
+as FlatGrid).
+
+A query inserts start and goal into their clusters, runs A* on the abstract
+graph and then refines each intra edge with a local search. Paths are valid
+and usually close to optimal, but HPA* gives no suboptimality guarantee, so
+results report bound=inf. Quality vs speed:
+  - cluster_size: larger clusters mean fewer abstract nodes but costlier
+    insertion and refinement
+  - entrance_width: smaller values put two transitions on more entrances
+    (better paths, bigger graph)
+  - weight: weighted A* on the abstract graph
+  - refine=False returns only the abstract waypoints (same cost, no refinement)
+
+update(changed_cells) rebuilds only the clusters around the changed cells and
+the entrances on their borders.
+"""
+import heapq
+import time
+from array import array
+
+from .grid import GridWorld
+from .flat import FlatGrid, _ID_BITS, _ID_MASK, _KEY_SHIFT
+from .search import SearchResult
+from .heuristics import get_heuristic, scale_heuristic, DEFAULT_HEURISTIC
+
+INF = float('inf')
+
+DEFAULT_CLUSTER_SIZE = 16
+DEFAULT_ENTRANCE_WIDTH = 6
+
+# inter edges always join two orthogonally adjacent cells
+_INTER_COST = 10
+
+
+def _local_search(fg, cid, c, src, targets, h=None, goal=None):
+    """
+    Dijkstra (or A* towards goal when h is given) from src over the cells of
+    cluster c. Stops once every target is settled.
+    Returns (g, parent, nodes_expanded, heap_pushes).
+    """
+    W = fg.W
+    moves, mask, weights = fg.moves, fg.mask, fg.weights
+    g = {src: 0}
+    parent = {src: -1}
+    closed = set()
+    remaining = set(targets)
+    remaining.discard(src)
+    if h is not None:
+        gy, gx = divmod(goal, W)
+        sy, sx = divmod(src, W)
+        heap = [h(abs(sx - gx), abs(sy - gy)) << _KEY_SHIFT | src]
+    else:
+        heap = [src]
+    counter = 0
+    expanded = 0
+    push, pop = heapq.heappush, heapq.heappop
+    while heap and remaining:
+        cur = pop(heap) & _ID_MASK
+        if cur in closed:
+            continue
+        closed.add(cur)
+        remaining.discard(cur)
+        expanded += 1
+        g_cur = g[cur]
+        for off, cost in moves[mask[cur]]:
+            nb = cur + off
+            if cid[nb] != c:
+                continue
+            if weights is not None:
+                cost = cost // 2 * (weights[cur] + weights[nb])
+            tentative_g = g_cur + cost
+            if tentative_g < g.get(nb, INF):
+                g[nb] = tentative_g
+                parent[nb] = cur
+                f = tentative_g
+                if h is not None:
+                    y, x = divmod(nb, W)
+                    f += h(abs(x - gx), abs(y - gy))
+                counter += 1
+                push(heap, f << _KEY_SHIFT | counter << _ID_BITS | nb)
+    # only settled targets have final costs
+    for n in remaining:
+        g.pop(n, None)
+    return g, parent, expanded, counter + 1
+
+
+class HPAGraph:
+    def __init__(self, gw: GridWorld, cluster_size=DEFAULT_CLUSTER_SIZE, entrance_width=DEFAULT_ENTRANCE_WIDTH):
+        if cluster_size < 2:
+            raise ValueError("cluster_size must be at least 2")
+        start_time = time.perf_counter()
+        self.gw = gw
+        # private FlatGrid: update() patches it instead of rebuilding
+        self.fg = fg = FlatGrid(gw)
+        self.cluster_size = cluster_size
+        self.entrance_width = entrance_width
+        w, W = fg.width, fg.W
+        self.ncx = ncx = -(-w // cluster_size)
+        self.ncy = ncy = -(-fg.height // cluster_size)
+        # cluster index of every padded cell id, -1 on the border
+        cid = array('i', [-1]) * len(fg.blocked)
+        for y in range(fg.height):
+            row = array('i', [(y // cluster_size) * ncx + x // cluster_size for x in range(w)])
+            cid[(y + 1) * W + 1:(y + 1) * W + 1 + w] = row
+        self.cid = cid
+        self.inter = {}                                   # node -> {node: inter cost}
+        self.intra = [{} for _ in range(ncx * ncy)]       # per cluster: node -> {node: cost}
+        self._borders = {}                                # (c1, c2) -> [(a, b), ...]
+        for c in range(ncx * ncy):
+            for key in self._border_keys(c):
+                if key[0] == c:
+                    self._set_border(key, self._scan_border(*key))
+        for c in range(ncx * ncy):
+            self._build_cluster(c)
+        self.version = gw.version
+        self.build_ms = (time.perf_counter() - start_time) * 1000
+
+    # --- construction ---
+    def _border_keys(self, c):
+        # (left/top cluster, right/bottom cluster) for every neighbor of c
+        cy, cx = divmod(c, self.ncx)
+        ncx = self.ncx
+        keys = []
+        if cx > 0:
+            keys.append((c - 1, c))
+        if cx < ncx - 1:
+            keys.append((c, c + 1))
+        if cy > 0:
+            keys.append((c - ncx, c))
+        if cy < self.ncy - 1:
+            keys.append((c, c + ncx))
+        return keys
+    def _scan_border(self, c1, c2):
+        """Transitions (a in c1, b in c2) on the border between two adjacent clusters."""
+        fg, cs = self.fg, self.cluster_size
+        W, blocked = fg.W, fg.blocked
+        cy, cx = divmod(c1, self.ncx)
+        if c2 // self.ncx == cy:
+            # vertical border: walk down the last column of c1
+            x = (cx + 1) * cs - 1
+            cells = [(y + 1) * W + x + 1 for y in range(cy * cs, min((cy + 1) * cs, fg.height))]
+            step = 1
+        else:
+            # horizontal border: walk along the last row of c1
+            y = (cy + 1) * cs - 1
+            cells = [(y + 1) * W + x + 1 for x in range(cx * cs, min((cx + 1) * cs, fg.width))]
+            step = W
+        transitions = []
+        run = []
+        for a in cells + [None]:
+            if a is not None and not blocked[a] and not blocked[a + step]:
+                run.append(a)
+                continue
+            if run:
+                if len(run) < self.entrance_width:
+                    picks = (run[len(run) // 2],)
+                else:
+                    picks = (run[0], run[-1])
+                transitions.extend((a0, a0 + step) for a0 in picks)
+                run = []
+        return transitions
+    def _set_border(self, key, transitions):
+        inter = self.inter
+        for a, b in self._borders.get(key, ()):
+            for u, v in ((a, b), (b, a)):
+                edges = inter.get(u)
+                if edges is not None:
+                    edges.pop(v, None)
+                    if not edges:
+                        del inter[u]
+        self._borders[key] = transitions
+        weights = self.fg.weights
+        for a, b in transitions:
+            cost = _INTER_COST if weights is None else _INTER_COST // 2 * (weights[a] + weights[b])
+            inter.setdefault(a, {})[b] = cost
+            inter.setdefault(b, {})[a] = cost
+    def _cluster_nodes(self, c):
+        nodes = set()
+        for key in self._border_keys(c):
+            side = 0 if key[0] == c else 1
+            nodes.update(t[side] for t in self._borders.get(key, ()))
+        return nodes
+    def _build_cluster(self, c):
+        # one Dijkstra per node; costs are symmetric, so later nodes skip earlier targets
+        nodes = sorted(self._cluster_nodes(c))
+        edges = {n: {} for n in nodes}
+        for k, n in enumerate(nodes):
+            rest = nodes[k + 1:]
+            if not rest:
+                break
+            g = _local_search(self.fg, self.cid, c, n, rest)[0]
+            for m in rest:
+                if m in g:
+                    edges[n][m] = edges[m][n] = g[m]
+        self.intra[c] = edges
+
+    # --- queries ---
+    def find_path(self, start, goal, heuristic=DEFAULT_HEURISTIC, weight=1.0, refine=True):
+        """
+        HPA* query. Returns a SearchResult; with refine=False the path only
+        lists the abstract waypoints (consecutive waypoints are joined by a
+        search restricted to one cluster, or are adjacent cells).
+        """
+        start_time = time.perf_counter()
+        fg, cid, intra, inter = self.fg, self.cid, self.intra, self.inter
+        h = scale_heuristic(get_heuristic(heuristic, weight), fg.w_min).fn
+        # refinement must reproduce the intra costs, so it always uses plain (admissible) octile
+        refine_h = scale_heuristic(get_heuristic(DEFAULT_HEURISTIC), fg.w_min).fn
+        W = fg.W
+        s, t = fg.to_id(start), fg.to_id(goal)
+        if s == t:
+            t_ms = (time.perf_counter() - start_time) * 1000
+            return SearchResult([start], 0, 0, t_ms, INF, 0)
+        cs_, ct = cid[s], cid[t]
+        expanded = pushes = 0
+
+        # insert start and goal: costs to every abstract node of their cluster
+        targets = set(intra[cs_])
+        if ct == cs_:
+            targets.add(t)
+        g_s, _, e, p = _local_search(fg, cid, cs_, s, targets)
+        expanded += e
+        pushes += p
+        s_edges = {n: c for n, c in g_s.items() if n in targets and n != s}
+        g_t, _, e, p = _local_search(fg, cid, ct, t, set(intra[ct]))
+        expanded += e
+        pushes += p
+        t_edges = {n: c for n, c in g_t.items() if n in intra[ct] and n != t}
+
+        # A* on the abstract graph
+        gy, gx = divmod(t, W)
+        g = {s: 0}
+        parent = {s: -1}
+        # cost of the edge to each node's parent: an inflated or inconsistent h
+        # can improve a closed node's parent, so the path is costed by its edges
+        step = {}
+        closed = set()
+        heap = [(0, 0, s)]
+        counter = 0
+        while heap:
+            _, _, u = heapq.heappop(heap)
+            if u in closed:
+                continue
+            if u == t:
+                break
+            closed.add(u)
+            expanded += 1
+            g_u = g[u]
+            out = [intra[cid[u]].get(u, {}), inter.get(u, {})]
+            if u == s:
+                out.append(s_edges)
+            if u in t_edges:
+                out.append({t: t_edges[u]})
+            for edges in out:
+                for v, c in edges.items():
+                    tentative_g = g_u + c
+                    if tentative_g < g.get(v, INF):
+                        g[v] = tentative_g
+                        parent[v] = u
+                        step[v] = c
+                        y, x = divmod(v, W)
+                        counter += 1
+                        heapq.heappush(heap, (tentative_g + h(abs(x - gx), abs(y - gy)), counter, v))
+        pushes += counter + 1
+        if t not in g:
+            t_ms = (time.perf_counter() - start_time) * 1000
+            return SearchResult(None, None, expanded, t_ms, INF, pushes)
+
+        abstract = []
+        cost = 0
+        n = t
+        while n != -1:
+            abstract.append(n)
+            cost += step.get(n, 0)
+            n = parent[n]
+        abstract.reverse()
+        if not refine:
+            path = [fg.to_xy(n) for n in abstract]
+        else:
+            path = [start]
+            for u, v in zip(abstract, abstract[1:]):
+                if cid[u] != cid[v]:
+                    path.append(fg.to_xy(v))
+                    continue
+                # A* inside the cluster; its cost is the intra edge cost
+                _, seg_parent, e, p = _local_search(fg, cid, cid[u], u, (v,), refine_h, v)
+                expanded += e
+                pushes += p
+                seg = []
+                n = v
+                while n != u:
+                    seg.append(fg.to_xy(n))
+                    n = seg_parent[n]
+                path.extend(reversed(seg))
+        t_ms = (time.perf_counter() - start_time) * 1000
+        return SearchResult(path, cost, expanded, t_ms, INF, pushes)
+
+    # --- maintenance ---
+    def update(self, changed_cells):
+        """
+        Re-read changed_cells from the grid and rebuild the clusters they can
+        affect (a cell changes the moves of its 3x3 neighborhood), the
+        entrances on those clusters' borders and the intra edges of the
+        neighbors that share them. Returns the set of rebuilt cluster indices.
+        """
+        changed_cells = list(changed_cells)
+        fg = self.fg
+        fg.refresh(self.gw, changed_cells)
+        cs, ncx = self.cluster_size, self.ncx
+        affected = set()
+        for (x, y) in changed_cells:
+            for yy in range(max(0, y - 1), min(fg.height, y + 2)):
+                for xx in range(max(0, x - 1), min(fg.width, x + 2)):
+                    affected.add((yy // cs) * ncx + xx // cs)
+        borders = {key for c in affected for key in self._border_keys(c)}
+        for key in borders:
+            self._set_border(key, self._scan_border(*key))
+        rebuilt = affected | {c for key in borders for c in key}
+        for c in rebuilt:
+            self._build_cluster(c)
+        self.version = self.gw.version
+        return rebuilt
+    def stats(self):
+        return {
+            "clusters": len(self.intra),
+            "nodes": sum(len(e) for e in self.intra),
+            "intra_edges": sum(len(v) for e in self.intra for v in e.values()) // 2,
+            "inter_edges": sum(len(v) for v in self.inter.values()) // 2,
+            "build_ms": self.build_ms,
+        }
+
+
+def hpa(gw: GridWorld, start, goal, heuristic=DEFAULT_HEURISTIC, weight=1.0, graph=None, refine=True,
+        cluster_size=DEFAULT_CLUSTER_SIZE):
+    """
+    Engine entry point. Pass a prebuilt HPAGraph as graph= to amortize the
+    precomputation; a missing or stale graph (older grid version) is rebuilt,
+    a stale one with its own cluster_size and entrance_width.
+    """
+    if graph is None:
+        graph = HPAGraph(gw, cluster_size)
+    elif graph.gw is not gw or graph.version != gw.version:
+        graph = HPAGraph(gw, graph.cluster_size, graph.entrance_width)
+    return graph.find_path(start, goal, heuristic, weight, refine)
@@ -0,0 +1,210 @@
+"""
+Jump Point Search for uniform-cost 8-connected grids without corner cutting.
+
+Uses the same movement rule as neighbors_of (a diagonal step needs both
+orthogonal neighbors free) and the FlatGrid padded buffer, so jumps never
+bounds-check. Only jump points are pushed to the open list; the returned path
+is expanded back to one cell per step, and its cost matches plain A* with an
+admissible heuristic. Jumps assume every cell costs the same, so grids with
+a terrain layer (GridWorld.costs) are rejected.
+"""
+import heapq
+import time
+
+from .grid import GridWorld
+from .flat import FlatGrid, _DIRS
+from .search import SearchResult, _entry_node
+from .heuristics import get_heuristic, DEFAULT_HEURISTIC
+from .stats import HeapCounter
+
+
+def _jump_straight(blocked, n, d, p, t):
+    # walk from n in direction d (p = perpendicular offset) until a jump point or a wall
+    while True:
+        if blocked[n]:
+            return -1
+        if n == t:
+            return n
+        # forced neighbor: the side cell is open but could not be reached diagonally from behind
+        if (not blocked[n+p] and blocked[n-d+p]) or (not blocked[n-p] and blocked[n-d-p]):
+            return n
+        n += d
+
+def _jump_diagonal(blocked, n, dx, dyW, t):
+    while True:
+        if blocked[n]:
+            return -1
+        if n == t:
+            return n
+        # a straight jump from here finds something -> n is a jump point
+        if (_jump_straight(blocked, n + dx, dx, dyW, t) != -1 or
+                _jump_straight(blocked, n + dyW, dyW, dx, t) != -1):
+            return n
+        # keep going diagonally only if both orthogonal cells are free
+        if blocked[n+dx] or blocked[n+dyW]:
+            return -1
+        n += dx + dyW
+
+def _successors(fg, n, parent):
+    """Pruned directions (dx, dy*W) out of n given the direction it was reached from."""
+    blocked = fg.blocked
+    W = fg.W
+    if parent < 0:
+        # start node: every legal move
+        m = fg.mask[n]
+        return [(dx, dy * W) for k, (dx, dy) in enumerate(_DIRS) if m >> k & 1]
+    py, px = divmod(parent, W)
+    ny, nx = divmod(n, W)
+    dx = (nx > px) - (nx < px)
+    dyW = ((ny > py) - (ny < py)) * W
+    result = []
+    if dx and dyW:
+        free_y = not blocked[n+dyW]
+        free_x = not blocked[n+dx]
+        if free_y:
+            result.append((0, dyW))
+        if free_x:
+            result.append((dx, 0))
+        if free_x and free_y:
+            result.append((dx, dyW))
+    elif dx:
+        free_next = not blocked[n+dx]
+        free_a = not blocked[n+W]
+        free_b = not blocked[n-W]
+        if free_next:
+            result.append((dx, 0))
+            if free_a:
+                result.append((dx, W))
+            if free_b:
+                result.append((dx, -W))
+        if free_a:
+            result.append((0, W))
+        if free_b:
+            result.append((0, -W))
+    else:
+        free_next = not blocked[n+dyW]
+        free_a = not blocked[n+1]
+        free_b = not blocked[n-1]
+        if free_next:
+            result.append((0, dyW))
+            if free_a:
+                result.append((1, dyW))
+            if free_b:
+                result.append((-1, dyW))
+        if free_a:
+            result.append((1, 0))
+        if free_b:
+            result.append((-1, 0))
+    return result
+
+def jps_steps(gw: GridWorld, start, goal, heuristic=DEFAULT_HEURISTIC, weight=1.0, fg=None, stats=None):
+    """
+    JPS with the same event protocol as astar_steps:
+        ('delta', current, new_open)   current and new_open are jump points
+        ('done', path, nodes_expanded, g_cost, time_ms)
+        ('no_path', nodes_expanded, time_ms)
+    stats is filled before the final event (neighbor_evals counts jump
+    directions).
+    """
+    start_time = time.perf_counter()
+    if fg is None:
+        fg = FlatGrid(gw)
+    if fg.weights is not None:
+        raise ValueError("JPS needs uniform cell costs; use 'flat' on weighted terrain")
+    h = get_heuristic(heuristic, weight).fn
+    blocked = fg.blocked
+    W = fg.W
+    s = fg.to_id(start)
+    t = fg.to_id(goal)
+    ty, tx = divmod(t, W)
+    g_score = {s: 0}
+    parent = {s: -1}
+    closed = set()
+    sy, sx = divmod(s, W)
+    open_heap = [(h(abs(sx-tx), abs(sy-ty)), 0, s)]
+    counter = 0
+    nodes_expanded = 0
+    evals = 0
+    push, pop = heapq.heappush, heapq.heappop
+    if stats is not None:
+        hc = HeapCounter(stats, start_time, closed.__contains__, _entry_node, (s,))
+        push, pop = hc.push, hc.pop
+
+    while open_heap:
+        cur = pop(open_heap)[2]
+        if cur in closed:
+            continue
+        if cur == t:
+            if stats is not None:
+                hc.found()
+            path = _expand_path(fg, parent, t)
+            t_ms = int((time.perf_counter() - start_time) * 1000)
+            if stats is not None:
+                hc.finish(nodes_expanded, counter + 1, evals)
+            yield ('done', path, nodes_expanded, g_score[t], t_ms)
+            return
+        closed.add(cur)
+        nodes_expanded += 1
+        cy, cx = divmod(cur, W)
+        g_cur = g_score[cur]
+        new_open = []
+        succ = _successors(fg, cur, parent[cur])
+        if stats is not None:
+            evals += len(succ)
+        for dx, dyW in succ:
+            if dx and dyW:
+                jp = _jump_diagonal(blocked, cur + dx + dyW, dx, dyW, t)
+            elif dx:
+                jp = _jump_straight(blocked, cur + dx, dx, W, t)
+            else:
+                jp = _jump_straight(blocked, cur + dyW, dyW, 1, t)
+            if jp < 0 or jp in closed:
+                continue
+            jy, jx = divmod(jp, W)
+            ax, ay = abs(jx - cx), abs(jy - cy)
+            # cur -> jp is a straight or pure diagonal run
+            tentative_g = g_cur + (14 * ax if ax and ay else 10 * (ax + ay))
+            if tentative_g < g_score.get(jp, tentative_g + 1):
+                g_score[jp] = tentative_g
+                parent[jp] = cur
+                counter += 1
+                push(open_heap, (tentative_g + h(abs(jx-tx), abs(jy-ty)), counter, jp))
+                new_open.append(fg.to_xy(jp))
+        yield ('delta', fg.to_xy(cur), new_open)
+    t_ms = int((time.perf_counter() - start_time) * 1000)
+    if stats is not None:
+        hc.finish(nodes_expanded, counter + 1, evals)
+    yield ('no_path', nodes_expanded, t_ms)
+
+def _expand_path(fg, parent, t):
+    # jump points back to one cell per move
+    jumps = []
+    n = t
+    while n != -1:
+        jumps.append(fg.to_xy(n))
+        n = parent[n]
+    jumps.reverse()
+    path = [jumps[0]]
+    for (x1, y1) in jumps[1:]:
+        x, y = path[-1]
+        sx = (x1 > x) - (x1 < x)
+        sy = (y1 > y) - (y1 < y)
+        while (x, y) != (x1, y1):
+            x += sx
+            y += sy
+            path.append((x, y))
+    return path
+
+def jps(gw: GridWorld, start, goal, heuristic=DEFAULT_HEURISTIC, weight=1.0, fg=None, stats=None):
+    """One-shot JPS. Returns a SearchResult; nodes_expanded counts jump points."""
+    start_time = time.perf_counter()
+    heur = get_heuristic(heuristic, weight)
+    pushes = 1
+    for ev in jps_steps(gw, start, goal, heur, fg=fg, stats=stats):
+        if ev[0] == 'delta':
+            pushes += len(ev[2])
+        elif ev[0] == 'done':
+            t_ms = (time.perf_counter() - start_time) * 1000
+            return SearchResult(ev[1], ev[3], ev[2], t_ms, heur.bound, pushes)
+    t_ms = (time.perf_counter() - start_time) * 1000
+    return SearchResult(None, None, ev[1], t_ms, heur.bound, pushes)
@@ -0,0 +1,283 @@
+"""
+Binary map files (.astm) opened through mmap.
+
+Layout (little endian), header padded to 64 bytes so the cells start aligned:
+
+    magic      4s   b"ASTM"
+    format     u16  FORMAT_VERSION
+    cell_bits  u16  bits per cell (8: one byte per cell, same values as GridWorld)
+    width      u32
+    height     u32
+    start      i32 x, i32 y   (-1, -1 if unset)
+    goal       i32 x, i32 y
+    revision   u64  map revision, bumped by every save_map / write_header
+    flags      u32  (format 2) bit 0: a terrain cost layer follows the cells
+    cells      width*height bytes, row-major
+    costs      (if flagged) width*height u16 weights, row-major, starting at
+               the next even offset
+
+Format 1 files (no flags field, no costs) are still read.
+
+Cells use GridWorld's own byte layout, so open_map() wraps the mapping with
+GridWorld.from_buffer without copying (the cost layer too, on little-endian
+hosts): opening is O(1) whatever the size,
+pages are read on first touch, and every process that maps the same file
+shares one copy in the page cache. MapFile.window() and iter_rows() read
+parts of maps that are too large to touch at once.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from .grid import GridWorld, OBSTACLE, FREE
+
+MAGIC = b"ASTM"
+FORMAT_VERSION = 2
+HEADER_SIZE = 64
+
+_HEADER = struct.Struct("<4sHHIIiiiiQ")
+_FLAGS = struct.Struct("<I")
+FLAG_COSTS = 1
+
+
+class MapFormatError(ValueError):
+    pass
+
+
+def _pack_header(width, height, start, goal, revision, flags=0):
+    sx, sy = start if start else (-1, -1)
+    gx, gy = goal if goal else (-1, -1)
+    head = _HEADER.pack(MAGIC, FORMAT_VERSION, 8, width, height, sx, sy, gx, gy, revision) + _FLAGS.pack(flags)
+    return head.ljust(HEADER_SIZE, b"\0")
+
+def _costs_offset(width, height):
+    size = width * height
+    return HEADER_SIZE + size + (size & 1)
+
+def read_header(buf):
+    """Parse the header at the start of buf. Returns a dict."""
+    if len(buf) < HEADER_SIZE:
+        raise MapFormatError("file too short for a map header")
+    magic, fmt, bits, width, height, sx, sy, gx, gy, revision = _HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise MapFormatError(f"not a map file (magic {magic!r})")
+    if fmt not in (1, FORMAT_VERSION):
+        raise MapFormatError(f"unsupported map format version {fmt}")
+    if bits != 8:
+        raise MapFormatError(f"unsupported cell size {bits} bits")
+    return {
+        "width": width,
+        "height": height,
+        "start": (sx, sy) if sx >= 0 else None,
+        "goal": (gx, gy) if gx >= 0 else None,
+        "revision": revision,
+        "flags": _FLAGS.unpack_from(buf, _HEADER.size)[0] if fmt >= 2 else 0,
+    }
+
+
+def save_map(path, gw: GridWorld, revision=None):
+    """
+    Write gw to path (header + cells, + the cost layer if gw has one). The
+    cells are written straight from the buffer.
+    """
+    if revision is None:
+        try:
+            with open(path, "rb") as f:
+                revision = read_header(f.read(HEADER_SIZE))["revision"] + 1
+        except (OSError, MapFormatError):
+            revision = 1
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_pack_header(gw.width, gw.height, gw.start, gw.goal, revision, 0 if gw.costs is None else FLAG_COSTS))
+        f.write(gw.cells)
+        if gw.costs is not None:
+            f.write(b"\0" * (_costs_offset(gw.width, gw.height) - HEADER_SIZE - len(gw.cells)))
+            costs = gw.costs
+            if sys.byteorder != "little":
+                costs = array('H', costs)
+                costs.byteswap()
+            f.write(costs)
+    os.replace(tmp, path)
+    return revision
+
+def create_map(path, width, fill=FREE, height=None):
+    """
+    Create a width x height map (square if height is None) on disk without
+    building it in memory. With fill=FREE the cell area is a sparse file, so
+    this is instant even for 20k x 20k.
+    """
+    if height is None:
+        height = width
+    with open(path, "wb") as f:
+        f.write(_pack_header(width, height, None, None, 1))
+        if fill == FREE:
+            f.truncate(HEADER_SIZE + width * height)
+        else:
+            row = bytes([fill]) * width
+            for _ in range(height):
+                f.write(row)
+
+
+class MapFile:
+    """
+    An open .astm file. The mapping stays alive as long as this object or any
+    GridWorld returned by gridworld() is referenced.
+    """
+    def __init__(self, path, writable=False):
+        self.path = path
+        self.writable = writable
+        self._file = open(path, "r+b" if writable else "rb")
+        try:
+            access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=access)
+            header = read_header(self._mm)
+        except BaseException:
+            self._file.close()
+            raise
+        self.width = header["width"]
+        self.height = header["height"]
+        self.start = header["start"]
+        self.goal = header["goal"]
+        self.revision = header["revision"]
+        self.flags = header["flags"]
+        size = self.width * self.height
+        if len(self._mm) < HEADER_SIZE + size:
+            raise MapFormatError(f"{path}: truncated cell array")
+        self.cells = memoryview(self._mm)[HEADER_SIZE:HEADER_SIZE + size]
+        self.costs = None
+        if self.flags & FLAG_COSTS:
+            off = _costs_offset(self.width, self.height)
+            if len(self._mm) < off + 2 * size:
+                raise MapFormatError(f"{path}: truncated cost layer")
+            costs = memoryview(self._mm)[off:off + 2 * size].cast('H')
+            if sys.byteorder != "little":
+                # big-endian host: private copy, edits are not written back
+                costs = array('H', costs)
+                costs.byteswap()
+            self.costs = costs
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        self.close()
+    def close(self):
+        # views handed out through gridworld() keep the mapping alive
+        try:
+            if isinstance(self.costs, memoryview):
+                self.costs.release()
+            self.cells.release()
+            self._mm.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def gridworld(self):
+        """Zero-copy GridWorld over the mapped cells (read-only unless writable=True)."""
+        gw = GridWorld.from_buffer(self.width, self.cells, height=self.height)
+        gw.costs = self.costs
+        gw.start, gw.goal = self.start, self.goal
+        gw.map_file = self
+        gw.map_version = gw.version  # grid version right after opening
+        return gw
+    def row(self, y):
+        W = self.width
+        return self.cells[y*W:(y+1)*W]
+    def iter_rows(self, chunk_rows=256, y0=0, y1=None):
+        """Yield (y, memoryview of chunk_rows rows) from y0 to y1, in file order."""
+        if y1 is None:
+            y1 = self.height
+        if hasattr(self._mm, "madvise"):
+            self._mm.madvise(mmap.MADV_SEQUENTIAL)
+        W = self.width
+        for y in range(y0, y1, chunk_rows):
+            yield y, self.cells[y*W:min(y + chunk_rows, y1)*W]
+    def window(self, x0, y0, size, height=None):
+        """
+        In-memory GridWorld copy of the size x height window (square if height
+        is None) at (x0, y0). Cells outside the map are obstacles; start/goal
+        are kept if they fall inside (in window coordinates). gw.offset =
+        (x0, y0) maps back to the file.
+        """
+        if height is None:
+            height = size
+        gw = GridWorld(width=size, height=height)
+        gw.cells[:] = bytes([OBSTACLE]) * (size * height)
+        if self.costs is not None:
+            gw.costs = array('H', [1]) * (size * height)
+        xa, xb = max(0, x0), min(self.width, x0 + size)
+        for y in range(max(0, y0), min(self.height, y0 + height)):
+            if xa < xb:
+                i = (y - y0) * size
+                gw.cells[i + xa - x0:i + xb - x0] = self.cells[y*self.width + xa:y*self.width + xb]
+                if self.costs is not None:
+                    gw.costs[i + xa - x0:i + xb - x0] = array('H', self.costs[y*self.width + xa:y*self.width + xb])
+        for name in ("start", "goal"):
+            p = getattr(self, name)
+            if p and x0 <= p[0] < x0 + size and y0 <= p[1] < y0 + height:
+                setattr(gw, name, (p[0] - x0, p[1] - y0))
+        gw.offset = (x0, y0)
+        gw.touch()
+        return gw
+    def write_header(self, gw: GridWorld):
+        """Store gw's start/goal in the header and bump the revision (writable maps)."""
+        if not self.writable:
+            raise ValueError("map was opened read-only")
+        self.start, self.goal = gw.start, gw.goal
+        self.revision += 1
+        self._mm[:HEADER_SIZE] = _pack_header(self.width, self.height, self.start, self.goal, self.revision, self.flags)
+    def flush(self):
+        self._mm.flush()
+
+
+def open_map(path, writable=False):
+    """
+    Open a .astm file as a GridWorld backed by the mapping. Read-only maps
+    raise TypeError on writes; with writable=True edits go straight to the
+    file (call gw.map_file.write_header(gw) to persist start/goal).
+    """
+    return MapFile(path, writable).gridworld()
+
+
+# --- CLI ---
+def _write_random(path, width, height, density, seed):
+    # row by row, so maps larger than RAM can be generated
+    import random
+    from .grid import _density_table
+    rng = random.Random(seed)
+    table = _density_table(density)
+    with open(path, "wb") as f:
+        f.write(_pack_header(width, height, None, None, 1))
+        for _ in range(height):
+            f.write(rng.randbytes(width).translate(table))
+
+def main(argv=None):
+    import argparse
+    import json
+    ap = argparse.ArgumentParser(prog="python -m a_star.mapfile", description="Binary map files (.astm).")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("info", help="print the header")
+    p.add_argument("path")
+    p = sub.add_parser("convert", help="ASCII map ('#' = obstacle) to .astm")
+    p.add_argument("src")
+    p.add_argument("dst")
+    p = sub.add_parser("random", help="random N x N (or N x --height) map, written row by row")
+    p.add_argument("N", type=int)
+    p.add_argument("dst")
+    p.add_argument("--height", type=int, default=None)
+    p.add_argument("--density", type=float, default=0.2)
+    p.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "info":
+        with MapFile(args.path) as mf:
+            print(json.dumps({"width": mf.width, "height": mf.height, "start": mf.start,
+                              "goal": mf.goal, "revision": mf.revision, "costs": mf.costs is not None}))
+    elif args.cmd == "convert":
+        from .batch import load_ascii_map
+        save_map(args.dst, load_ascii_map(args.src))
+    else:
+        _write_random(args.dst, args.N, args.height or args.N, args.density, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Multi-goal and many-to-many queries.
+
+nearest_goals() runs one A* towards a set of goals with h = min over the
+goals of the heuristic (still admissible and consistent), so goals are
+settled in order of their true distance and the search stops at the k-th.
+With many goals the min costs more than it saves and plain Dijkstra is used.
+
+distance_matrix() answers every source x target pair with one Dijkstra per
+source on the FlatGrid tables, stopping once all targets are settled, so a
+source shares its work across all targets. Rows are independent and can run
+in a process pool (the grid is shared as in batch_search). The result is a
+DistanceMatrix: row-major int64 distances (-1 = unreachable) and, for each
+pair, the cell before the target on a shortest path (-1 if none). With
+keep_trees=True each row also keeps its parent array so path(i, j) can
+rebuild full routes.
+"""
+import heapq
+import os
+import time
+from array import array
+
+from .grid import GridWorld
+from .flat import FlatGrid, _UNSEEN, _ID_BITS, _ID_MASK, _KEY_SHIFT
+from .search import SearchResult
+from .heuristics import get_heuristic, scale_heuristic, DEFAULT_HEURISTIC
+
+# above this many goals nearest_goals drops the heuristic (min over goals per push)
+MAX_HEURISTIC_GOALS = 16
+
+
+def _trace(parent, cur, to_xy):
+    path = []
+    while cur != -1:
+        path.append(to_xy(cur))
+        cur = parent[cur]
+    path.reverse()
+    return path
+
+def nearest_goals(gw: GridWorld, start, goals, k=1, heuristic=DEFAULT_HEURISTIC, fg=None):
+    """
+    The k goals closest to start, nearest first, as (goal, SearchResult)
+    pairs; unreachable goals are left out, so fewer than k may come back.
+    nodes_expanded and time_ms of each result count the search up to that goal.
+    """
+    start_time = time.perf_counter()
+    heur = get_heuristic(heuristic)
+    if heur.bound != 1:
+        raise ValueError("nearest_goals needs an admissible, consistent heuristic (bound 1)")
+    if fg is None:
+        fg = FlatGrid(gw)
+    W = fg.W
+    moves, mask, weights = fg.moves, fg.mask, fg.weights
+    goal_ids = {}
+    for goal in goals:
+        goal_ids.setdefault(fg.to_id(tuple(goal)), tuple(goal))
+    k = min(k, len(goal_ids))
+    if len(goal_ids) > MAX_HEURISTIC_GOALS:
+        h = None
+    else:
+        hfn = scale_heuristic(heur, fg.w_min).fn
+        targets = [divmod(t, W) for t in goal_ids]
+        def h(i):
+            y, x = divmod(i, W)
+            return min(hfn(abs(x - tx), abs(y - ty)) for ty, tx in targets)
+    size = len(fg.blocked)
+    g_score = [_UNSEEN] * size
+    parent = [-1] * size
+    closed = bytearray(size)
+    s = fg.to_id(start)
+    g_score[s] = 0
+    open_heap = [(h(s) if h else 0) << _KEY_SHIFT | s]
+    counter = 0
+    nodes_expanded = 0
+    found = []
+    push, pop = heapq.heappush, heapq.heappop
+
+    while open_heap and len(found) < k:
+        cur = pop(open_heap) & _ID_MASK
+        if closed[cur]:
+            continue
+        closed[cur] = 1
+        if cur in goal_ids:
+            t_ms = (time.perf_counter() - start_time) * 1000
+            found.append((goal_ids[cur], SearchResult(_trace(parent, cur, fg.to_xy), g_score[cur], nodes_expanded,
+                                                      t_ms, heur.bound, counter + 1)))
+        nodes_expanded += 1
+        g_cur = g_score[cur]
+        for off, cost in moves[mask[cur]]:
+            nb = cur + off
+            if weights is not None:
+                cost = cost // 2 * (weights[cur] + weights[nb])
+            tentative_g = g_cur + cost
+            if tentative_g < g_score[nb]:
+                parent[nb] = cur
+                g_score[nb] = tentative_g
+                counter += 1
+                push(open_heap, (tentative_g + (h(nb) if h else 0)) << _KEY_SHIFT | counter << _ID_BITS | nb)
+    return found
+
+
+def _dijkstra_row(fg, s, target_ids, keep_tree):
+    # one source against all targets; returns (dist, pred, nodes_expanded, tree or None)
+    moves, mask, weights = fg.moves, fg.mask, fg.weights
+    size = len(fg.blocked)
+    g_score = [_UNSEEN] * size
+    parent = array('i', [-1]) * size
+    closed = bytearray(size)
+    remaining = set(target_ids)
+    g_score[s] = 0
+    open_heap = [s]
+    expanded = 0
+    push, pop = heapq.heappush, heapq.heappop
+    while open_heap and remaining:
+        cur = pop(open_heap) & _ID_MASK
+        if closed[cur]:
+            continue
+        closed[cur] = 1
+        remaining.discard(cur)
+        expanded += 1
+        g_cur = g_score[cur]
+        for off, cost in moves[mask[cur]]:
+            nb = cur + off
+            if weights is not None:
+                cost = cost // 2 * (weights[cur] + weights[nb])
+            tentative_g = g_cur + cost
+            if tentative_g < g_score[nb]:
+                parent[nb] = cur
+                g_score[nb] = tentative_g
+                push(open_heap, tentative_g << _KEY_SHIFT | nb)
+    dist = array('q', (g_score[t] if closed[t] else -1 for t in target_ids))
+    pred = array('i', (_flat_cell(fg, parent[t]) if closed[t] else -1 for t in target_ids))
+    return dist, pred, expanded, parent if keep_tree else None
+
+def _flat_cell(fg, i):
+    # padded id -> y*width + x (-1 stays -1)
+    if i < 0:
+        return -1
+    x, y = fg.to_xy(i)
+    return y * fg.width + x
+
+def _pool_row(task):
+    from .batch import _WORKER
+    i, s, target_ids, keep_tree = task
+    return (i,) + _dijkstra_row(_WORKER["kwargs"]["fg"], s, target_ids, keep_tree)
+
+
+class DistanceMatrix:
+    """
+    dist[i*T + j] / pred[i*T + j] for source i and target j (T targets).
+    pred is the cell y*width+x before the target on a shortest path.
+    """
+    def __init__(self, width, sources, targets, dist, pred, trees, nodes_expanded, time_ms):
+        self.width = width
+        self.sources = sources
+        self.targets = targets
+        self.dist = dist
+        self.pred = pred
+        self._trees = trees
+        self.nodes_expanded = nodes_expanded
+        self.time_ms = time_ms
+    @property
+    def shape(self):
+        return len(self.sources), len(self.targets)
+    def distance(self, i, j):
+        """Shortest cost from sources[i] to targets[j], None if unreachable."""
+        d = self.dist[i * len(self.targets) + j]
+        return None if d < 0 else d
+    def row(self, i):
+        T = len(self.targets)
+        return [None if d < 0 else d for d in self.dist[i*T:(i+1)*T]]
+    def path(self, i, j):
+        """Cells of a shortest path sources[i] -> targets[j] (needs keep_trees=True)."""
+        if self._trees is None:
+            raise ValueError("distance_matrix(..., keep_trees=True) is needed to rebuild paths")
+        if self.distance(i, j) is None:
+            return None
+        W = self.width + 2
+        x, y = self.targets[j]
+        parent = self._trees[i]
+        cur = (y + 1) * W + (x + 1)
+        path = []
+        while cur != -1:
+            py, px = divmod(cur, W)
+            path.append((px - 1, py - 1))
+            cur = parent[cur]
+        path.reverse()
+        return path
+    def as_array(self):
+        # zero-copy (S, T) int64 view; numpy is only needed by callers that use it
+        import numpy as np
+        return np.frombuffer(self.dist, dtype=np.int64).reshape(self.shape)
+
+
+def distance_matrix(gw: GridWorld, sources, targets=None, workers=1, keep_trees=False, fg=None):
+    """
+    Shortest costs between every source and every target (targets defaults
+    to sources). workers > 1 runs the rows in a process pool; workers=None
+    uses every core. Returns a DistanceMatrix.
+    """
+    start_time = time.perf_counter()
+    sources = [tuple(p) for p in sources]
+    targets = sources if targets is None else [tuple(p) for p in targets]
+    W = gw.width + 2
+    target_ids = tuple((y + 1) * W + (x + 1) for x, y in targets)
+    S, T = len(sources), len(targets)
+    dist = array('q', [-1]) * (S * T)
+    pred = array('i', [-1]) * (S * T)
+    trees = [None] * S if keep_trees else None
+    expanded = 0
+    tasks = [(i, (y + 1) * W + (x + 1), target_ids, keep_trees) for i, (x, y) in enumerate(sources)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or S <= 1:
+        fg = fg or FlatGrid(gw)
+        rows = ((i,) + _dijkstra_row(fg, s, ids, keep) for i, s, ids, keep in tasks)
+        expanded = _fill(rows, dist, pred, trees, T)
+    else:
+        from .batch import worker_pool
+        with worker_pool(gw, min(workers, S), "flat") as pool:
+            expanded = _fill(pool.imap_unordered(_pool_row, tasks), dist, pred, trees, T)
+    t_ms = (time.perf_counter() - start_time) * 1000
+    return DistanceMatrix(gw.width, sources, targets, dist, pred, trees, expanded, t_ms)
+
+def _fill(rows, dist, pred, trees, T):
+    expanded = 0
+    for i, d, p, e, tree in rows:
+        dist[i*T:(i+1)*T] = d
+        pred[i*T:(i+1)*T] = p
+        if trees is not None:
+            trees[i] = tree
+        expanded += e
+    return expanded
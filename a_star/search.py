@@ -0,0 +1,243 @@
+import heapq
+import time
+from collections import namedtuple
+from operator import itemgetter
+
+from .grid import GridWorld, OBSTACLE
+from .heuristics import get_heuristic, scale_heuristic, DEFAULT_HEURISTIC
+from .stats import HeapCounter
+
+# node of an (f, counter, node) heap entry
+_entry_node = itemgetter(2)
+
+
+# neighbor generation respecting corner cutting
+def neighbors_of(node, gw: GridWorld):
+    # node = (x,y)
+    x,y = node
+    W, H = gw.width, gw.height
+    costs = gw.costs
+    results = []
+    # orthogonals
+    dirs = [(1,0),(-1,0),(0,1),(0,-1),(1,1),(1,-1),(-1,1),(-1,-1)]
+    for dx,dy in dirs:
+        nx, ny = x+dx, y+dy
+        if not (0 <= nx < W and 0 <= ny < H):
+            continue
+        # diagonal?
+        if dx != 0 and dy != 0:
+            # anti-corner-cutting: both orthogonal neighbors must be free
+            # orthogonal neighbors: (x+dx,y) and (x, y+dy)
+            # if any is obstacle -> skip diagonal
+            # note: check bounds already true
+            if gw.grid[y][x+dx] == OBSTACLE or gw.grid[y+dy][x] == OBSTACLE:
+                continue
+            cost = 14
+        else:
+            cost = 10
+        if costs is not None:
+            # weighted terrain: base cost times the mean weight of both cells (base is even, so exact)
+            cost = cost // 2 * (costs[y*W + x] + costs[ny*W + nx])
+        results.append(((nx,ny), cost))
+    return results
+
+def manhattan_cost(a, b):
+    (x1,y1),(x2,y2) = a,b
+    return 10 * (abs(x1-x2) + abs(y1-y2))
+
+def reconstruct_path(came_from, current):
+    path = [current]
+    while current in came_from:
+        current = came_from[current]
+        path.append(current)
+    path.reverse()
+    return path
+
+# Result of a one-shot search. path is None when the goal is unreachable.
+# bound is the heuristic's suboptimality guarantee (cost <= bound * optimal),
+# heap_pushes the number of open-list insertions (None if the engine doesn't count them).
+SearchResult = namedtuple("SearchResult", ["path", "cost", "nodes_expanded", "time_ms", "bound", "heap_pushes"],
+                          defaults=(1.0, None))
+
+def _path_cost(gw, path):
+    # cost of walking path; below g(goal) when an inconsistent or inflated
+    # heuristic let a closed cell's parent improve after its expansion
+    costs, W = gw.costs, gw.width
+    cost = 0
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        step = 14 if x0 != x1 and y0 != y1 else 10
+        cost += step if costs is None else step // 2 * (costs[y0*W + x0] + costs[y1*W + x1])
+    return cost
+
+def astar(gw: GridWorld, start, goal, heuristic=DEFAULT_HEURISTIC, weight=1.0, stats=None):
+    """
+    One-shot A* without per-step snapshots. Expands exactly the same nodes as
+    astar_generator and returns a SearchResult(path, cost, nodes_expanded, time_ms, bound).
+    heuristic is a name from heuristics.HEURISTICS; weight > 1 gives weighted A*.
+    stats (a SearchStats) is filled if given.
+    """
+    start_time = time.perf_counter()
+    heur = get_heuristic(heuristic, weight)
+    h = scale_heuristic(heur, gw.min_cost()).fn
+    grid = gw.grid
+    gx, gy = goal
+    open_heap = [(h(abs(start[0]-gx), abs(start[1]-gy)), 0, start)]
+    counter = 0
+    g_score = {start: 0}
+    closed_set = set()
+    came_from = {}
+    nodes_expanded = 0
+    evals = 0
+    push, pop = heapq.heappush, heapq.heappop
+    if stats is not None:
+        hc = HeapCounter(stats, start_time, closed_set.__contains__, _entry_node, (start,))
+        push, pop = hc.push, hc.pop
+
+    while open_heap:
+        _, _, current = pop(open_heap)
+        if current in closed_set:
+            continue
+        if current == goal:
+            if stats is not None:
+                hc.found()
+            path = reconstruct_path(came_from, current)
+            t_ms = (time.perf_counter() - start_time) * 1000
+            if stats is not None:
+                hc.finish(nodes_expanded, counter + 1, evals)
+            return SearchResult(path, _path_cost(gw, path), nodes_expanded, t_ms, heur.bound, counter + 1)
+        closed_set.add(current)
+        nodes_expanded += 1
+        g_cur = g_score[current]
+        for (nbr, cost) in neighbors_of(current, gw):
+            nx, ny = nbr
+            if grid[ny][nx] == OBSTACLE:
+                continue
+            if stats is not None:
+                # moves examined (obstacles are skipped before evaluation)
+                evals += 1
+            tentative_g = g_cur + cost
+            if tentative_g < g_score.get(nbr, float('inf')):
+                came_from[nbr] = current
+                g_score[nbr] = tentative_g
+                counter += 1
+                push(open_heap, (tentative_g + h(abs(nx-gx), abs(ny-gy)), counter, nbr))
+    t_ms = (time.perf_counter() - start_time) * 1000
+    if stats is not None:
+        hc.finish(nodes_expanded, counter + 1, evals)
+    return SearchResult(None, None, nodes_expanded, t_ms, heur.bound, counter + 1)
+
+def astar_steps(gw: GridWorld, start, goal, heuristic=DEFAULT_HEURISTIC, weight=1.0, stats=None):
+    """
+    Delta-based progress generator for the visualizer. Instead of copying the
+    open/closed sets on every expansion it only yields what changed:
+        ('delta', current, new_open)   current moved to closed, new_open were pushed
+        ('done', path, nodes_expanded, g_cost, time_ms)
+        ('no_path', nodes_expanded, time_ms)
+    The consumer keeps its own open/closed sets, so an animated run stays linear.
+    stats is filled before the final event; its times include the pauses at
+    the yields.
+    """
+    start_time = time.perf_counter()
+    h = scale_heuristic(get_heuristic(heuristic, weight), gw.min_cost()).fn
+    gx, gy = goal
+    open_heap = []
+    counter = 0
+    g_score = {start: 0}
+    heapq.heappush(open_heap, (h(abs(start[0]-gx), abs(start[1]-gy)), counter, start))
+    closed_set = set()
+    came_from = {}
+    nodes_expanded = 0
+    evals = 0
+    push, pop = heapq.heappush, heapq.heappop
+    if stats is not None:
+        hc = HeapCounter(stats, start_time, closed_set.__contains__, _entry_node, (start,))
+        push, pop = hc.push, hc.pop
+
+    while open_heap:
+        f, _, current = pop(open_heap)
+        if current in closed_set:
+            continue
+        if current == goal:
+            if stats is not None:
+                hc.found()
+            t_ms = int((time.perf_counter() - start_time) * 1000)
+            path = reconstruct_path(came_from, current)
+            if stats is not None:
+                hc.finish(nodes_expanded, counter + 1, evals)
+            yield ('done', path, nodes_expanded, _path_cost(gw, path), t_ms)
+            return
+        closed_set.add(current)
+        nodes_expanded += 1
+
+        new_open = []
+        for (nbr, cost) in neighbors_of(current, gw):
+            nx, ny = nbr
+            if gw.grid[ny][nx] == OBSTACLE:
+                continue
+            if stats is not None:
+                evals += 1
+            tentative_g = g_score[current] + cost
+            if tentative_g < g_score.get(nbr, float('inf')):
+                came_from[nbr] = current
+                g_score[nbr] = tentative_g
+                counter += 1
+                push(open_heap, (tentative_g + h(abs(nx-gx), abs(ny-gy)), counter, nbr))
+                new_open.append(nbr)
+        yield ('delta', current, new_open)
+    t_ms = int((time.perf_counter() - start_time) * 1000)
+    if stats is not None:
+        hc.finish(nodes_expanded, counter + 1, evals)
+    yield ('no_path', nodes_expanded, t_ms)
+
+def astar_generator(gw: GridWorld, start, goal, heuristic=DEFAULT_HEURISTIC, weight=1.0):
+    """
+    Generator that yields progress states for visualization.
+    Yields tuples: ('progress', current, open_set, closed_set, g_scores)
+                  ('done', path, nodes_expanded, g_cost, time_ms)
+                  ('no_path', nodes_expanded, time_ms)
+    """
+    start_time = time.perf_counter()
+    h = scale_heuristic(get_heuristic(heuristic, weight), gw.min_cost()).fn
+    gx, gy = goal
+    open_heap = []
+    counter = 0
+    g_score = {start: 0}
+    h0 = h(abs(start[0]-gx), abs(start[1]-gy))
+    heapq.heappush(open_heap, (h0, counter, start))
+    open_set = {start}
+    closed_set = set()
+    came_from = {}
+    nodes_expanded = 0
+
+    while open_heap:
+        f, _, current = heapq.heappop(open_heap)
+        if current in closed_set:
+            continue
+        open_set.discard(current)
+        # expand current
+        if current == goal:
+            t_ms = int((time.perf_counter() - start_time) * 1000)
+            path = reconstruct_path(came_from, current)
+            yield ('done', path, nodes_expanded, _path_cost(gw, path), t_ms)
+            return
+        closed_set.add(current)
+        nodes_expanded += 1
+
+        for (nbr, cost) in neighbors_of(current, gw):
+            nx, ny = nbr
+            # if neighbor is obstacle skip
+            if gw.grid[ny][nx] == OBSTACLE:
+                continue
+            tentative_g = g_score[current] + cost
+            if tentative_g < g_score.get(nbr, float('inf')):
+                came_from[nbr] = current
+                g_score[nbr] = tentative_g
+                fscore = tentative_g + h(abs(nx-gx), abs(ny-gy))
+                counter += 1
+                heapq.heappush(open_heap, (fscore, counter, nbr))
+                open_set.add(nbr)
+        # yield progress so UI can animate
+        yield ('progress', current, set(open_set), set(closed_set), dict(g_score))
+    # no path
+    t_ms = int((time.perf_counter() - start_time) * 1000)
+    yield ('no_path', nodes_expanded, t_ms)
@@ -0,0 +1,146 @@
+"""
+Search instrumentation and telemetry hooks.
+
+SearchStats holds the counters of one search:
+    nodes_expanded  cells moved to closed
+    heap_pushes     open-list insertions (the start included)
+    stale_pops      popped entries whose cell was already closed
+    reopenings      closed cells reached again with a lower g (only with an
+                    inconsistent heuristic; the cell is not expanded again)
+    peak_open       largest number of reached-but-unexpanded cells
+    neighbor_evals  (cell, move) pairs examined during expansions
+    phases          with timers=True, ms spent in "setup", "search" and "path"
+
+The counters come from the engines' own loops. An engine given stats binds
+its push / pop locals to a HeapCounter instead of heapq.heappush / heappop
+and fills the rest when the search ends; with no hook registered and no
+stats requested the loops run exactly as before. INSTRUMENTED_ENGINES are
+the engines that do this. ara, hpa and dstar re-key cells across passes or
+search an abstract graph, so they only report nodes, pushes and time and
+leave the other counters as None.
+
+register_hook(fn) makes engines.find_path / engine_steps build a SearchStats
+for every query in this process and call fn(stats) once the search ends.
+Batch workers run in other processes and do not call the parent's hooks.
+"""
+import time
+from heapq import heappush, heappop
+
+# engines that count in their own loop (they take stats=)
+INSTRUMENTED_ENGINES = ("astar", "flat", "jps", "bidir", "theta", "lazytheta")
+
+_COUNTERS = ("nodes_expanded", "heap_pushes", "stale_pops", "reopenings", "peak_open", "neighbor_evals")
+
+
+class SearchStats:
+    __slots__ = ("engine", "nodes_expanded", "heap_pushes", "stale_pops", "reopenings", "peak_open",
+                 "neighbor_evals", "time_ms", "phases")
+    def __init__(self, engine=None, timers=False):
+        self.engine = engine
+        self.nodes_expanded = 0
+        self.heap_pushes = 0
+        self.stale_pops = 0
+        self.reopenings = 0
+        self.peak_open = 0
+        self.neighbor_evals = 0
+        self.time_ms = 0.0
+        self.phases = {} if timers else None
+    def partial(self):
+        """Mark the counters the engine cannot report as unknown (None)."""
+        self.stale_pops = self.reopenings = self.peak_open = self.neighbor_evals = None
+    def as_dict(self):
+        d = {name: getattr(self, name) for name in _COUNTERS}
+        d["engine"] = self.engine
+        d["time_ms"] = round(self.time_ms, 3)
+        if self.phases is not None:
+            d["phases"] = {k: round(v, 3) for k, v in self.phases.items()}
+        return d
+    def __repr__(self):
+        return f"SearchStats({self.as_dict()})"
+
+
+# --- hooks ---
+_HOOKS = []
+
+def register_hook(fn, timers=False):
+    """Call fn(stats) after every find_path / engine_steps query; timers=True also times the phases."""
+    _HOOKS.append((fn, timers))
+    return fn
+
+def unregister_hook(fn):
+    _HOOKS[:] = [(f, t) for f, t in _HOOKS if f is not fn]
+
+def hooks_enabled():
+    return bool(_HOOKS)
+
+def new_stats(engine):
+    """SearchStats for a hooked query (timed if any hook asked for it)."""
+    return SearchStats(engine, timers=any(t for _, t in _HOOKS))
+
+def emit(stats):
+    for fn, _ in tuple(_HOOKS):
+        fn(stats)
+
+
+# --- counting heap ---
+class HeapCounter:
+    """
+    Counting stand-ins for heapq.heappush / heappop, bound by an engine loop
+    only when stats are requested. is_closed(cell) tells whether the engine
+    has expanded a cell and key(entry) gives the cell of a heap entry; the
+    cells already in the heap are passed as open_cells. The two frontiers of
+    a bidirectional search share one open count through total=.
+    """
+    def __init__(self, stats, start_time, is_closed, key, open_cells, total=None):
+        self.stats = stats
+        self.start_time = start_time
+        self.is_closed = is_closed
+        self.key = key
+        self.seen = set(open_cells)
+        self.stale = 0
+        self.reopenings = 0
+        self.open = self.peak = 0
+        self.total = total = self if total is None else total
+        total.open += len(self.seen)
+        total.peak = max(total.peak, total.open)
+        self.found_at = None
+        self.search_start = time.perf_counter()
+    def push(self, heap, entry):
+        heappush(heap, entry)
+        cell = self.key(entry)
+        if cell not in self.seen:
+            self.seen.add(cell)
+            total = self.total
+            total.open += 1
+            if total.open > total.peak:
+                total.peak = total.open
+        elif self.is_closed(cell):
+            self.reopenings += 1
+    def pop(self, heap):
+        entry = heappop(heap)
+        if self.is_closed(self.key(entry)):
+            self.stale += 1
+        else:
+            self.total.open -= 1
+        return entry
+    def found(self):
+        """Mark the end of the search phase (the goal was popped)."""
+        self.found_at = time.perf_counter()
+    def finish(self, nodes_expanded, heap_pushes, neighbor_evals, others=()):
+        """Fill stats; others are the HeapCounters of further frontiers."""
+        end = time.perf_counter()
+        stats = self.stats
+        stats.nodes_expanded = nodes_expanded
+        stats.heap_pushes = heap_pushes
+        stats.stale_pops = self.stale + sum(c.stale for c in others)
+        stats.reopenings = self.reopenings + sum(c.reopenings for c in others)
+        stats.peak_open = self.peak
+        stats.neighbor_evals = neighbor_evals
+        stats.time_ms = (end - self.start_time) * 1000
+        phases = stats.phases
+        if phases is not None:
+            found = end if self.found_at is None else self.found_at
+            phases["setup"] = (self.search_start - self.start_time) * 1000
+            phases["search"] = (found - self.search_start) * 1000
+            if self.found_at is not None:
+                phases["path"] = (end - found) * 1000
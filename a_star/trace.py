@@ -0,0 +1,381 @@
+"""
+Search traces: record the events of a search once, replay them at any speed.
+
+A trace stores the engine_steps event stream in a compact binary form:
+expansion order and open-set pushes as deltas plus the final event, enough to
+rebuild the open/closed sets at every step without running the search again.
+TraceReplayer scrubs through a trace forwards and backwards, so a capture
+from a production worker can be inspected later at full frame rate.
+
+Layout (little endian):
+
+    magic      4s   b"ASTT"
+    format     u16  FORMAT_VERSION
+    flags      u16  reserved (0)
+    width      u32
+    height     u32
+    start      i32 x, i32 y
+    goal       i32 x, i32 y
+    engine     u8 length + ascii
+    heuristic  u8 length + ascii
+    records    one per event, a tag byte then unsigned LEB128 varints; cells
+               are ids y*width+x, "z" marks a zigzag-encoded signed delta
+      step     tag 0-7: bit 0 side, bit 1 list form, bit 2 the event had a side
+               field (bidir); z(cell - previous expanded cell), then
+               mask form: one byte, bit k = pushed cell + _DIRS[k]
+               list form: count, z(pushed cell - cell) each (jps pushes jump points)
+      done     tag 8: nodes_expanded, cost, time_ms, path length, z(cell - previous)
+               per path cell (the first relative to 0)
+      no_path  tag 9: nodes_expanded, time_ms
+
+A step takes 3-4 bytes in the mask form. A trace without a final record was
+cut short (cancelled search); it still replays up to its last step.
+
+CLI:
+    python -m a_star.trace info traza.astt
+"""
+import argparse
+import struct
+from array import array
+
+from .flat import _DIRS
+from .engines import engine_steps, default_heuristic, DEFAULT_ENGINE
+from .search import SearchResult
+from .heuristics import get_heuristic
+
+MAGIC = b"ASTT"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHIIiiii")
+
+_SIDE = 1
+_LIST = 2
+_HAS_SIDE = 4
+TAG_DONE = 8
+TAG_NO_PATH = 9
+
+_DIR_INDEX = {d: k for k, d in enumerate(_DIRS)}
+# buffered records are written out once they reach this size
+_FLUSH_BYTES = 1 << 16
+
+
+def _varint(out, n):
+    while n > 0x7f:
+        out.append(n & 0x7f | 0x80)
+        n >>= 7
+    out.append(n)
+
+def _zigzag(out, n):
+    _varint(out, n << 1 if n >= 0 else (-n << 1) - 1)
+
+
+class TraceWriter:
+    """Streams engine events to a binary file object; call close() at the end."""
+    def __init__(self, f, width, height, start, goal, engine="", heuristic=""):
+        self.f = f
+        self.width = width
+        self.steps = 0
+        self._prev = 0
+        self._buf = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, width, height, *start, *goal))
+        for name in (engine, heuristic):
+            raw = name.encode("ascii")[:255]
+            self._buf.append(len(raw))
+            self._buf += raw
+    def write(self, ev):
+        out = self._buf
+        kind = ev[0]
+        if kind == 'delta':
+            W = self.width
+            x, y = ev[1]
+            cur = y*W + x
+            tag = 0
+            if len(ev) > 3:
+                tag = _HAS_SIDE | (_SIDE if ev[3] == 1 else 0)
+            mask = 0
+            for ox, oy in ev[2]:
+                d = _DIR_INDEX.get((ox - x, oy - y))
+                if d is None:
+                    mask = None
+                    break
+                mask |= 1 << d
+            out.append(tag if mask is not None else tag | _LIST)
+            _zigzag(out, cur - self._prev)
+            self._prev = cur
+            if mask is not None:
+                out.append(mask)
+            else:
+                _varint(out, len(ev[2]))
+                for ox, oy in ev[2]:
+                    _zigzag(out, oy*W + ox - cur)
+            self.steps += 1
+        elif kind == 'done':
+            _, path, nodes, cost, ms = ev
+            out.append(TAG_DONE)
+            for n in (nodes, int(cost), int(ms), len(path)):
+                _varint(out, n)
+            prev = 0
+            for x, y in path:
+                _zigzag(out, y*self.width + x - prev)
+                prev = y*self.width + x
+        elif kind == 'no_path':
+            out.append(TAG_NO_PATH)
+            _varint(out, ev[1])
+            _varint(out, int(ev[2]))
+        else:
+            raise ValueError(f"cannot record {kind!r} events")
+        if len(out) >= _FLUSH_BYTES or kind != 'delta':
+            self.flush()
+    def flush(self):
+        self.f.write(self._buf)
+        self._buf = bytearray()
+    def close(self):
+        self.flush()
+        self.f.flush()
+
+def record(events, writer):
+    """Pass events through unchanged while writing them to writer (closed at the end)."""
+    try:
+        for ev in events:
+            writer.write(ev)
+            yield ev
+    finally:
+        writer.close()
+
+def record_search(gw, start, goal, f, engine=DEFAULT_ENGINE, heuristic=None, weight=1.0,
+                  components=None):
+    """
+    Run one query through engine_steps, writing its trace to the binary file
+    f. Returns the SearchResult. Engines without a stepper only record their
+    final event.
+    """
+    if heuristic is None:
+        heuristic = default_heuristic(engine)
+    writer = TraceWriter(f, gw.width, gw.height, start, goal, engine, heuristic)
+    pushes = 1
+    for ev in record(engine_steps(gw, start, goal, engine, heuristic, weight, components), writer):
+        if ev[0] == 'delta':
+            pushes += len(ev[2])
+    bound = get_heuristic(heuristic, weight).bound
+    if ev[0] == 'no_path':
+        return SearchResult(None, None, ev[1], ev[2], bound, pushes)
+    _, path, nodes, cost, ms = ev
+    return SearchResult(path, cost, nodes, ms, bound, pushes)
+
+
+class Trace:
+    """
+    A decoded trace. Step i expanded cells[i] (a cell id) and pushed
+    opened[offsets[i]:offsets[i+1]]; sides[i] is its frontier (1: from the
+    goal) or -1 when the event had no side field. final is the 'done' /
+    'no_path' event, None if the trace was cut short.
+    """
+    def __init__(self, width, height, start, goal, engine, heuristic, cells, sides, opened, offsets, final):
+        self.width = width
+        self.height = height
+        self.start = start
+        self.goal = goal
+        self.engine = engine
+        self.heuristic = heuristic
+        self.cells = cells
+        self.sides = sides
+        self.opened = opened
+        self.offsets = offsets
+        self.final = final
+    def __len__(self):
+        return len(self.cells)
+    def to_xy(self, c):
+        return c % self.width, c // self.width
+    def event(self, i):
+        """Step i as the original ('delta', current, new_open[, side]) event."""
+        to_xy = self.to_xy
+        ev = ('delta', to_xy(self.cells[i]), [to_xy(c) for c in self.opened[self.offsets[i]:self.offsets[i+1]]])
+        return ev if self.sides[i] < 0 else ev + (self.sides[i],)
+    def events(self):
+        """The recorded event stream, final event included."""
+        for i in range(len(self.cells)):
+            yield self.event(i)
+        if self.final is not None:
+            yield self.final
+
+def _read_name(data, pos):
+    n = data[pos]
+    return data[pos + 1:pos + 1 + n].decode("ascii"), pos + 1 + n
+
+def read_trace(f):
+    """Decode a whole trace from a binary file object."""
+    data = f.read()
+    if len(data) < _HEADER.size:
+        raise ValueError("truncated search trace")
+    magic, version, _, width, height, sx, sy, gx, gy = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"not a search trace (magic {magic!r})")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported trace format version {version}")
+    engine, pos = _read_name(data, _HEADER.size)
+    heuristic, pos = _read_name(data, pos)
+    cells, opened, offsets = array('q'), array('q'), array('q', [0])
+    sides = array('b')
+    final = None
+    end = len(data)
+    dirs = [dy*width + dx for dx, dy in _DIRS]
+    prev = 0
+
+    def varint():
+        nonlocal pos
+        n = shift = 0
+        while True:
+            b = data[pos]
+            pos += 1
+            n |= (b & 0x7f) << shift
+            if b < 0x80:
+                return n
+            shift += 7
+
+    def zigzag():
+        n = varint()
+        return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+    try:
+        while pos < end:
+            tag = data[pos]
+            pos += 1
+            if tag < TAG_DONE:
+                cur = prev + zigzag()
+                prev = cur
+                cells.append(cur)
+                sides.append(tag & _SIDE if tag & _HAS_SIDE else -1)
+                if tag & _LIST:
+                    for _ in range(varint()):
+                        opened.append(cur + zigzag())
+                else:
+                    mask = data[pos]
+                    pos += 1
+                    k = 0
+                    while mask:
+                        if mask & 1:
+                            opened.append(cur + dirs[k])
+                        mask >>= 1
+                        k += 1
+                offsets.append(len(opened))
+            elif tag == TAG_DONE:
+                nodes, cost, ms, n = varint(), varint(), varint(), varint()
+                path = []
+                c = 0
+                for _ in range(n):
+                    c += zigzag()
+                    path.append((c % width, c // width))
+                final = ('done', path, nodes, cost, ms)
+                break
+            elif tag == TAG_NO_PATH:
+                final = ('no_path', varint(), varint())
+                break
+            else:
+                raise ValueError(f"bad trace record tag {tag} at offset {pos - 1}")
+    except IndexError:
+        raise ValueError("truncated search trace") from None
+    return Trace(width, height, (sx, sy), (gx, gy), engine, heuristic, cells, sides, opened, offsets, final)
+
+
+class TraceReplayer:
+    """
+    Open / closed sets of a trace at any step, for drawing. seek() moves in
+    either direction in time proportional to the steps crossed (each step
+    keeps what it changed, so going back undoes it exactly) and returns the
+    cells whose state changed. open_back is the goal-side frontier of a
+    bidirectional trace. path is only set at the end of a 'done' trace.
+    """
+    def __init__(self, trace):
+        self.trace = trace
+        self.position = 0
+        self.open = set()
+        self.open_back = set()
+        self.closed = set()
+        # per step: bit 0 the cell was open before, bit 1 already closed; and
+        # the pushed cells that were not open yet (what undoing removes)
+        n = len(trace)
+        self._flags = bytearray(n)
+        self._added = array('q')
+        self._added_off = array('q', [0])
+        fronts = (set(), set())
+        closed = set()
+        cells, opened, offsets, sides = trace.cells, trace.opened, trace.offsets, trace.sides
+        for i in range(n):
+            frontier = fronts[sides[i] == 1]
+            cur = cells[i]
+            self._flags[i] = (cur in frontier) | (cur in closed) << 1
+            frontier.discard(cur)
+            closed.add(cur)
+            for c in opened[offsets[i]:offsets[i+1]]:
+                if c not in frontier:
+                    frontier.add(c)
+                    self._added.append(c)
+            self._added_off.append(len(self._added))
+    def __len__(self):
+        return len(self.trace)
+    @property
+    def at_end(self):
+        return self.position == len(self.trace)
+    @property
+    def path(self):
+        final = self.trace.final
+        return final[1] if self.at_end and final is not None and final[0] == 'done' else None
+    def seek(self, position):
+        """Move to position (0 .. len, clamped); returns the changed cells."""
+        position = max(0, min(len(self.trace), position))
+        to_xy = self.trace.to_xy
+        cells, sides = self.trace.cells, self.trace.sides
+        added, off = self._added, self._added_off
+        closed = self.closed
+        changed = []
+        while self.position < position:
+            i = self.position
+            frontier = self.open_back if sides[i] == 1 else self.open
+            cur = to_xy(cells[i])
+            frontier.discard(cur)
+            closed.add(cur)
+            new = [to_xy(c) for c in added[off[i]:off[i+1]]]
+            frontier.update(new)
+            changed.append(cur)
+            changed.extend(new)
+            self.position += 1
+        while self.position > position:
+            self.position -= 1
+            i = self.position
+            frontier = self.open_back if sides[i] == 1 else self.open
+            cur = to_xy(cells[i])
+            new = [to_xy(c) for c in added[off[i]:off[i+1]]]
+            frontier.difference_update(new)
+            if not self._flags[i] & 2:
+                closed.discard(cur)
+            if self._flags[i] & 1:
+                frontier.add(cur)
+            changed.append(cur)
+            changed.extend(new)
+        return changed
+    def step(self, n=1):
+        """seek() relative to the current position (n < 0 goes back)."""
+        return self.seek(self.position + n)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m a_star.trace", description="Inspect recorded search traces.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("info", help="print a trace summary")
+    p.add_argument("path")
+    args = ap.parse_args(argv)
+
+    with open(args.path, "rb") as f:
+        tr = read_trace(f)
+        size = f.tell()
+    print(f"{args.path}: {tr.width}x{tr.height} {tr.start} -> {tr.goal}, "
+          f"engine {tr.engine or '?'}, heuristic {tr.heuristic or '?'}")
+    per_step = f" ({size / len(tr):.1f} bytes/step)" if len(tr) else ""
+    print(f"steps {len(tr)}, pushes {len(tr.opened)}, {size} bytes{per_step}")
+    if tr.final is None:
+        print("incomplete: no final event")
+    elif tr.final[0] == 'done':
+        print(f"done: cost {tr.final[3]}, {len(tr.final[1])} cells, {tr.final[2]} nodes, {tr.final[4]} ms")
+    else:
+        print(f"no path: {tr.final[1]} nodes, {tr.final[2]} ms")
+
+if __name__ == "__main__":
+    main()
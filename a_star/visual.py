@@ -0,0 +1,1056 @@
+import io
+import pygame
+import sys
+from array import array
+
+from .grid import GridWorld, DEFAULT_N, MIN_N, DEFAULT_DENSITY, FREE, OBSTACLE, START, GOAL
+from .engines import ENGINES, engine_steps, default_heuristic
+from .anyangle import smooth_path
+from .heuristics import HEURISTICS, DEFAULT_HEURISTIC
+from .dstar import DStarLite
+from .components import ComponentIndex
+from .stats import SearchStats
+from .worker import SearchThread
+from .mapfile import MapFile, save_map
+from .export import NdjsonWriter
+from .trace import TraceWriter, TraceReplayer, record, read_trace
+
+# --- Configuración inicial ---
+WINDOW_WIDTH, WINDOW_HEIGHT = 1200, 680
+PANEL_WIDTH = 600
+FPS = 60
+# zoom (pixels per cell) and tiled drawing of large grids
+MIN_CELL_PX = 2
+MAX_CELL_PX = 64
+ZOOM_STEP = 1.25
+PAN_STEP = 80     # pixels per arrow key press
+TILE = 32         # cells per tile side
+MAX_TILES = 512   # cached tiles before the off-screen ones are dropped
+MAP_FILE = "mapa.astm"
+EXPORT_FILE = "ruta_exportada.ndjson"
+TRACE_FILE = "traza.astt"
+# trace playback: steps per frame grow as 2**(speed * REPLAY_SPEED_BITS), 1 .. 16384
+REPLAY_SPEED_BITS = 14
+REPLAY_JUMP = 0.05  # RePág/AvPág: fraction of the trace per press
+
+# Colores
+BLANCO = (245, 245, 245)
+NEGRO = (20, 20, 20)
+GRIS = (200, 200, 200)
+AZUL = (47, 132, 194) # botones y open set
+VERDE = (80, 180, 80)          # inicio
+ROJO = (200, 70, 70)           # meta
+AMARILLO = (240, 230, 120)      # closed set
+MORADO = (150, 100, 200)      # camino
+NARANJA = (235, 150, 60)       # open set desde la meta (bidireccional)
+VERDE_CLARO = (180, 229, 13)  # control slider
+MARRON = (150, 110, 70)        # terreno costoso
+
+# pesos del pincel de terreno (tecla T), en ciclo
+TERRAIN_LEVELS = (1, 3, 9)
+
+# Pygame state, created by init_display() so importing this module never opens a window
+FONT = None
+FONT_L = None
+screen = None
+clock = None
+
+def init_display():
+    global FONT, FONT_L, screen, clock
+    if screen is not None:
+        return
+    pygame.init()
+    FONT = pygame.font.SysFont("dejavusans", 16)
+    FONT_L = pygame.font.SysFont("dejavusans", 20, bold=True)
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("A*")
+    clock = pygame.time.Clock()
+
+# --- Utilidades UI simples: Button / Slider ---
+class Button:
+    def __init__(self, rect, text, callback, font=None):
+        self.rect = pygame.Rect(rect)
+        self.text = text
+        self.callback = callback
+        self.font = font or FONT
+    def draw(self, surf):
+        pygame.draw.rect(surf, AZUL, self.rect, border_radius=6)
+        lbl = self.font.render(self.text, True, BLANCO)
+        surf.blit(lbl, lbl.get_rect(center=self.rect.center))
+    def handle(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.rect.collidepoint(event.pos):
+                self.callback()
+
+class Slider:
+    # horizontal slider from x,y with given width. value range 0..1
+    def __init__(self, x,y,w, initial=0.5):
+        self.rect = pygame.Rect(x,y,w,20)
+        self.value = initial
+        self.handle_rect = pygame.Rect(0, y-4, 12, 28)
+        self._update_handle()
+        self.dragging = False
+    def _update_handle(self):
+        self.handle_rect.centerx = int(self.rect.x + int(self.value * self.rect.w))
+    def draw(self, surf):
+        pygame.draw.rect(surf, GRIS, self.rect, border_radius=6)
+        pygame.draw.rect(surf, AZUL, (self.rect.x, self.rect.y, int(self.value*self.rect.w), self.rect.h), border_radius=6)
+        pygame.draw.rect(surf, VERDE_CLARO, self.handle_rect, border_radius=6)
+    def handle(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.handle_rect.collidepoint(event.pos):
+            self.dragging = True
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.dragging = False
+        elif event.type == pygame.MOUSEMOTION and self.dragging:
+            relx = max(0, min(self.rect.w, event.pos[0] - self.rect.x))
+            self.value = relx / self.rect.w
+            self._update_handle()
+
+# --- Drawing helpers ---
+def draw_grid(surface, gw: GridWorld, grid_rect, cell_px, open_set=set(), closed_set=set(), path=None):
+    # grid_rect: pygame.Rect area where grid is drawn
+    W, H = gw.width, gw.height
+    x0, y0 = grid_rect.x, grid_rect.y
+    for y in range(H):
+        for x in range(W):
+            cell_type = gw.grid[y][x]
+            cell_rect = pygame.Rect(x0 + x*cell_px, y0 + y*cell_px, cell_px-1, cell_px-1)
+            
+            # Determinar color base según el tipo de celda
+            if cell_type == FREE:
+                color = BLANCO
+            elif cell_type == OBSTACLE:
+                color = NEGRO
+            elif cell_type == START:
+                color = VERDE
+            elif cell_type == GOAL:
+                color = ROJO
+            
+            # Dibujar celda base
+            surface.fill(color, cell_rect)
+            
+            # Overlays: open/closed sets (solo para celdas FREE)
+            if cell_type == FREE:
+                if (x,y) in closed_set:
+                    surface.fill(AMARILLO, cell_rect.inflate(-2,-2))
+                if (x,y) in open_set:
+                    surface.fill(AZUL, cell_rect.inflate(-2,-2))
+            
+            # Ruta (solo para celdas FREE que no son inicio ni meta)
+            if path and (x,y) in path and cell_type == FREE:
+                surface.fill(MORADO, cell_rect.inflate(-4,-4))
+    
+    # grid lines
+    for i in range(W+1):
+        pygame.draw.line(surface, GRIS, (x0 + i*cell_px, y0), (x0 + i*cell_px, y0 + H*cell_px))
+    for i in range(H+1):
+        pygame.draw.line(surface, GRIS, (x0, y0 + i*cell_px), (x0 + W*cell_px, y0 + i*cell_px))
+
+
+
+_CELL_COLORS = {FREE: BLANCO, OBSTACLE: NEGRO, START: VERDE, GOAL: ROJO}
+
+# flechas del teclado -> dirección de desplazamiento de la vista
+_PAN_KEYS = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0), pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+
+# nombres de las fases de SearchStats en el panel
+_PHASE_NAMES = {"setup": "prep.", "search": "búsqueda", "path": "ruta"}
+
+def _fmt_stat(v):
+    # None: el motor no mide ese contador
+    return "—" if v is None else v
+
+def _cell_color(gw, x, y):
+    cell_type = gw.grid[y][x]
+    if cell_type == FREE and gw.costs is not None:
+        # FREE cells shade from BLANCO to MARRON as their weight grows (saturates at 9)
+        t = min(1.0, (gw.costs[y * gw.width + x] - 1) / 8)
+        return tuple(round(a + (b - a) * t) for a, b in zip(BLANCO, MARRON))
+    return _CELL_COLORS[cell_type]
+
+class Viewport:
+    """
+    Visible part of the grid: the screen rect it is drawn into, the zoom
+    (cell_px, pixels per cell) and the scroll offset in pixels. Large grids
+    are panned and zoomed instead of being shrunk to fit.
+    """
+    def __init__(self, rect):
+        self.rect = rect
+        self.cell_px = MIN_CELL_PX
+        self.sx = self.sy = 0
+        self._size = (0, 0)
+    def fit(self, gw):
+        # whole grid visible if it fits at MIN_CELL_PX, else the top-left corner
+        side = max(gw.width, gw.height)
+        self.cell_px = max(MIN_CELL_PX, min(MAX_CELL_PX, min(self.rect.w, self.rect.h) // side))
+        self.sx = self.sy = 0
+        self.clamp(gw)
+    def clamp(self, gw):
+        c = self.cell_px
+        self._size = (gw.width, gw.height)
+        self.sx = max(0, min(self.sx, gw.width * c - self.rect.w))
+        self.sy = max(0, min(self.sy, gw.height * c - self.rect.h))
+    def pan(self, gw, dx, dy):
+        self.sx += dx
+        self.sy += dy
+        self.clamp(gw)
+    def zoom(self, gw, steps, pos=None):
+        """steps > 0 zooms in; the cell under pos (default: the centre) stays put."""
+        c = self.cell_px
+        new = max(MIN_CELL_PX, min(MAX_CELL_PX, round(c * ZOOM_STEP ** steps) if steps else c))
+        if new == c:
+            new = max(MIN_CELL_PX, min(MAX_CELL_PX, c + (1 if steps > 0 else -1)))
+        px, py = pos if pos is not None else self.rect.center
+        # world position (in cells) under the pointer
+        wx = (px - self.rect.x + self.sx) / c
+        wy = (py - self.rect.y + self.sy) / c
+        self.cell_px = new
+        self.sx = round(wx * new - (px - self.rect.x))
+        self.sy = round(wy * new - (py - self.rect.y))
+        self.clamp(gw)
+    def cell_at(self, pos):
+        """Grid cell under a screen position, or None outside the grid."""
+        if not self.rect.collidepoint(pos):
+            return None
+        x = (pos[0] - self.rect.x + self.sx) // self.cell_px
+        y = (pos[1] - self.rect.y + self.sy) // self.cell_px
+        W, H = self._size
+        return (x, y) if 0 <= x < W and 0 <= y < H else None
+    def to_screen(self, x, y):
+        """Screen position of the top-left corner of cell (x, y)."""
+        return (self.rect.x + x * self.cell_px - self.sx, self.rect.y + y * self.cell_px - self.sy)
+    def visible_tiles(self):
+        t = TILE * self.cell_px
+        W, H = self._size
+        tx0, ty0 = self.sx // t, self.sy // t
+        tx1 = min(-(-W // TILE), (self.sx + self.rect.w) // t + 1)
+        ty1 = min(-(-H // TILE), (self.sy + self.rect.h) // t + 1)
+        return [(tx, ty) for ty in range(ty0, ty1) for tx in range(tx0, tx1)]
+
+
+class GridRenderer:
+    """
+    Cached, tiled grid drawing for main().
+
+    The grid is cut into TILE x TILE-cell tiles. Each tile has a static
+    surface (cell types + grid lines) and a composed one (static +
+    open/closed/path overlays); tiles are only built once they become
+    visible and at most MAX_TILES are kept, so the cost of a frame follows
+    the viewport, not the grid size. Each frame only the cells marked dirty
+    are repainted before the visible tiles are blitted:
+      - mark(cells)       cells whose open/closed state changed (search deltas)
+      - mark_edit(gw, c, v) a cell edited through set_cell/set_cost (v = version before)
+      - path / open / closed given as new objects are diffed against the last ones
+    open_back is the second open set of a bidirectional search (drawn in NARANJA).
+    An any-angle path (waypoints more than one cell apart) is also drawn as a
+    polyline over the tiles.
+    Any other change to gw (new version, size or zoom) drops every tile.
+    """
+    def __init__(self):
+        self._tiles = {}  # (tx, ty) -> [static, composed]
+        self._key = None
+        self._version = None
+        self._open = None
+        self._open_back = set()
+        self._closed = None
+        self._path = None
+        self._path_set = set()
+        self._waypoints = False
+        self._dirty = set()
+    def mark(self, cells):
+        self._dirty.update(cells)
+    def mark_edit(self, gw, cell, prev_version):
+        # patch in place only if the cache was current before this edit
+        if self._key is not None and self._version == prev_version:
+            x, y = cell
+            tile = self._tiles.get((x // TILE, y // TILE))
+            if tile is not None:
+                tile[0].fill(_cell_color(gw, x, y), self._rect(x, y))
+            self._dirty.add(cell)
+            self._version = gw.version
+    def _rect(self, x, y):
+        # inside the grid lines, which sit on multiples of cell_px within the tile
+        c = self._key[2]
+        return pygame.Rect((x % TILE)*c + 1, (y % TILE)*c + 1, c - 1, c - 1)
+    def _paint(self, gw, composed, x, y):
+        rect = self._rect(x, y)
+        cell_type = gw.grid[y][x]
+        composed.fill(_cell_color(gw, x, y), rect)
+        # overlays only on FREE cells, path on top
+        if cell_type == FREE:
+            if (x,y) in self._closed:
+                composed.fill(AMARILLO, rect.inflate(-2,-2))
+            if (x,y) in self._open:
+                composed.fill(AZUL, rect.inflate(-2,-2))
+            elif (x,y) in self._open_back:
+                composed.fill(NARANJA, rect.inflate(-2,-2))
+            if (x,y) in self._path_set:
+                composed.fill(MORADO, rect.inflate(-4,-4))
+    def _build_tile(self, gw, tx, ty):
+        c = self._key[2]
+        x0, y0 = tx * TILE, ty * TILE
+        x1, y1 = min(gw.width, x0 + TILE), min(gw.height, y0 + TILE)
+        static = pygame.Surface(((x1 - x0) * c + 1, (y1 - y0) * c + 1))
+        static.fill(GRIS)
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                static.fill(_cell_color(gw, x, y), self._rect(x, y))
+        composed = static.copy()
+        sets = (self._closed, self._open, self._open_back, self._path_set)
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                if any((x, y) in cells for cells in sets):
+                    self._paint(gw, composed, x, y)
+        tile = self._tiles[(tx, ty)] = [static, composed]
+        return tile
+    def draw(self, surface, gw: GridWorld, view, open_set, closed_set, path, open_back=frozenset()):
+        if open_set is not self._open or closed_set is not self._closed or open_back is not self._open_back:
+            # a new search (or a reset) replaced the sets: restore the static layers
+            for static, composed in self._tiles.values():
+                composed.blit(static, (0, 0))
+            self._open, self._closed, self._open_back = open_set, closed_set, open_back
+            self._dirty = set(open_set) | set(open_back) | set(closed_set) | self._path_set
+        if path is not self._path:
+            new_set = set(path) if path else set()
+            self._dirty |= self._path_set ^ new_set
+            self._path, self._path_set = path, new_set
+            self._waypoints = bool(path) and any(max(abs(x1 - x0), abs(y1 - y0)) > 1
+                                                 for (x0, y0), (x1, y1) in zip(path, path[1:]))
+        key = (gw.width, gw.height, view.cell_px)
+        if self._key != key or self._version != gw.version:
+            self._tiles.clear()
+            self._key, self._version = key, gw.version
+        tiles = self._tiles
+        for (x, y) in self._dirty:
+            tile = tiles.get((x // TILE, y // TILE))
+            if tile is not None and 0 <= x < gw.width and 0 <= y < gw.height:
+                self._paint(gw, tile[1], x, y)
+        self._dirty.clear()
+        visible = view.visible_tiles()
+        if len(tiles) + len(visible) > MAX_TILES:
+            # keep only what is on screen
+            keep = set(visible)
+            for k in [k for k in tiles if k not in keep]:
+                del tiles[k]
+        clip = surface.get_clip()
+        surface.set_clip(view.rect)
+        for tx, ty in visible:
+            tile = tiles.get((tx, ty)) or self._build_tile(gw, tx, ty)
+            surface.blit(tile[1], view.to_screen(tx * TILE, ty * TILE))
+        if self._waypoints:
+            half = view.cell_px // 2
+            points = [(sx + half, sy + half) for sx, sy in (view.to_screen(x, y) for x, y in path)]
+            pygame.draw.lines(surface, MORADO, False, points, max(2, view.cell_px // 6))
+        surface.set_clip(clip)
+
+
+# --- Main app state ---
+def main():
+    init_display()
+    gw = GridWorld(N=DEFAULT_N, density=DEFAULT_DENSITY)
+    gw.randomize_obstacles()  # initial obstacles
+
+    status_msg = "Listo. Coloca Incio (S) y Meta (G)"
+    mode_set_start = False
+    mode_set_goal = False
+    placing_obstacles = False
+    removing_obstacles = False
+    terrain_mode = False  # click izquierdo cambia el peso de la celda en vez de poner obstáculo
+    dragging = False
+
+    # grid drawing area - A LA IZQUIERDA
+    grid_size_px = min(WINDOW_HEIGHT - 40, WINDOW_WIDTH - PANEL_WIDTH - 40)
+    grid_rect = pygame.Rect(20, 20, grid_size_px, grid_size_px)
+    # zoom y desplazamiento: los mapas grandes se recorren en vez de encogerse
+    view = Viewport(grid_rect)
+    view.fit(gw)
+    panning = False
+
+    renderer = GridRenderer()
+    # componentes conexos: 'sin ruta' instantáneo (se reconstruye solo si el mapa cambió por otra vía)
+    components = ComponentIndex(gw)
+
+    # control widgets
+    buttons = []
+    # Los sliders se posicionarán después de definir todos los botones
+    step_mode = False
+    search_thread = None  # SearchThread de la búsqueda en curso
+    current_open = set()
+    current_open_back = set()  # segundo frente de la búsqueda bidireccional
+    current_closed = set()
+    current_path = None
+    nodes_expanded_last = 0
+    gcost_last = 0
+    time_ms_last = 0
+    path_length_last = 0
+    search_stats = SearchStats()  # contadores de la última búsqueda completa (panel de instrumentación)
+    find_in_progress = False
+    heuristic_name = DEFAULT_HEURISTIC
+    engine_name = "astar"
+    # incremental replanning after edits, once a search has finished
+    replan_active = False
+    planner = None
+    planner_version = None
+    # trazas: cada búsqueda se graba en memoria y se puede reproducir sin volver a buscar
+    trace_buf = None      # BytesIO de la búsqueda en curso
+    last_trace = None     # bytes de la última traza completa (o cargada)
+    replayer = None       # TraceReplayer activo
+    replay_playing = False
+    replay_dir = 1        # 1: hacia delante, -1: hacia atrás
+
+    # functions bound to buttons
+    def stop_search():
+        nonlocal search_thread, replayer, replay_playing
+        if search_thread is not None:
+            search_thread.cancel()
+            search_thread = None
+        replayer = None
+        replay_playing = False
+
+    def edit_cell(x, y, value):
+        # every grid edit from the mouse goes through here so the shown path can be repaired
+        if gw.grid[y][x] == value:
+            return
+        stale = planner is None or planner_version != gw.version or planner.start != gw.start or planner.goal != gw.goal
+        prev_version = gw.version
+        gw.set_cell(x, y, value)
+        renderer.mark_edit(gw, (x, y), prev_version)
+        if components.version == prev_version:
+            components.update([(x, y)])
+        replan_after_edit(x, y, stale)
+
+    def edit_terrain(x, y):
+        # pincel de terreno: siguiente peso de TERRAIN_LEVELS
+        nonlocal status_msg
+        w = gw.cost_at(x, y)
+        w = TERRAIN_LEVELS[(TERRAIN_LEVELS.index(w) + 1) % len(TERRAIN_LEVELS)] if w in TERRAIN_LEVELS else 1
+        stale = planner is None or planner_version != gw.version or planner.start != gw.start or planner.goal != gw.goal
+        prev_version = gw.version
+        gw.set_cost(x, y, w)
+        renderer.mark_edit(gw, (x, y), prev_version)
+        if components.version == prev_version:
+            components.update([(x, y)])  # weights never change connectivity
+        status_msg = f"Peso de {(x, y)} = {w}"
+        replan_after_edit(x, y, stale)
+
+    def replan_after_edit(x, y, stale):
+        nonlocal planner, planner_version, current_path, current_open, current_open_back, current_closed, nodes_expanded_last, gcost_last, time_ms_last, path_length_last, status_msg
+        if not replan_active or find_in_progress or not gw.start or not gw.goal:
+            return
+        if not components.connected(gw.start, gw.goal):
+            current_open, current_open_back, current_closed = set(), set(), set()
+            current_path = None
+            nodes_expanded_last = time_ms_last = 0
+            status_msg = "SIN RUTA POSIBLE tras la edición (inicio y meta en componentes distintos)."
+            return
+        if stale:
+            h = heuristic_name if HEURISTICS[heuristic_name].bound == 1 else DEFAULT_HEURISTIC
+            planner = DStarLite(gw, gw.start, gw.goal, heuristic=h)
+            res = planner.plan()
+        else:
+            res = planner.update([(x, y)])
+        planner_version = gw.version
+        current_open, current_open_back, current_closed = set(), set(), set()
+        current_path = res.path
+        nodes_expanded_last = res.nodes_expanded
+        time_ms_last = int(res.time_ms)
+        if res.path:
+            gcost_last = res.cost
+            path_length_last = len(res.path) - 1
+            status_msg = f"Ruta replanificada (D* Lite). Coste={gcost_last} Nodos={nodes_expanded_last}"
+        else:
+            status_msg = "SIN RUTA POSIBLE tras la edición."
+
+    def btn_randomize():
+        gw.randomize_obstacles(density=slider_density.value)
+        status = "Obstáculos generados aleatoriamente."
+        nonlocal status_msg
+        status_msg = status
+
+    def btn_clear():
+        gw.clear_all()
+        nonlocal current_open, current_open_back, current_closed, current_path, status_msg, find_in_progress, replan_active
+        replan_active = False
+        current_open, current_open_back, current_closed, current_path = set(), set(), set(), None
+        status_msg = "Limpiado."
+        find_in_progress = False
+        stop_search()  # Asegurar que la búsqueda se reinicie
+
+    def btn_find():
+        nonlocal search_thread, current_open, current_open_back, current_closed, current_path, nodes_expanded_last, gcost_last, time_ms_last, path_length_last, find_in_progress, status_msg, replan_active, search_stats, trace_buf
+        if not gw.start or not gw.goal:
+            status_msg = "Debes colocar Inicio y Meta antes de buscar."
+            return
+        if gw.start == gw.goal:
+            status_msg = "Inicio == Meta. No se ejecuta búsqueda."
+            current_path = [gw.start]
+            return
+        # validate start/goal on free cells
+        sx, sy = gw.start
+        gx, gy = gw.goal
+        if gw.grid[sy][sx] == OBSTACLE or gw.grid[gy][gx] == OBSTACLE:
+            status_msg = "Inicio o Meta está en obstáculo. Libera la celda."
+            return
+        if engine_name == "bidir" and HEURISTICS[heuristic_name].bound != 1:
+            status_msg = "El motor bidireccional necesita una heurística admisible (octile, chebyshev o zero)."
+            return
+        if engine_name in ("jps", "theta", "lazytheta") and gw.costs is not None:
+            status_msg = f"{engine_name} necesita costes uniformes: usa otro motor sobre terreno con pesos."
+            return
+        # start the search thread (the UI only polls its queue)
+        replan_active = False
+        stop_search()
+        search_stats = SearchStats(engine_name, timers=True)
+        trace_buf = io.BytesIO()
+        events = engine_steps(gw, gw.start, gw.goal, engine=engine_name, heuristic=heuristic_name,
+                              components=components, stats=search_stats)
+        writer = TraceWriter(trace_buf, gw.width, gw.height, gw.start, gw.goal, engine_name, heuristic_name)
+        search_thread = SearchThread(record(events, writer)).start()
+        current_open = set()
+        current_open_back = set()
+        current_closed = set()
+        current_path = None
+        nodes_expanded_last = 0
+        gcost_last = 0
+        time_ms_last = 0
+        path_length_last = 0
+        find_in_progress = True
+        status_msg = "Búsqueda iniciada..."
+
+    def btn_export():
+        nonlocal current_path, status_msg
+        if not current_path:
+            status_msg = "No hay ruta para exportar."
+            return
+        # one NDJSON record: query, metrics of the last search and the path
+        try:
+            with open(EXPORT_FILE, "w", encoding="utf-8") as f:
+                NdjsonWriter(f).write(current_path[0], current_path[-1], current_path, gcost_last,
+                                      nodes_expanded_last, time_ms_last)
+            status_msg = f"Ruta exportada a '{EXPORT_FILE}'."
+        except Exception as e:
+            status_msg = f"Error exportando: {e}"
+
+    def btn_smooth():
+        # atajos por línea de visión sobre la ruta mostrada (cualquier motor)
+        nonlocal current_path, gcost_last, path_length_last, status_msg, replan_active
+        if not current_path or find_in_progress:
+            status_msg = "No hay ruta para suavizar."
+            return
+        if gw.costs is not None:
+            status_msg = "El suavizado necesita costes uniformes."
+            return
+        sp = smooth_path(gw, current_path)
+        current_path = sp.path
+        gcost_last = sp.cost
+        path_length_last = len(sp.path) - 1
+        replan_active = False  # D* Lite repararía la ruta en celdas, no en tramos
+        status_msg = f"Ruta suavizada: coste {sp.original_cost} → {sp.cost} (distancia euclídea ×10), {path_length_last} tramos."
+
+    def btn_save_map():
+        nonlocal status_msg
+        try:
+            revision = save_map(MAP_FILE, gw)
+            status_msg = f"Mapa guardado en '{MAP_FILE}' (revisión {revision})."
+        except Exception as e:
+            status_msg = f"Error guardando mapa: {e}"
+
+    def btn_load_map():
+        nonlocal status_msg, find_in_progress, replan_active, current_open, current_open_back, current_closed, current_path
+        try:
+            with MapFile(MAP_FILE) as mf:
+                gw.resize(mf.width, mf.height)
+                gw.cells[:] = mf.cells
+                gw.costs = None if mf.costs is None else array('H', mf.costs)
+                gw.start, gw.goal = mf.start, mf.goal
+                gw.touch()
+                revision = mf.revision
+        except Exception as e:
+            status_msg = f"Error cargando mapa: {e}"
+            return
+        view.fit(gw)
+        stop_search()
+        find_in_progress = replan_active = False
+        current_open, current_open_back, current_closed, current_path = set(), set(), set(), None
+        status_msg = f"Mapa '{MAP_FILE}' cargado ({gw.width}×{gw.height}, revisión {revision})."
+
+    def start_replay(data):
+        # la traza se dibuja con los mismos conjuntos que una búsqueda en vivo
+        nonlocal replayer, replay_playing, replay_dir, current_open, current_open_back, current_closed, current_path, nodes_expanded_last, gcost_last, time_ms_last, path_length_last, find_in_progress, replan_active, status_msg
+        try:
+            trace = read_trace(io.BytesIO(data))
+        except ValueError as e:
+            status_msg = f"Traza no válida: {e}"
+            return
+        if (trace.width, trace.height) != (gw.width, gw.height):
+            status_msg = f"La traza es de un mapa {trace.width}×{trace.height}: carga ese mapa primero."
+            return
+        stop_search()
+        find_in_progress = replan_active = False
+        replayer = TraceReplayer(trace)
+        replay_playing, replay_dir = True, 1
+        current_open, current_open_back, current_closed = replayer.open, replayer.open_back, replayer.closed
+        current_path = None
+        slider_trace.value = 0.0
+        slider_trace._update_handle()
+        final = trace.final
+        if final is not None and final[0] == 'done':
+            _, path, nodes_expanded_last, gcost_last, time_ms_last = final
+            path_length_last = max(0, len(path) - 1)
+        elif final is not None:
+            _, nodes_expanded_last, time_ms_last = final
+        status_msg = f"Reproduciendo traza ({len(trace)} pasos, {trace.engine}/{trace.heuristic})."
+
+    def seek_replay(position):
+        nonlocal current_path
+        renderer.mark(replayer.seek(position))
+        current_path = replayer.path
+        slider_trace.value = replayer.position / max(1, len(replayer))
+        slider_trace._update_handle()
+
+    def btn_replay():
+        nonlocal replay_playing, status_msg
+        if replayer is not None:
+            if not replay_playing and replayer.position == (len(replayer) if replay_dir > 0 else 0):
+                seek_replay(0 if replay_dir > 0 else len(replayer))
+            replay_playing = not replay_playing
+            status_msg = "Reproduciendo traza." if replay_playing else "Traza en pausa."
+            return
+        if last_trace is None:
+            status_msg = "No hay traza: busca una ruta o carga una traza."
+            return
+        start_replay(last_trace)
+
+    def btn_save_trace():
+        nonlocal status_msg
+        if last_trace is None:
+            status_msg = "No hay traza para guardar."
+            return
+        try:
+            with open(TRACE_FILE, "wb") as f:
+                f.write(last_trace)
+            status_msg = f"Traza guardada en '{TRACE_FILE}' ({len(last_trace)} bytes)."
+        except Exception as e:
+            status_msg = f"Error guardando traza: {e}"
+
+    def btn_load_trace():
+        nonlocal last_trace, status_msg
+        try:
+            with open(TRACE_FILE, "rb") as f:
+                data = f.read()
+        except Exception as e:
+            status_msg = f"Error cargando traza: {e}"
+            return
+        last_trace = data
+        start_replay(data)
+
+    def btn_toggle_step():
+        nonlocal step_mode, status_msg
+        step_mode = not step_mode
+        status_msg = "Modo paso a paso ON." if step_mode else "Modo paso a paso OFF."
+
+    def btn_step_once():
+        if search_thread is not None:
+            for ev in search_thread.poll(1):
+                handle_generator_event(ev)
+
+    def btn_complete():
+        # completar: el motor termina a toda velocidad y la UI solo dibuja el último estado
+        nonlocal status_msg
+        if search_thread is None:
+            btn_find()
+        if search_thread is not None:
+            search_thread.run_to_completion()
+            status_msg = "Completando la búsqueda..."
+
+    def btn_cycle_heuristic():
+        nonlocal heuristic_name, status_msg
+        names = list(HEURISTICS)
+        heuristic_name = names[(names.index(heuristic_name) + 1) % len(names)]
+        btn_heuristic.text = f"Heurística: {heuristic_name}"
+        status_msg = f"Heurística {heuristic_name}: {HEURISTICS[heuristic_name].description}."
+
+    def btn_cycle_engine():
+        nonlocal engine_name, heuristic_name, status_msg
+        names = list(ENGINES)
+        previous = engine_name
+        engine_name = names[(names.index(engine_name) + 1) % len(names)]
+        btn_engine.text = f"Motor: {engine_name}"
+        # la heurística por defecto sigue al motor (euclidean para theta) salvo si se eligió otra
+        if heuristic_name == default_heuristic(previous):
+            heuristic_name = default_heuristic(engine_name)
+            btn_heuristic.text = f"Heurística: {heuristic_name}"
+        status_msg = f"Motor de búsqueda: {engine_name}."
+
+    def resize_grid(width, height):
+        # el mapa se conserva: la parte común se copia y lo nuevo queda libre
+        nonlocal status_msg, find_in_progress, replan_active, current_open, current_open_back, current_closed, current_path
+        try:
+            gw.resize(width, height)
+        except ValueError as e:
+            status_msg = f"No se puede cambiar el tamaño: {e}"
+            return
+        stop_search()  # Reiniciar la búsqueda al cambiar tamaño
+        find_in_progress = replan_active = False
+        current_open, current_open_back, current_closed, current_path = set(), set(), set(), None
+        view.fit(gw)
+        status_msg = f"Nuevo tamaño = {gw.width}×{gw.height}."
+
+    def btn_increase_N():
+        # pasos proporcionales (1/8 del lado, mínimo 2) para que los mapas grandes crezcan a buen ritmo
+        resize_grid(gw.width + max(2, gw.width // 8), gw.height + max(2, gw.height // 8))
+
+    def btn_decrease_N():
+        nonlocal status_msg
+        if min(gw.width, gw.height) <= MIN_N:
+            status_msg = f"Lado mínimo = {MIN_N}."
+            return
+        resize_grid(max(MIN_N, gw.width - max(2, gw.width // 8)), max(MIN_N, gw.height - max(2, gw.height // 8)))
+
+    # add buttons - TODOS A LA DERECHA
+    btn_y = 20
+    buttons.append(Button((WINDOW_WIDTH - PANEL_WIDTH + 30, btn_y, 200, 36), "Obstáculos aleatorios", btn_randomize))
+    btn_y += 46
+    buttons.append(Button((WINDOW_WIDTH - PANEL_WIDTH + 30, btn_y, 200, 36), "Limpiar", btn_clear))
+    btn_y += 46
+    buttons.append(Button((WINDOW_WIDTH - PANEL_WIDTH + 30, btn_y, 200, 36), "Buscar ruta", btn_find))
+    btn_y += 46
+    buttons.append(Button((WINDOW_WIDTH - PANEL_WIDTH + 30, btn_y, 200, 36), "Exportar ruta", btn_export))
+    btn_y += 46
+    buttons.append(Button((WINDOW_WIDTH - PANEL_WIDTH + 30, btn_y, 200, 36), "Modo paso a paso", btn_toggle_step))
+    btn_y += 46
+    buttons.append(Button((WINDOW_WIDTH - PANEL_WIDTH + 30, btn_y, 200, 36), "Paso único (espacio)", btn_step_once))
+    btn_y += 46
+    buttons.append(Button((WINDOW_WIDTH - PANEL_WIDTH + 30, btn_y, 95, 36), "N +", btn_increase_N))
+    buttons.append(Button((WINDOW_WIDTH - PANEL_WIDTH + 135, btn_y, 95, 36), "N -", btn_decrease_N))
+
+    # Opciones del motor - columna derecha, debajo de los controles
+    opt_x, opt_y = WINDOW_WIDTH - PANEL_WIDTH + 250, 230
+    btn_heuristic = Button((opt_x, opt_y, 220, 36), f"Heurística: {heuristic_name}", btn_cycle_heuristic)
+    buttons.append(btn_heuristic)
+    opt_y += 46
+    btn_engine = Button((opt_x, opt_y, 220, 36), f"Motor: {engine_name}", btn_cycle_engine)
+    buttons.append(btn_engine)
+    opt_y += 46
+    buttons.append(Button((opt_x, opt_y, 105, 36), "Guardar mapa", btn_save_map))
+    buttons.append(Button((opt_x + 115, opt_y, 105, 36), "Cargar mapa", btn_load_map))
+    opt_y += 46
+    buttons.append(Button((opt_x, opt_y, 220, 36), "Completar búsqueda", btn_complete))
+    opt_y += 46
+    buttons.append(Button((opt_x, opt_y, 220, 36), "Suavizar ruta", btn_smooth))
+
+    # Ahora definimos los sliders después de todos los botones
+    slider_y = btn_y + 80  # Posición después del último botón
+    slider_density = Slider(WINDOW_WIDTH - PANEL_WIDTH + 30, slider_y, 200, initial=gw.density)
+    slider_y += 70
+    slider_speed = Slider(WINDOW_WIDTH - PANEL_WIDTH + 30, slider_y, 200, initial=0.5)
+
+    # Trazas - debajo de la cuadrícula: botones y barra de tiempo para avanzar/retroceder
+    trace_y = grid_rect.bottom + 6
+    buttons.append(Button((grid_rect.x, trace_y, 140, 28), "Reproducir traza", btn_replay))
+    buttons.append(Button((grid_rect.x + 150, trace_y, 120, 28), "Guardar traza", btn_save_trace))
+    buttons.append(Button((grid_rect.x + 280, trace_y, 120, 28), "Cargar traza", btn_load_trace))
+    slider_trace = Slider(grid_rect.x, trace_y + 36, grid_rect.w, initial=0.0)
+
+    # helper to process generator events
+    def handle_generator_event(ev):
+        nonlocal current_open, current_open_back, current_closed, current_path, nodes_expanded_last, gcost_last, time_ms_last, path_length_last, search_thread, find_in_progress, status_msg, replan_active, last_trace
+        if ev[0] in ('done', 'no_path') and trace_buf is not None:
+            # the recorder writes the final event before passing it on
+            last_trace = trace_buf.getvalue()
+        if ev[0] == 'delta':
+            # only the changed nodes arrive; the sets are updated in place
+            current, new_open = ev[1], ev[2]
+            # bidirectional deltas carry the side: 1 = frente desde la meta
+            frontier = current_open_back if len(ev) > 3 and ev[3] == 1 else current_open
+            frontier.discard(current)
+            current_closed.add(current)
+            frontier.update(new_open)
+            renderer.mark(new_open)
+            renderer.mark((current,))
+            # current_path remains None until done
+        elif ev[0] == 'batch':
+            # deltas coalesced by the search thread while completing
+            _, closed, opened, opened_back = ev
+            current_closed.update(closed)
+            current_open.update(opened)
+            current_open.difference_update(closed)
+            current_open_back.update(opened_back)
+            current_open_back.difference_update(closed)
+            renderer.mark(closed)
+            renderer.mark(opened)
+            renderer.mark(opened_back)
+        elif ev[0] == 'done':
+            _, path, nodes_expanded, gcost, time_ms = ev
+            current_path = path
+            nodes_expanded_last = nodes_expanded
+            gcost_last = gcost
+            time_ms_last = time_ms
+            path_length_last = max(0, len(path)-1)
+            status_msg = f"Ruta encontrada. Coste={gcost_last} Steps={path_length_last} Nodos={nodes_expanded_last} Tiempo={time_ms_last}ms"
+            # the thread has finished
+            search_thread = None
+            find_in_progress = False
+            replan_active = True
+        elif ev[0] == 'no_path':
+            _, nodes_expanded, time_ms = ev
+            current_path = None
+            current_open = set()
+            current_open_back = set()
+            current_closed = set()
+            nodes_expanded_last = nodes_expanded
+            time_ms_last = time_ms
+            status_msg = f"SIN RUTA POSIBLE. Nodos expandidos={nodes_expanded_last} Tiempo={time_ms_last}ms"
+            search_thread = None
+            find_in_progress = False
+            replan_active = True
+        elif ev[0] == 'error':
+            status_msg = f"Error en la búsqueda: {ev[1]}"
+            search_thread = None
+            find_in_progress = False
+
+    # main loop
+    running = True
+    last_mouse_down = None
+    while running:
+        clock.tick(FPS)
+        for event in pygame.event.get():
+            # UI widgets
+            if event.type == pygame.QUIT:
+                running = False
+            # Buttons and sliders
+            for b in buttons:
+                b.handle(event)
+            slider_density.handle(event)
+            slider_speed.handle(event)
+            slider_trace.handle(event)
+
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                mx,my = event.pos
+                last_mouse_down = event.pos
+                # grid interactions
+                if event.button == 2 and grid_rect.collidepoint(event.pos):
+                    # botón central: arrastrar para desplazar la vista
+                    panning = True
+                elif grid_rect.collidepoint(event.pos):
+                    # convert to grid coords
+                    cell = view.cell_at(event.pos)
+                    if cell is not None:
+                        gx, gy = cell
+                        if event.button == 1:  # left click: place obstacle or set start/goal depending on mode
+                            if mode_set_start:
+                                # set start
+                                if gw.grid[gy][gx] != OBSTACLE:
+                                    gw.set_start((gx,gy))
+                                    status_msg = f"Start colocado en {(gx,gy)}"
+                                    mode_set_start = False
+                                else:
+                                    status_msg = "No se puede colocar Start sobre un obstáculo."
+                            elif mode_set_goal:
+                                if gw.grid[gy][gx] != OBSTACLE:
+                                    gw.set_goal((gx,gy))
+                                    status_msg = f"Goal colocado en {(gx,gy)}"
+                                    mode_set_goal = False
+                                else:
+                                    status_msg = "No se puede colocar Goal sobre un obstáculo."
+                            elif terrain_mode:
+                                if gw.grid[gy][gx] == OBSTACLE:
+                                    status_msg = "Los obstáculos no tienen peso de terreno."
+                                else:
+                                    edit_terrain(gx, gy)
+                            else:
+                                # place obstacle (toggle)
+                                if gw.grid[gy][gx] == OBSTACLE:
+                                    edit_cell(gx, gy, FREE)
+                                elif gw.grid[gy][gx] in (START, GOAL):
+                                    # don't overwrite start/goal accidentally
+                                    status_msg = "Usa los botones para mover Start/Goal."
+                                else:
+                                    edit_cell(gx, gy, OBSTACLE)
+                                placing_obstacles = True
+                        elif event.button == 3:  # right click: remove obstacle
+                            if gw.grid[gy][gx] == OBSTACLE:
+                                edit_cell(gx, gy, FREE)
+                            removing_obstacles = True
+                else:
+                    # clicks outside grid may toggle set-start/set-goal when clicking dedicated zones
+                    pass
+
+            elif event.type == pygame.MOUSEBUTTONUP:
+                placing_obstacles = False
+                removing_obstacles = False
+                panning = False
+                last_mouse_down = None
+
+            elif event.type == pygame.MOUSEMOTION:
+                if panning:
+                    view.pan(gw, -event.rel[0], -event.rel[1])
+                cell = view.cell_at(event.pos)
+                if placing_obstacles and cell is not None:
+                    gx, gy = cell
+                    if gw.grid[gy][gx] == FREE:
+                        edit_cell(gx, gy, OBSTACLE)
+                if removing_obstacles and cell is not None:
+                    gx, gy = cell
+                    if gw.grid[gy][gx] == OBSTACLE:
+                        edit_cell(gx, gy, FREE)
+
+            elif event.type == pygame.MOUSEWHEEL:
+                # rueda: zoom centrado en el puntero
+                pos = pygame.mouse.get_pos()
+                if grid_rect.collidepoint(pos):
+                    view.zoom(gw, event.y, pos)
+                    status_msg = f"Zoom: {view.cell_px} px por celda (Inicio: ver todo)."
+
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_s:
+                    mode_set_start = True
+                    mode_set_goal = False
+                    status_msg = "Click en una celda para colocar START."
+                elif event.key == pygame.K_g:
+                    mode_set_goal = True
+                    mode_set_start = False
+                    status_msg = "Click en una celda para colocar GOAL."
+                elif event.key == pygame.K_t:
+                    terrain_mode = not terrain_mode
+                    status_msg = "Pincel de terreno ON: click izquierdo cambia el peso (1→3→9)." if terrain_mode else "Pincel de terreno OFF."
+                elif event.key == pygame.K_SPACE:
+                    # step once
+                    btn_step_once()
+                elif event.key == pygame.K_ESCAPE:
+                    mode_set_start = False
+                    mode_set_goal = False
+                    status_msg = "Modos Start/Goal cancelados."
+                elif event.key in _PAN_KEYS:
+                    dx, dy = _PAN_KEYS[event.key]
+                    view.pan(gw, dx * PAN_STEP, dy * PAN_STEP)
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS, pygame.K_MINUS, pygame.K_KP_MINUS):
+                    view.zoom(gw, 1 if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS) else -1)
+                    status_msg = f"Zoom: {view.cell_px} px por celda (Inicio: ver todo)."
+                elif replayer is not None and event.key in (pygame.K_COMMA, pygame.K_PERIOD):
+                    # traza: un paso atrás / adelante (pausa la reproducción)
+                    replay_playing = False
+                    seek_replay(replayer.position + (1 if event.key == pygame.K_PERIOD else -1))
+                elif replayer is not None and event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+                    jump = max(1, int(len(replayer) * REPLAY_JUMP))
+                    seek_replay(replayer.position + (jump if event.key == pygame.K_PAGEDOWN else -jump))
+                elif replayer is not None and event.key == pygame.K_r:
+                    replay_dir = -replay_dir
+                    status_msg = "Traza hacia delante." if replay_dir > 0 else "Traza hacia atrás."
+                elif event.key == pygame.K_HOME:
+                    view.fit(gw)
+                    status_msg = f"Vista completa: {view.cell_px} px por celda."
+
+        # update derived params (the grid may have been resized elsewhere)
+        view.clamp(gw)
+        
+        gw.density = slider_density.value
+
+        # drain the search thread without waiting: paced by the speed slider, everything when completing
+        if search_thread is not None and (not step_mode or search_thread.fast):
+            steps_pf = None if search_thread.fast else 1 + int(slider_speed.value * 40)
+            for ev in search_thread.poll(steps_pf):
+                handle_generator_event(ev)
+
+        # trace playback: the timeline bar wins while it is dragged
+        if replayer is not None:
+            if slider_trace.dragging:
+                replay_playing = False
+                target = round(slider_trace.value * len(replayer))
+                if target != replayer.position:
+                    seek_replay(target)
+            elif replay_playing:
+                seek_replay(replayer.position + replay_dir * int(2 ** (slider_speed.value * REPLAY_SPEED_BITS)))
+                if replayer.position in (0, len(replayer)):
+                    replay_playing = False
+                    status_msg = "Fin de la traza." if replay_dir > 0 else "Inicio de la traza."
+
+        # draw background
+        screen.fill((230,230,230))
+        # draw grid area background - IZQUIERDA
+        pygame.draw.rect(screen, NEGRO, grid_rect, 2)
+        # draw the grid cells
+        renderer.draw(screen, gw, view, current_open, current_closed, current_path, current_open_back)
+        
+        # draw right panel
+        panel_x = WINDOW_WIDTH - PANEL_WIDTH
+        pygame.draw.rect(screen, (240,240,240), (panel_x, 0, PANEL_WIDTH, WINDOW_HEIGHT))
+        
+        # draw buttons - TODOS A LA DERECHA
+        for b in buttons:
+            b.draw(screen)
+        
+        # SLIDERS DEBAJO DE LOS BOTONES
+        slider_start_y = btn_y + 60  # Posición después del último botón
+        lbl = FONT.render("Densidad (obstáculos):", True, NEGRO)
+        screen.blit(lbl, (panel_x + 30, slider_start_y - 10))
+        slider_density.draw(screen)
+        
+        lbl2 = FONT.render("Velocidad (exec):", True, NEGRO)
+        screen.blit(lbl2, (panel_x + 30, slider_start_y + 60))
+        slider_speed.draw(screen)
+
+        # barra de tiempo de la traza
+        slider_trace.draw(screen)
+        trace_info = f"Paso {replayer.position} / {len(replayer)}" if replayer is not None else "Sin traza activa"
+        screen.blit(FONT.render(trace_info, True, NEGRO), (grid_rect.x + 410, trace_y + 4))
+
+        # CONTROLES - AL LADO DERECHO DE LOS BOTONES
+        controls_x = panel_x + 250  # Más a la derecha
+        controls_y = 20
+        hints = [
+            "Controles:",
+            "- S: seleccionar Inicio (click)",
+            "- G: seleccionar Meta (click)",
+            "- Click izquierdo: poner obstáculo",
+            "- Click derecho: quitar obstáculo",
+            "- Espacio: paso único (modo paso a paso)",
+            "- T: pincel de terreno (peso 1→3→9)",
+            "- Rueda/+/-: zoom · flechas, botón central: mover",
+            "- Traza: ,/. paso · RePág/AvPág salto · R sentido",
+        ]
+        for h in hints:
+            screen.blit(FONT.render(h, True, NEGRO), (controls_x, controls_y))
+            controls_y += 24
+
+        # MÉTRICAS - DEBAJO DE LOS SLIDERS
+        metrics_x = panel_x + 30
+        metrics_y = slider_start_y + 120  # Posición después de los sliders
+        screen.blit(FONT_L.render("Métricas:", True, NEGRO), (metrics_x, metrics_y))
+        metrics_y += 28
+        screen.blit(FONT.render(f"Tamaño = {gw.width}×{gw.height} · zoom {view.cell_px} px", True, NEGRO), (metrics_x, metrics_y)); metrics_y += 20
+        screen.blit(FONT.render(f"Densidad ≈ {gw.density:.2f}", True, NEGRO), (metrics_x, metrics_y)); metrics_y += 20
+        screen.blit(FONT.render(f"Nodos expandidos: {nodes_expanded_last}", True, NEGRO), (metrics_x, metrics_y)); metrics_y += 20
+        screen.blit(FONT.render(f"Coste total (g): {gcost_last}", True, NEGRO), (metrics_x, metrics_y)); metrics_y += 20
+        screen.blit(FONT.render(f"Longitud (pasos): {path_length_last}", True, NEGRO), (metrics_x, metrics_y)); metrics_y += 20
+        screen.blit(FONT.render(f"Tiempo búsqueda: {time_ms_last} ms", True, NEGRO), (metrics_x, metrics_y)); metrics_y += 20
+        screen.blit(FONT.render(f"Motor: {engine_name} · Heurística: {heuristic_name} (coste ≤ {HEURISTICS[heuristic_name].bound:.3f}·óptimo)", True, NEGRO), (metrics_x, metrics_y)); metrics_y += 20
+
+        # INSTRUMENTACIÓN - COLUMNA DERECHA, DEBAJO DE LAS OPCIONES DEL MOTOR
+        inst_x, inst_y = panel_x + 250, opt_y + 56
+        screen.blit(FONT_L.render("Instrumentación:", True, NEGRO), (inst_x, inst_y))
+        inst_y += 28
+        st = search_stats
+        inst_lines = [
+            f"Inserciones en heap: {_fmt_stat(st.heap_pushes)}",
+            f"Pops obsoletos: {_fmt_stat(st.stale_pops)}",
+            f"Reaperturas: {_fmt_stat(st.reopenings)}",
+            f"Pico de abiertos: {_fmt_stat(st.peak_open)}",
+            f"Vecinos evaluados: {_fmt_stat(st.neighbor_evals)}",
+        ]
+        if st.phases:
+            inst_lines.append("Fases (ms): " + " · ".join(f"{_PHASE_NAMES.get(k, k)} {v:.1f}" for k, v in st.phases.items()))
+        for line in inst_lines:
+            screen.blit(FONT.render(line, True, NEGRO), (inst_x, inst_y))
+            inst_y += 20
+
+        # draw info/status
+        screen.blit(FONT.render("Estado: " + status_msg, True, NEGRO), (20, WINDOW_HEIGHT - 32))
+
+        pygame.display.flip()
+
+    pygame.quit()
+    sys.exit()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""
+Background search thread for the visualizer (and any other event consumer).
+
+SearchThread drives an engine_steps-style generator in a daemon thread and
+hands its events over through a bounded queue, so a slow expansion never
+blocks the consumer and the consumer never waits for the search:
+  - paced (default): every event is queued; when the queue is full the
+    worker waits, so it runs at most maxsize events ahead of the consumer
+  - run_to_completion(): the engine runs at full speed; deltas that do not
+    fit in the queue are coalesced into one ('batch', closed, opened,
+    opened_back) event, so the consumer only sees the latest state
+poll() never blocks. The final 'done' / 'no_path' event is always delivered
+unless the search was cancelled; an exception raised by the engine arrives as
+('error', exception).
+
+Threads rather than processes: the engines are generators over a live
+GridWorld, which a thread can share without copying.
+"""
+import queue
+import threading
+
+DEFAULT_QUEUE_SIZE = 256
+# coalesced deltas are offered to the queue every this many events
+_FLUSH_EVERY = 64
+
+
+def _merge(batch, ev):
+    # fold one delta into a ('batch', closed, opened, opened_back) event
+    if batch is None:
+        batch = ('batch', [], [], [])
+    batch[1].append(ev[1])
+    if len(ev) > 3 and ev[3] == 1:
+        batch[3].extend(ev[2])
+    else:
+        batch[2].extend(ev[2])
+    return batch
+
+
+class SearchThread:
+    def __init__(self, events, maxsize=DEFAULT_QUEUE_SIZE, fast=False):
+        self._events = events
+        self._queue = queue.Queue(maxsize)
+        self._cancel = threading.Event()
+        self._fast = threading.Event()
+        if fast:
+            self._fast.set()
+        self._finished = False
+        self._thread = threading.Thread(target=self._run, name="a_star-search", daemon=True)
+    def start(self):
+        self._thread.start()
+        return self
+
+    # --- consumer side ---
+    def poll(self, max_events=None):
+        """Events available right now (at most max_events), oldest first."""
+        out = []
+        while max_events is None or len(out) < max_events:
+            try:
+                ev = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            out.append(ev)
+            if ev[0] != 'delta' and ev[0] != 'batch':
+                self._finished = True
+                break
+        return out
+    def run_to_completion(self):
+        """Stop pacing: finish at engine speed, coalescing the remaining deltas."""
+        self._fast.set()
+    def cancel(self):
+        """Stop the search; nothing more is delivered."""
+        self._cancel.set()
+    @property
+    def finished(self):
+        """True once poll() returned the final event."""
+        return self._finished
+    @property
+    def fast(self):
+        return self._fast.is_set()
+
+    # --- worker side ---
+    def _put(self, ev):
+        # blocking put that gives up on cancel; False if cancelled
+        while not self._cancel.is_set():
+            try:
+                self._queue.put(ev, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+    def _run(self):
+        events = self._events
+        batch = None
+        pending = 0
+        try:
+            for ev in events:
+                if self._cancel.is_set():
+                    return
+                if ev[0] != 'delta':
+                    if batch is not None and not self._put(batch):
+                        return
+                    self._put(ev)
+                    return
+                if not self._fast.is_set():
+                    # paced: wait for room, unless the consumer switches to fast mode meanwhile
+                    while True:
+                        try:
+                            self._queue.put(ev, timeout=0.05)
+                            break
+                        except queue.Full:
+                            if self._cancel.is_set():
+                                return
+                            if self._fast.is_set():
+                                batch = _merge(batch, ev)
+                                break
+                    continue
+                batch = _merge(batch, ev)
+                pending += 1
+                if pending >= _FLUSH_EVERY:
+                    pending = 0
+                    try:
+                        self._queue.put_nowait(batch)
+                        batch = None
+                    except queue.Full:
+                        pass
+        except Exception as e:
+            # the deltas coalesced so far go first, so the consumer's state matches the error
+            if batch is None or self._put(batch):
+                self._put(('error', e))
+        finally:
+            if self._cancel.is_set() and hasattr(events, "close"):
+                events.close()
@@ -0,0 +1,55 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from a_star import GridWorld, FREE, OBSTACLE, neighbors_of
+
+
+def random_grid(seed, width, height=None, density=0.25):
+    gw = GridWorld(width=width, height=width if height is None else height)
+    gw.randomize_obstacles(density, seed=seed)
+    return gw
+
+def free_cells(gw):
+    return [(i % gw.width, i // gw.width) for i, c in enumerate(gw.cells) if c == FREE]
+
+def random_queries(gw, count, seed):
+    rng = random.Random(seed)
+    free = free_cells(gw)
+    return [tuple(rng.sample(free, 2)) for _ in range(count)] if len(free) >= 2 else []
+
+def add_terrain(gw, seed, cells=40, weights=(2, 5, 9)):
+    rng = random.Random(seed)
+    for x, y in rng.sample(free_cells(gw), min(cells, len(free_cells(gw)))):
+        gw.set_cost(x, y, rng.choice(weights))
+    return gw
+
+def random_edits(gw, count, seed):
+    """Toggle count random cells (obstacle <-> free) through set_cell; returns them."""
+    rng = random.Random(seed)
+    changed = []
+    for _ in range(count):
+        x, y = rng.randrange(gw.width), rng.randrange(gw.height)
+        gw.set_cell(x, y, FREE if gw.grid[y][x] == OBSTACLE else OBSTACLE)
+        changed.append((x, y))
+    return changed
+
+def path_cost(gw, path):
+    """Cost of a cell-by-cell path under neighbors_of's moves; fails on an illegal step."""
+    cost = 0
+    for a, b in zip(path, path[1:]):
+        moves = dict(neighbors_of(a, gw))
+        assert b in moves and gw.grid[b[1]][b[0]] != OBSTACLE, (a, b)
+        cost += moves[b]
+    return cost
+
+
+@pytest.fixture
+def grids():
+    # seeded random maps of several shapes and densities
+    return [random_grid(seed, w, h, d) for seed, (w, h, d) in enumerate(
+        [(13, 13, 0.2), (30, 20, 0.25), (20, 41, 0.3), (64, 64, 0.2), (7, 50, 0.15)])]
@@ -0,0 +1,89 @@
+from a_star import (GridWorld, theta_star, lazy_theta_star, line_of_sight, smooth_path, densify, astar,
+                    save_map, open_map, find_path, engine_steps, OBSTACLE)
+from a_star.batch import batch_search
+from conftest import random_grid, random_queries
+
+
+def _legal(gw, path):
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        dx, dy = x1 - x0, y1 - y0
+        assert max(abs(dx), abs(dy)) == 1
+        assert gw.grid[y1][x1] != OBSTACLE
+        if dx and dy:
+            assert gw.grid[y0][x1] != OBSTACLE and gw.grid[y1][x0] != OBSTACLE
+
+def _shared(gw):
+    # the buffer shape batch workers and open_map use: memoryview cells
+    out = GridWorld.from_buffer(gw.width, memoryview(bytearray(gw.cells)), height=gw.height)
+    out.start, out.goal = gw.start, gw.goal
+    return out
+
+
+def test_theta_paths_are_walkable_and_no_longer_than_grid_paths(grids):
+    for gw in grids:
+        for s, t in random_queries(gw, 10, seed=gw.width):
+            ref = astar(gw, s, t)
+            for engine in (theta_star, lazy_theta_star):
+                res = engine(gw, s, t)
+                if ref.path is None:
+                    assert res.path is None
+                    continue
+                assert res.path[0] == s and res.path[-1] == t
+                assert all(line_of_sight(gw, a, b) for a, b in zip(res.path, res.path[1:]))
+                _legal(gw, densify(res.path))
+                # 10 x Euclidean length never exceeds the octile grid cost
+                assert res.cost <= ref.cost + 1
+
+def test_smooth_path_keeps_line_of_sight(grids):
+    for gw in grids:
+        for s, t in random_queries(gw, 10, seed=1):
+            path = astar(gw, s, t).path
+            if path is None:
+                continue
+            sp = smooth_path(gw, path)
+            assert sp.path[0] == s and sp.path[-1] == t
+            assert sp.cost <= sp.original_cost
+            assert all(line_of_sight(gw, a, b) for a, b in zip(sp.path, sp.path[1:]))
+            _legal(gw, densify(sp.path))
+
+def test_line_of_sight_on_from_buffer_grid(grids):
+    for gw in grids:
+        shared = _shared(gw)
+        for s, t in random_queries(gw, 20, seed=2):
+            for a, b in ((s, t), (s, (t[0], s[1])), (s, (s[0], t[1]))):
+                assert line_of_sight(shared, a, b) == line_of_sight(gw, a, b)
+
+def test_theta_on_from_buffer_grid(grids):
+    for gw in grids:
+        shared = _shared(gw)
+        for s, t in random_queries(gw, 10, seed=3):
+            for engine in (theta_star, lazy_theta_star):
+                assert engine(shared, s, t)[:2] == engine(gw, s, t)[:2]
+
+def test_theta_on_mapped_file(tmp_path):
+    gw = random_grid(4, 40, 30)
+    save_map(tmp_path / "m.astm", gw)
+    mapped = open_map(tmp_path / "m.astm")
+    for s, t in random_queries(gw, 10, seed=4):
+        assert theta_star(mapped, s, t)[:2] == theta_star(gw, s, t)[:2]
+
+def test_theta_in_batch_workers():
+    gw = random_grid(5, 50, 40)
+    queries = random_queries(gw, 20, seed=5)
+    for engine in ("theta", "lazytheta"):
+        got = list(batch_search(gw, queries, engine=engine, workers=2, chunksize=4))
+        for i, s, t, res in got:
+            assert res.cost == find_path(gw, s, t, engine=engine).cost
+
+def test_registry_uses_the_any_angle_default_heuristic(grids):
+    for gw in grids:
+        queries = random_queries(gw, 10, seed=6)
+        for engine, fn in (("theta", theta_star), ("lazytheta", lazy_theta_star)):
+            batch = {i: res for i, s, t, res in batch_search(gw, queries, engine=engine, workers=1)}
+            for i, (s, t) in enumerate(queries):
+                direct = fn(gw, s, t)
+                assert find_path(gw, s, t, engine=engine)[:2] == direct[:2]
+                assert batch[i][:2] == direct[:2]
+                done = list(engine_steps(gw, s, t, engine=engine))[-1]
+                if direct.path is not None:
+                    assert done[1] == direct.path
@@ -0,0 +1,40 @@
+import threading
+
+from a_star import ara_star, ara_star_iter, astar, find_path
+from conftest import random_grid, random_queries, add_terrain, path_cost
+
+
+def test_converges_to_the_optimum(grids):
+    for gw in grids + [add_terrain(random_grid(120, 40, 40), 120)]:
+        for s, t in random_queries(gw, 10, seed=gw.width + 7):
+            ref = astar(gw, s, t)
+            res = ara_star(gw, s, t)
+            assert res.cost == ref.cost
+            if res.path is not None:
+                assert res.bound == 1.0
+                assert path_cost(gw, res.path) == res.cost
+
+def test_passes_improve_within_their_bounds():
+    gw = add_terrain(random_grid(121, 60, 45), 121)
+    for s, t in random_queries(gw, 8, seed=121):
+        optimal = astar(gw, s, t).cost
+        results = list(ara_star_iter(gw, s, t, initial_weight=5.0, weight_step=1.0))
+        if optimal is None:
+            assert results == []
+            continue
+        for prev, cur in zip(results, results[1:]):
+            assert cur.cost <= prev.cost and cur.bound <= prev.bound
+        for res in results:
+            assert path_cost(gw, res.path) == res.cost <= res.bound * optimal
+        assert results[-1].cost == optimal
+
+def test_budgets_keep_the_best_path_so_far():
+    gw = random_grid(122, 80, 80, density=0.2)
+    s, t = random_queries(gw, 1, seed=122)[0]
+    first = next(ara_star_iter(gw, s, t))
+    res = ara_star(gw, s, t, max_nodes=first.nodes_expanded)
+    assert (res.path, res.cost) == (first.path, first.cost)
+    cancel = threading.Event()
+    cancel.set()
+    assert ara_star(gw, s, t, cancel=cancel).path is None
+    assert find_path(gw, s, t, engine="ara", weight=2.0).cost <= 2 * astar(gw, s, t).cost
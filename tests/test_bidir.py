@@ -0,0 +1,37 @@
+import pytest
+
+from a_star import FlatGrid, astar, bidirectional_astar, bidirectional_steps
+from conftest import random_grid, random_queries, add_terrain, path_cost
+
+
+def test_optimal_costs(grids):
+    for gw in grids + [add_terrain(random_grid(70, 40, 30), 70)]:
+        fg = FlatGrid(gw)
+        for s, t in random_queries(gw, 15, seed=gw.width + 1):
+            ref = astar(gw, s, t)
+            for parallel in (False, True):
+                res = bidirectional_astar(gw, s, t, fg=fg, parallel=parallel)
+                assert res.cost == ref.cost
+                if res.path is not None:
+                    assert res.path[0] == s and res.path[-1] == t
+                    assert path_cost(gw, res.path) == res.cost
+    s = random_queries(grids[0], 1, seed=0)[0][0]
+    res = bidirectional_astar(grids[0], s, s)
+    assert (res.path, res.cost) == ([s], 0)
+
+def test_steps_end_like_the_one_shot_search():
+    gw = random_grid(71, 40, 40)
+    for s, t in random_queries(gw, 5, seed=71):
+        res = bidirectional_astar(gw, s, t)
+        events = list(bidirectional_steps(gw, s, t))
+        assert {ev[3] for ev in events[:-1]} <= {0, 1}
+        if res.path is None:
+            assert events[-1][0] == 'no_path'
+        else:
+            assert events[-1][:4] == ('done', res.path, res.nodes_expanded, res.cost)
+
+def test_rejects_inadmissible_heuristics():
+    gw = random_grid(72, 10, 10)
+    s, t = random_queries(gw, 1, seed=72)[0]
+    with pytest.raises(ValueError):
+        bidirectional_astar(gw, s, t, weight=2.0)
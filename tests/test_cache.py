@@ -0,0 +1,46 @@
+from a_star import PathCache, cached_find_path, find_path, HPAGraph, OBSTACLE
+from conftest import random_grid, random_queries
+
+
+def test_results_are_not_shared_between_engines():
+    gw = random_grid(11, 64, 48)
+    graph = HPAGraph(gw, cluster_size=8)
+    cache = PathCache()
+    for s, t in random_queries(gw, 30, seed=11):
+        hpa = cached_find_path(gw, s, t, cache, engine="hpa", graph=graph)
+        assert hpa.cost == find_path(gw, s, t, engine="hpa", graph=graph).cost
+        assert cached_find_path(gw, s, t, cache, engine="flat").cost == find_path(gw, s, t, engine="flat").cost
+        assert cached_find_path(gw, s, t, cache, engine="flat", weight=3.0).cost == \
+            find_path(gw, s, t, engine="flat", weight=3.0).cost
+        assert cached_find_path(gw, s, t, cache, engine="theta").cost == find_path(gw, s, t, engine="theta").cost
+
+def test_hits_and_reverse_hits():
+    gw = random_grid(12, 30, 30)
+    cache = PathCache()
+    queries = random_queries(gw, 10, seed=12)
+    first = [cached_find_path(gw, s, t, cache) for s, t in queries]
+    again = [cached_find_path(gw, t, s, cache) for s, t in queries]
+    assert cache.misses == len(queries)
+    assert cache.reverse_hits == len(queries)
+    for a, b in zip(first, again):
+        assert a.cost == b.cost
+        assert (a.path[::-1] if a.path else a.path) == b.path
+
+def test_edits_invalidate():
+    gw = random_grid(13, 20, 20)
+    cache = PathCache()
+    s, t = random_queries(gw, 1, seed=13)[0]
+    cached_find_path(gw, s, t, cache)
+    x, y = next(c for c in cached_find_path(gw, s, t, cache).path if c not in (s, t))
+    gw.set_cell(x, y, OBSTACLE)
+    assert cached_find_path(gw, s, t, cache).cost == find_path(gw, s, t).cost
+    assert cache.misses == 2 and cache.hits == 1
+
+def test_timed_anytime_queries_bypass_the_cache():
+    gw = random_grid(14, 40, 40)
+    cache = PathCache()
+    s, t = random_queries(gw, 1, seed=14)[0]
+    cached_find_path(gw, s, t, cache, engine="ara", deadline_ms=1000)
+    assert len(cache) == 0
+    cached_find_path(gw, s, t, cache, engine="ara", max_nodes=50)
+    assert len(cache) == 1
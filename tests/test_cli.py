@@ -0,0 +1,76 @@
+import json
+import os
+import subprocess
+import sys
+
+from conftest import random_queries
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(*args):
+    # warnings are errors: runpy complains if the package imported the module already
+    return subprocess.run([sys.executable, "-W", "error", "-m", *args], cwd=ROOT,
+                          capture_output=True, text=True, timeout=120)
+
+
+def test_package_import_leaves_cli_modules_alone():
+    code = ("import sys, a_star; print(sorted(m for m in sys.modules if m in "
+            "('a_star.batch', 'a_star.mapfile', 'a_star.trace', 'a_star.visual')))")
+    res = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    assert res.stdout.strip() == "[]"
+
+def test_batch_cli_runs_once():
+    res = _run("a_star.batch", "--size", "40", "--random-queries", "20", "--workers", "2")
+    assert res.returncode == 0, res.stderr
+    assert "RuntimeWarning" not in res.stderr
+    lines = [json.loads(line) for line in res.stdout.splitlines()]
+    assert [r["i"] for r in lines] == list(range(20))
+
+def test_mapfile_and_trace_clis(tmp_path):
+    astm = str(tmp_path / "m.astm")
+    assert _run("a_star.mapfile", "random", "50", astm, "--seed", "1").returncode == 0
+    info = _run("a_star.mapfile", "info", astm)
+    assert info.returncode == 0 and "50" in info.stdout
+    traces = str(tmp_path / "traces")
+    res = _run("a_star.batch", "--map", astm, "--random-queries", "4", "--workers", "1",
+               "--engine", "astar", "--trace-dir", traces)
+    assert res.returncode == 0, res.stderr
+    info = _run("a_star.trace", "info", os.path.join(traces, "0.astt"))
+    assert info.returncode == 0 and "steps" in info.stdout
+
+def test_batch_cli_closes_query_file(tmp_path):
+    queries = tmp_path / "q.txt"
+    queries.write_text("0 0 5 5\n1 1 7 3\n", encoding="utf-8")
+    out = tmp_path / "out.ndjson"
+    res = _run("a_star.batch", "--size", "20", "--density", "0", "--queries", str(queries),
+               "--workers", "1", "--out", str(out))
+    assert res.returncode == 0 and res.stderr == "", res.stderr
+    assert [json.loads(line)["i"] for line in out.read_text(encoding="utf-8").splitlines()] == [0, 1]
+
+def test_batch_cli_rle_densifies_any_angle_paths(tmp_path):
+    from a_star import open_map, theta_star, lazy_theta_star, densify, read_export
+    astm = str(tmp_path / "m.astm")
+    assert _run("a_star.mapfile", "random", "40", astm, "--seed", "3").returncode == 0
+    gw = open_map(astm)
+    queries = random_queries(gw, 6, seed=3)
+    qfile = tmp_path / "q.txt"
+    qfile.write_text("".join(f"{sx} {sy} {gx} {gy}\n" for (sx, sy), (gx, gy) in queries), encoding="utf-8")
+    for engine, fn in (("theta", theta_star), ("lazytheta", lazy_theta_star)):
+        for fmt in ("ndjson", "binary"):
+            out = str(tmp_path / f"{engine}.{fmt}")
+            res = _run("a_star.batch", "--map", astm, "--queries", str(qfile), "--workers", "1",
+                       "--engine", engine, "--format", fmt, "--path-encoding", "rle", "--out", out)
+            assert res.returncode == 0, res.stderr
+            records = list(read_export(out))
+            assert [r.index for r in records] == list(range(len(queries)))
+            for rec, (s, t) in zip(records, queries):
+                ref = fn(gw, s, t)
+                if rec.path is None:
+                    assert rec.cost is None
+                    continue
+                assert rec.path[0] == s and rec.path[-1] == t
+                assert all(max(abs(x1 - x0), abs(y1 - y0)) == 1
+                           for (x0, y0), (x1, y1) in zip(rec.path, rec.path[1:]))
+                assert rec.path == densify(ref.path) and rec.cost == ref.cost
+    gw.map_file.close()
@@ -0,0 +1,41 @@
+from collections import Counter
+
+from a_star import ComponentIndex, astar
+from conftest import random_grid, random_queries, random_edits
+
+
+def _partition(index):
+    # labels renumbered by first appearance, so equal partitions compare equal
+    canon = {-1: -1}
+    return [canon.setdefault(lab, len(canon) - 1) for lab in index.labels]
+
+def _check(gw, index):
+    fresh = ComponentIndex(gw)
+    assert _partition(index) == _partition(fresh)
+    counts = Counter(lab for lab in index.labels if lab >= 0)
+    assert {lab: n for lab, n in index.sizes.items() if n} == dict(counts)
+    assert len(index) == len(fresh)
+
+def test_connected_matches_astar(grids):
+    for gw in grids:
+        index = ComponentIndex(gw)
+        for s, t in random_queries(gw, 25, seed=gw.width * 3):
+            assert index.connected(s, t) == (astar(gw, s, t).path is not None)
+
+def test_single_cell_updates_match_rebuild():
+    for seed in (110, 111):
+        gw = random_grid(seed, 40, 30, density=0.4)
+        index = ComponentIndex(gw)
+        for round_ in range(60):
+            index.update(random_edits(gw, 1, seed * 100 + round_))
+            _check(gw, index)
+        for s, t in random_queries(gw, 20, seed):
+            assert index.connected(s, t) == (astar(gw, s, t).path is not None)
+
+def test_batch_updates_match_rebuild():
+    gw = random_grid(112, 64, 48, density=0.35)
+    index = ComponentIndex(gw)
+    for count in (5, 40, 2000):
+        # the last batch is large enough to relabel everything
+        index.update(random_edits(gw, count, count))
+        _check(gw, index)
@@ -0,0 +1,66 @@
+import random
+
+from a_star import DStarLite, FREE, OBSTACLE, astar
+from conftest import random_grid, random_queries, add_terrain, path_cost
+
+
+def _edit(gw, rng, keep, count):
+    changed = []
+    while len(changed) < count:
+        x, y = rng.randrange(gw.width), rng.randrange(gw.height)
+        if (x, y) in keep:
+            continue
+        gw.set_cell(x, y, FREE if gw.grid[y][x] == OBSTACLE else OBSTACLE)
+        changed.append((x, y))
+    return changed
+
+def _check(gw, dstar, res):
+    ref = astar(gw, dstar.start, dstar.goal)
+    assert res.cost == ref.cost
+    assert res.cost == DStarLite(gw, dstar.start, dstar.goal).plan().cost
+    if res.path is not None:
+        assert res.path[0] == dstar.start and res.path[-1] == dstar.goal
+        assert path_cost(gw, res.path) == res.cost
+
+def test_updates_match_a_fresh_plan():
+    for seed, terrain in ((60, False), (61, True), (62, False)):
+        gw = random_grid(seed, 36, 28, density=0.2)
+        if terrain:
+            add_terrain(gw, seed)
+        rng = random.Random(seed)
+        for s, t in random_queries(gw, 3, seed):
+            dstar = DStarLite(gw, s, t)
+            _check(gw, dstar, dstar.plan())
+            for _ in range(6):
+                changed = _edit(gw, rng, (s, t), rng.randrange(1, 15))
+                _check(gw, dstar, dstar.update(changed))
+
+def test_terrain_edits_and_lower_weights():
+    gw = random_grid(63, 30, 30, density=0.15)
+    gw.fill_costs(0, 0, gw.width, gw.height, 4)
+    s, t = random_queries(gw, 1, seed=63)[0]
+    dstar = DStarLite(gw, s, t)
+    dstar.plan()
+    rng = random.Random(63)
+    for w in (9, 6, 3, 1):
+        # 3 and 1 lower the smallest weight, which restarts the search
+        cells = [(rng.randrange(gw.width), rng.randrange(gw.height)) for _ in range(20)]
+        for x, y in cells:
+            gw.set_cost(x, y, w)
+        _check(gw, dstar, dstar.update(cells))
+
+def test_moving_start_keeps_the_plan_valid():
+    gw = random_grid(64, 40, 40, density=0.2)
+    rng = random.Random(64)
+    for s, t in random_queries(gw, 5, seed=64):
+        dstar = DStarLite(gw, s, t)
+        res = dstar.plan()
+        if res.path is None or len(res.path) < 6:
+            continue
+        for _ in range(3):
+            if res.path is None or len(res.path) < 3:
+                break
+            dstar.move_start(res.path[2])
+            changed = _edit(gw, rng, (dstar.start, t), 5)
+            res = dstar.update(changed)
+            _check(gw, dstar, res)
@@ -0,0 +1,69 @@
+import io
+
+import pytest
+
+from a_star import (NdjsonWriter, BinaryWriter, open_writer, read_ndjson, read_binary, read_export,
+                    encode_rle, decode_rle, find_path, OBSTACLE)
+from conftest import random_grid, random_queries
+
+
+def _results():
+    gw = random_grid(100, 45, 35, density=0.3)
+    queries = random_queries(gw, 25, seed=100)
+    # the last goal is walled in: a record without a path
+    gx, gy = queries[-1][1]
+    for x in range(gx - 1, gx + 2):
+        for y in range(gy - 1, gy + 2):
+            if (x, y) != (gx, gy) and gw.in_bounds(x, y):
+                gw.set_cell(x, y, OBSTACLE)
+    return gw, [(i, s, t, find_path(gw, s, t)) for i, (s, t) in enumerate(queries)]
+
+def _check(records, results, with_path=True):
+    records = list(records)
+    assert len(records) == len(results)
+    for rec, (i, s, t, res) in zip(records, results):
+        assert (rec.index, rec.start, rec.goal, rec.cost, rec.nodes_expanded) == (i, s, t, res.cost, res.nodes_expanded)
+        assert rec.time_ms == pytest.approx(res.time_ms, abs=1e-3)
+        assert rec.path == (res.path if with_path else None)
+
+def test_rle_round_trip():
+    gw, results = _results()
+    paths = [res.path for *_, res in results if res.path]
+    paths.append([(0, 0)] + [(i, 0) for i in range(1, 80)])  # runs longer than a binary rle byte
+    for path in paths:
+        assert decode_rle(path[0], encode_rle(path)) == path
+
+def test_ndjson_round_trip():
+    gw, results = _results()
+    for encoding in ("coords", "rle", None):
+        buf = io.StringIO()
+        writer = NdjsonWriter(buf, encoding)
+        for i, s, t, res in results:
+            writer.write_result(i, s, t, res)
+        writer.close()
+        buf.seek(0)
+        _check(read_ndjson(buf), results, with_path=encoding is not None)
+
+def test_binary_round_trip():
+    gw, results = _results()
+    for encoding in ("cells", "rle", None):
+        buf = io.BytesIO()
+        writer = BinaryWriter(buf, gw.width, encoding)
+        for i, s, t, res in results:
+            writer.write_result(i, s, t, res)
+        writer.close()
+        buf.seek(0)
+        _check(read_binary(buf), results, with_path=encoding is not None)
+
+def test_read_export_detects_the_format(tmp_path):
+    gw, results = _results()
+    for fmt in ("ndjson", "binary"):
+        path = tmp_path / f"out.{fmt}"
+        with open(path, "wb" if fmt == "binary" else "w", encoding=None if fmt == "binary" else "utf-8") as f:
+            writer = open_writer(f, fmt, "rle", width=gw.width)
+            for i, s, t, res in results:
+                writer.write_result(i, s, t, res)
+            writer.close()
+        _check(read_export(str(path)), results)
+    with pytest.raises(ValueError):
+        list(read_binary(io.BytesIO(b"ASTP" + bytes(4))))
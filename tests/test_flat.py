@@ -0,0 +1,29 @@
+from a_star import FlatGrid, astar, astar_flat
+from conftest import random_grid, random_queries, add_terrain, random_edits, path_cost
+
+
+def test_same_paths_as_astar(grids):
+    for gw in grids + [add_terrain(random_grid(40, 40, 30), 40)]:
+        fg = FlatGrid(gw)
+        for s, t in random_queries(gw, 15, seed=gw.width):
+            for weight in (1.0, 2.0):
+                ref = astar(gw, s, t, weight=weight)
+                res = astar_flat(gw, s, t, weight=weight, fg=fg)
+                assert (res.path, res.cost, res.nodes_expanded) == (ref.path, ref.cost, ref.nodes_expanded)
+                if res.path is not None:
+                    assert res.path[0] == s and res.path[-1] == t
+                    cost = path_cost(gw, res.path)
+                    # weighted A* does not re-expand improved cells, so its cost can overstate the path
+                    assert cost == res.cost if weight == 1 else cost <= res.cost
+
+def test_refresh_matches_rebuild():
+    gw = add_terrain(random_grid(41, 35, 25), 41)
+    fg = FlatGrid(gw)
+    for seed in range(5):
+        changed = random_edits(gw, 12, seed)
+        gw.set_cost(*changed[0], 7)
+        fg.refresh(gw, changed)
+        fresh = FlatGrid(gw)
+        assert (fg.blocked, fg.mask, fg.weights, fg.w_min) == (fresh.blocked, fresh.mask, fresh.weights, fresh.w_min)
+        for s, t in random_queries(gw, 5, seed):
+            assert astar_flat(gw, s, t, fg=fg).cost == astar(gw, s, t).cost
@@ -0,0 +1,155 @@
+import copy
+import pickle
+
+import pytest
+
+from a_star import GridWorld, FREE, OBSTACLE, START, GOAL, find_path, save_map, open_map
+from conftest import random_grid, random_queries, add_terrain
+
+
+def _same_map(a, b):
+    assert (a.width, a.height, a.start, a.goal, a.density) == (b.width, b.height, b.start, b.goal, b.density)
+    assert bytes(a.cells) == bytes(b.cells)
+    assert (None if a.costs is None else list(a.costs)) == (None if b.costs is None else list(b.costs))
+
+
+def test_pickle_and_deepcopy_round_trip(tmp_path):
+    gw = add_terrain(random_grid(140, 23, 17), 140)
+    gw.set_start((0, 0))
+    gw.set_goal((22, 16))
+    path = str(tmp_path / "m.astm")
+    save_map(path, gw)
+    mapped = open_map(path)
+    for src in (GridWorld(10), gw, mapped):
+        before = src.grid[1][1]
+        for dup in (pickle.loads(pickle.dumps(src)), copy.deepcopy(src)):
+            _same_map(dup, src)
+            assert dup.version != src.version
+            assert not hasattr(dup, "map_file")
+            # an independent, writable copy whose row views follow its own buffer
+            dup.set_cell(1, 1, OBSTACLE)
+            assert dup.grid[1][1] == dup.cells[dup.width + 1] == OBSTACLE
+            assert src.grid[1][1] == before
+    s, t = random_queries(gw, 1, seed=140)[0]
+    assert find_path(copy.deepcopy(gw), s, t).cost == find_path(gw, s, t).cost
+    mapped.map_file.close()
+
+
+def _bulk_grids():
+    # an in-memory grid and one over a caller's buffer, both with terrain and endpoints
+    for gw in (random_grid(141, 19, 11), GridWorld.from_buffer(19, memoryview(bytearray(19 * 11)), height=11)):
+        add_terrain(gw, 141)
+        gw.set_start((2, 3))
+        gw.set_goal((15, 8))
+        yield gw
+
+def _check_endpoints(gw, start, goal):
+    assert (gw.start, gw.goal) == (start, goal)
+    assert gw.grid[3][2] == START and gw.grid[8][15] == GOAL
+
+
+def test_fill_and_erase_region():
+    for gw in _bulk_grids():
+        costs = list(gw.costs)
+        before = bytes(gw.cells)
+        v = gw.version
+        gw.fill_region(1, 2, 17, 10)
+        assert gw.version > v
+        for y in range(gw.height):
+            for x in range(gw.width):
+                inside = 1 <= x < 17 and 2 <= y < 10
+                if (x, y) in ((2, 3), (15, 8)):
+                    continue
+                assert gw.grid[y][x] == (OBSTACLE if inside else before[y * gw.width + x]), (x, y)
+        _check_endpoints(gw, (2, 3), (15, 8))
+        assert list(gw.costs) == costs
+        # out-of-range corners are clipped; an empty region changes nothing
+        v = gw.version
+        gw.erase_region(-5, 5, 100, 7)
+        assert gw.version > v
+        for y in range(gw.height):
+            for x in range(gw.width):
+                if 5 <= y < 7:
+                    assert gw.grid[y][x] == FREE, (x, y)
+                elif 2 <= y < 10 and 1 <= x < 17 and (x, y) not in ((2, 3), (15, 8)):
+                    assert gw.grid[y][x] == OBSTACLE, (x, y)
+        _check_endpoints(gw, (2, 3), (15, 8))
+        assert list(gw.costs) == costs
+        v = gw.version
+        gw.fill_region(5, 5, 5, 9)
+        assert gw.version == v
+        # filling with FREE over the endpoints keeps them
+        gw.fill_region(0, 0, gw.width, gw.height, FREE)
+        _check_endpoints(gw, (2, 3), (15, 8))
+        assert sum(c == FREE for c in gw.cells) == gw.width * gw.height - 2
+
+
+def test_randomize_and_clear():
+    for gw in _bulk_grids():
+        costs = list(gw.costs)
+        v = gw.version
+        gw.randomize_obstacles(0.4, seed=7)
+        assert gw.version > v
+        _check_endpoints(gw, (2, 3), (15, 8))
+        assert set(gw.cells) <= {FREE, OBSTACLE, START, GOAL}
+        assert 0.2 < sum(c == OBSTACLE for c in gw.cells) / len(gw.cells) < 0.6
+        assert list(gw.costs) == costs
+        # the same seed gives the same map
+        other = GridWorld(width=19, height=11)
+        other.set_start((2, 3))
+        other.set_goal((15, 8))
+        other.randomize_obstacles(0.4, seed=7)
+        assert bytes(other.cells) == bytes(gw.cells)
+        v = gw.version
+        gw.clear_obstacles()
+        assert gw.version > v
+        _check_endpoints(gw, (2, 3), (15, 8))
+        assert OBSTACLE not in bytes(gw.cells)
+        assert list(gw.costs) == costs
+        v = gw.version
+        gw.clear_costs()
+        assert gw.version > v and gw.costs is None and gw.min_cost() == 1
+        gw.set_cost(4, 4, 3)
+        v = gw.version
+        gw.clear_all()
+        assert gw.version > v
+        assert (gw.start, gw.goal, gw.costs) == (None, None, None)
+        assert bytes(gw.cells) == bytes(gw.width * gw.height)
+        assert all(bytes(row) == bytes(gw.width) for row in gw.grid)
+
+
+def test_resize_keeps_the_overlap():
+    gw = add_terrain(random_grid(142, 17, 9), 142)
+    gw.set_start((3, 2))
+    gw.set_goal((16, 8))
+    old = [[(gw.grid[y][x], gw.cost_at(x, y)) for x in range(17)] for y in range(9)]
+    for width, height in ((25, 12), (17, 30), (6, 4), (40, 3), (3, 40)):
+        v = gw.version
+        gw.resize(width, height)
+        assert (gw.width, gw.height) == (width, height) and gw.version > v
+        assert len(gw.cells) == len(gw.costs) == width * height
+        assert len(gw.grid) == height and all(len(row) == width for row in gw.grid)
+        for y in range(height):
+            for x in range(width):
+                expect = old[y][x] if x < len(old[0]) and y < len(old) else (FREE, 1)
+                assert (gw.grid[y][x], gw.cost_at(x, y)) == expect, (width, height, x, y)
+        old = [[(gw.grid[y][x], gw.cost_at(x, y)) for x in range(width)] for y in range(height)]
+        # the endpoints stay only while they are inside
+        assert gw.start == ((3, 2) if 3 < width and 2 < height else None)
+        if gw.goal is not None:
+            assert gw.goal == (16, 8) and 16 < width and 8 < height
+    assert gw.start is None and gw.goal is None
+    # new endpoints go on the resized grid
+    gw.set_start((0, 0))
+    gw.set_goal((2, 39))
+    assert gw.grid[0][0] == START and gw.grid[39][2] == GOAL
+
+
+def test_from_buffer_checks_the_size():
+    buf = bytearray(6 * 4)
+    gw = GridWorld.from_buffer(6, buf, height=4)
+    gw.set_cell(5, 3, OBSTACLE)
+    assert buf[-1] == OBSTACLE
+    for width, height, size in ((6, 4, 23), (6, 4, 25), (5, None, 24), (0, 4, 0)):
+        with pytest.raises(ValueError):
+            GridWorld.from_buffer(width, bytearray(size), height=height)
@@ -0,0 +1,59 @@
+import pytest
+
+from a_star import HEURISTICS, astar, find_path, get_heuristic, register_heuristic
+from conftest import random_grid, random_queries, add_terrain, path_cost
+
+NAMES = sorted(HEURISTICS)
+
+
+def _cases(grids):
+    for gw in grids + [add_terrain(random_grid(170, 40, 30), 170, cells=300)]:
+        for s, t in random_queries(gw, 8, seed=gw.width + 170):
+            yield gw, s, t, astar(gw, s, t).cost
+
+
+def test_registered_bounds_hold(grids):
+    for gw, s, t, optimal in _cases(grids):
+        for name in NAMES:
+            for engine in ("astar", "flat"):
+                res = find_path(gw, s, t, engine, heuristic=name)
+                assert res.bound == HEURISTICS[name].bound
+                if optimal is None:
+                    assert res.path is None
+                    continue
+                assert path_cost(gw, res.path) == res.cost <= res.bound * optimal, (name, engine, s, t)
+                if res.bound == 1:
+                    assert res.cost == optimal
+
+def test_weight_scales_the_bound(grids):
+    for weight in (1.5, 3):
+        for name in NAMES:
+            h = get_heuristic(name, weight)
+            assert h.bound == pytest.approx(HEURISTICS[name].bound * weight)
+            assert h.fn(7, 3) == int(weight * HEURISTICS[name].fn(7, 3))
+        for gw, s, t, optimal in _cases(grids):
+            if optimal is None:
+                continue
+            for name in ("octile", "euclidean"):
+                res = find_path(gw, s, t, "flat", heuristic=name, weight=weight)
+                assert res.bound == pytest.approx(HEURISTICS[name].bound * weight)
+                assert path_cost(gw, res.path) == res.cost <= res.bound * optimal
+    assert get_heuristic("octile", 1) is HEURISTICS["octile"]
+    with pytest.raises(ValueError, match="weight"):
+        get_heuristic("octile", 0.5)
+
+def test_unknown_name_is_a_clear_error():
+    gw = random_grid(171, 10)
+    with pytest.raises(ValueError, match=r"unknown heuristic 'taxicab'.*octile"):
+        get_heuristic("taxicab")
+    with pytest.raises(ValueError, match="unknown heuristic"):
+        find_path(gw, (0, 0), (9, 9), heuristic="taxicab")
+
+def test_registered_heuristic_is_usable():
+    register_heuristic("half_octile", lambda dx, dy: HEURISTICS["octile"].fn(dx, dy) // 2, 1.0, "admisible")
+    try:
+        gw = random_grid(172, 25)
+        for s, t in random_queries(gw, 5, seed=172):
+            assert find_path(gw, s, t, heuristic="half_octile").cost == astar(gw, s, t).cost
+    finally:
+        del HEURISTICS["half_octile"]
@@ -0,0 +1,47 @@
+from a_star import HPAGraph, FREE, astar, hpa
+from conftest import random_grid, random_queries, add_terrain, random_edits, path_cost
+
+
+def _check_queries(gw, graph, queries):
+    for s, t in queries:
+        ref = astar(gw, s, t)
+        res = graph.find_path(s, t)
+        if ref.path is None:
+            assert res.path is None
+            continue
+        assert res.path[0] == s and res.path[-1] == t
+        assert path_cost(gw, res.path) == res.cost >= ref.cost
+        assert graph.find_path(s, t, refine=False).cost == res.cost
+
+def test_valid_paths_no_shorter_than_astar(grids):
+    for gw in grids + [add_terrain(random_grid(80, 50, 40), 80)]:
+        for cluster_size in (4, 8):
+            graph = HPAGraph(gw, cluster_size=cluster_size)
+            _check_queries(gw, graph, random_queries(gw, 12, seed=cluster_size))
+
+def test_update_matches_rebuild():
+    for seed, terrain in ((81, False), (82, True)):
+        gw = random_grid(seed, 45, 33, density=0.2)
+        if terrain:
+            add_terrain(gw, seed)
+        graph = HPAGraph(gw, cluster_size=8, entrance_width=4)
+        for round_ in range(4):
+            changed = random_edits(gw, 10, seed * 10 + round_)
+            if terrain:
+                gw.set_cost(*changed[-1], 6)
+            graph.update(changed)
+            fresh = HPAGraph(gw, cluster_size=8, entrance_width=4)
+            assert graph.inter == fresh.inter
+            assert graph.intra == fresh.intra
+            assert graph.version == gw.version
+            _check_queries(gw, graph, random_queries(gw, 6, seed=round_))
+
+def test_engine_rebuilds_stale_graphs():
+    gw = random_grid(83, 30, 30)
+    graph = HPAGraph(gw, cluster_size=6)
+    s, t = random_queries(gw, 1, seed=83)[0]
+    random_edits(gw, 20, 83)
+    gw.set_cell(*s, FREE)
+    gw.set_cell(*t, FREE)
+    # rebuilt with the graph's own parameters, as the path cache assumes
+    assert hpa(gw, s, t, graph=graph).cost == HPAGraph(gw, cluster_size=6).find_path(s, t).cost
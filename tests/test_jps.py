@@ -0,0 +1,37 @@
+import pytest
+
+from a_star import FlatGrid, astar, jps, jps_steps
+from conftest import random_grid, random_queries, add_terrain, path_cost
+
+
+def test_optimal_costs_on_uniform_grids(grids):
+    for gw in grids:
+        fg = FlatGrid(gw)
+        for s, t in random_queries(gw, 20, seed=gw.height):
+            ref = astar(gw, s, t)
+            res = jps(gw, s, t, fg=fg)
+            if ref.path is None:
+                assert res.path is None
+                continue
+            assert res.cost == ref.cost
+            assert res.path[0] == s and res.path[-1] == t
+            assert path_cost(gw, res.path) == res.cost
+            assert res.nodes_expanded <= ref.nodes_expanded
+
+def test_steps_end_like_the_one_shot_search():
+    gw = random_grid(50, 40, 40)
+    for s, t in random_queries(gw, 5, seed=50):
+        events = list(jps_steps(gw, s, t))
+        res = jps(gw, s, t)
+        last = events[-1]
+        if res.path is None:
+            assert last[0] == 'no_path'
+        else:
+            assert last[:4] == ('done', res.path, res.nodes_expanded, res.cost)
+        assert sum(ev[0] == 'delta' for ev in events) == res.nodes_expanded
+
+def test_rejects_weighted_terrain():
+    gw = add_terrain(random_grid(51, 20, 20), 51)
+    s, t = random_queries(gw, 1, seed=51)[0]
+    with pytest.raises(ValueError):
+        jps(gw, s, t)
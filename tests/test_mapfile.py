@@ -0,0 +1,61 @@
+import pytest
+
+from a_star import (MapFile, MapFormatError, save_map, open_map, create_map, find_path, OBSTACLE, FREE)
+from conftest import random_grid, random_queries, add_terrain
+
+
+def test_save_open_round_trip(tmp_path):
+    path = str(tmp_path / "m.astm")
+    for gw in (random_grid(90, 37, 23), add_terrain(random_grid(91, 20, 31), 91)):
+        gw.set_start(random_queries(gw, 1, seed=90)[0][0])
+        gw.goal = (gw.width - 1, gw.height - 1)
+        revision = save_map(path, gw)
+        mapped = open_map(path)
+        assert (mapped.width, mapped.height, mapped.start, mapped.goal) == (gw.width, gw.height, gw.start, gw.goal)
+        assert bytes(mapped.cells) == bytes(gw.cells)
+        assert (mapped.costs is None) == (gw.costs is None)
+        if gw.costs is not None:
+            assert list(mapped.costs) == list(gw.costs)
+        assert mapped.map_file.revision == revision
+        for s, t in random_queries(gw, 5, seed=91):
+            assert find_path(mapped, s, t).cost == find_path(gw, s, t).cost
+        with pytest.raises(TypeError):
+            mapped.set_cell(0, 0, OBSTACLE if mapped.grid[0][0] != OBSTACLE else FREE)
+        mapped.map_file.close()
+    assert save_map(path, gw) == revision + 1
+
+def test_writable_edits_reach_the_file(tmp_path):
+    path = str(tmp_path / "w.astm")
+    create_map(path, 12, height=7)
+    gw = open_map(path, writable=True)
+    assert bytes(gw.cells) == bytes(12 * 7)
+    gw.set_cell(3, 4, OBSTACLE)
+    gw.set_start((0, 0))
+    gw.map_file.write_header(gw)
+    gw.map_file.flush()
+    with MapFile(path) as mf:
+        assert mf.row(4)[3] == OBSTACLE and mf.start == (0, 0) and mf.revision == 2
+
+def test_windows_and_rows(tmp_path):
+    path = str(tmp_path / "big.astm")
+    gw = add_terrain(random_grid(92, 50, 40), 92)
+    save_map(path, gw)
+    with MapFile(path) as mf:
+        rows = b"".join(bytes(chunk) for _, chunk in mf.iter_rows(chunk_rows=7))
+        assert rows == bytes(gw.cells)
+        win = mf.window(45, -2, 10, 6)
+        assert win.offset == (45, -2)
+        for y in range(6):
+            for x in range(10):
+                fx, fy = x + 45, y - 2
+                if gw.in_bounds(fx, fy):
+                    assert win.grid[y][x] == gw.grid[fy][fx]
+                    assert win.cost_at(x, y) == gw.cost_at(fx, fy)
+                else:
+                    assert win.grid[y][x] == OBSTACLE
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "bad.astm"
+    path.write_bytes(b"NOPE" + bytes(100))
+    with pytest.raises(MapFormatError):
+        open_map(str(path))
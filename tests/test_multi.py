@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from a_star import OBSTACLE, astar, nearest_goals, distance_matrix
+from a_star.multi import MAX_HEURISTIC_GOALS
+from conftest import random_grid, free_cells, add_terrain, path_cost
+
+
+def _walled(gw, seed):
+    """A free cell with every neighbour turned into an obstacle: unreachable from anywhere else."""
+    rng = random.Random(seed)
+    x, y = rng.choice([(x, y) for x, y in free_cells(gw) if 0 < x < gw.width - 1 and 0 < y < gw.height - 1])
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if dx or dy:
+                gw.set_cell(x + dx, y + dy, OBSTACLE)
+    return x, y
+
+def _grid(seed, width, height):
+    gw = add_terrain(random_grid(seed, width, height), seed)
+    return gw, _walled(gw, seed)
+
+
+def test_nearest_goals_match_astar():
+    for seed, count in ((150, 6), (151, MAX_HEURISTIC_GOALS + 9)):
+        gw, hidden = _grid(seed, 35, 28)
+        rng = random.Random(seed)
+        start, *goals = rng.sample([c for c in free_cells(gw) if c != hidden], count + 1)
+        goals.append(hidden)
+        costs = {g: astar(gw, start, g).cost for g in goals}
+        reachable = sorted(c for c in costs.values() if c is not None)
+        found = nearest_goals(gw, start, goals, k=len(goals))
+        assert [res.cost for _, res in found] == reachable
+        assert hidden not in dict(found)
+        for goal, res in found:
+            assert res.cost == costs[goal]
+            assert res.path[0] == start and res.path[-1] == goal
+            assert path_cost(gw, res.path) == res.cost
+        for k in (1, 3):
+            assert [res.cost for _, res in nearest_goals(gw, start, goals, k=k)] == reachable[:k]
+    # only the unreachable goal: nothing comes back
+    assert nearest_goals(gw, start, [hidden]) == []
+
+def test_nearest_goals_needs_an_exact_heuristic():
+    gw = random_grid(152, 10)
+    with pytest.raises(ValueError):
+        nearest_goals(gw, (0, 0), [(9, 9)], heuristic="manhattan")
+
+
+def test_distance_matrix_matches_astar():
+    gw, hidden = _grid(153, 30, 22)
+    rng = random.Random(153)
+    cells = rng.sample(free_cells(gw), 11)
+    sources, targets = cells[:5] + [hidden], cells[5:] + [hidden, cells[0]]
+    serial = distance_matrix(gw, sources, targets, keep_trees=True)
+    pooled = distance_matrix(gw, sources, targets, workers=2, keep_trees=True)
+    assert serial.shape == pooled.shape == (len(sources), len(targets))
+    assert list(serial.dist) == list(pooled.dist) and list(serial.pred) == list(pooled.pred)
+    T = len(targets)
+    for m in (serial, pooled):
+        for i, s in enumerate(sources):
+            assert m.row(i) == [m.distance(i, j) for j in range(T)]
+            for j, t in enumerate(targets):
+                ref = astar(gw, s, t).cost
+                assert m.distance(i, j) == ref, (s, t)
+                path = m.path(i, j)
+                if ref is None:
+                    assert path is None and m.pred[i*T + j] == -1
+                    continue
+                assert path[0] == s and path[-1] == t
+                assert path_cost(gw, path) == ref
+                px, py = path[-2] if len(path) > 1 else (-1, 0)
+                assert m.pred[i*T + j] == (py * gw.width + px if len(path) > 1 else -1)
+    # the walled cell still reaches itself
+    assert serial.distance(len(sources) - 1, T - 2) == 0
+
+def test_distance_matrix_defaults_and_trees():
+    gw = random_grid(154, 20, 15)
+    points = random.Random(154).sample(free_cells(gw), 4)
+    m = distance_matrix(gw, points, workers=2)
+    assert m.targets == m.sources == points
+    for i in range(4):
+        assert m.distance(i, i) == 0
+        for j in range(4):
+            assert m.distance(i, j) == m.distance(j, i) == astar(gw, points[i], points[j]).cost
+    with pytest.raises(ValueError):
+        m.path(0, 1)
@@ -0,0 +1,65 @@
+from a_star import (ENGINES, STEPPERS, INSTRUMENTED_ENGINES, SearchStats, find_path, engine_steps,
+                    register_hook, unregister_hook, hooks_enabled)
+from conftest import random_grid, random_queries, add_terrain
+
+COUNTERS = ("nodes_expanded", "heap_pushes", "stale_pops", "reopenings", "peak_open", "neighbor_evals")
+UNIFORM_ONLY = ("jps", "theta", "lazytheta")
+
+
+def _counters(stats):
+    return tuple(getattr(stats, name) for name in COUNTERS)
+
+def test_engines_count_in_their_own_loop():
+    for seed, terrain in ((21, False), (22, True)):
+        gw = random_grid(seed, 48, 36)
+        if terrain:
+            add_terrain(gw, seed)
+        for s, t in random_queries(gw, 8, seed):
+            for engine in ENGINES:
+                if terrain and engine in UNIFORM_ONLY:
+                    continue
+                plain = find_path(gw, s, t, engine=engine)
+                stats = SearchStats(timers=True)
+                res = find_path(gw, s, t, engine=engine, stats=stats)
+                assert (res.path, res.cost, res.nodes_expanded, res.heap_pushes) == \
+                    (plain.path, plain.cost, plain.nodes_expanded, plain.heap_pushes)
+                assert (stats.nodes_expanded, stats.heap_pushes) == (res.nodes_expanded, res.heap_pushes)
+                if engine not in INSTRUMENTED_ENGINES:
+                    assert stats.stale_pops is None and stats.peak_open is None
+                    continue
+                assert None not in _counters(stats)
+                assert stats.peak_open >= 1 and stats.stale_pops <= stats.heap_pushes
+                assert set(stats.phases) >= {"setup", "search"}
+                if engine in STEPPERS:
+                    stepped = SearchStats()
+                    for ev in engine_steps(gw, s, t, engine=engine, stats=stepped):
+                        pass
+                    assert _counters(stepped) == _counters(stats)
+
+def test_astar_and_flat_agree():
+    gw = random_grid(23, 40, 40)
+    add_terrain(gw, 23)
+    for s, t in random_queries(gw, 10, seed=23):
+        for weight in (1.0, 3.0):
+            a, f = SearchStats(), SearchStats()
+            find_path(gw, s, t, engine="astar", weight=weight, stats=a)
+            find_path(gw, s, t, engine="flat", weight=weight, stats=f)
+            assert _counters(a) == _counters(f)
+
+def test_hooks():
+    gw = random_grid(24, 30, 30)
+    queries = random_queries(gw, 5, seed=24)
+    seen = []
+    hook = register_hook(seen.append)
+    try:
+        assert hooks_enabled()
+        for s, t in queries:
+            find_path(gw, s, t, engine="bidir")
+            for ev in engine_steps(gw, s, t, engine="jps"):
+                pass
+    finally:
+        unregister_hook(hook)
+    assert not hooks_enabled()
+    assert [st.engine for st in seen] == ["bidir", "jps"] * len(queries)
+    find_path(gw, *queries[0])
+    assert len(seen) == 2 * len(queries)
@@ -0,0 +1,76 @@
+import io
+import random
+
+from a_star import TraceWriter, TraceReplayer, record, record_search, read_trace, engine_steps, find_path
+from conftest import random_grid, random_queries, add_terrain
+
+
+def _recorded(gw, s, t, engine):
+    buf = io.BytesIO()
+    writer = TraceWriter(buf, gw.width, gw.height, s, t, engine, "octile")
+    events = list(record(engine_steps(gw, s, t, engine), writer))
+    buf.seek(0)
+    return events, read_trace(buf)
+
+def _consumer_sets(events):
+    # what a consumer of the live event stream would draw
+    fronts, closed = (set(), set()), set()
+    for ev in events:
+        frontier = fronts[len(ev) > 3 and ev[3] == 1]
+        frontier.discard(ev[1])
+        closed.add(ev[1])
+        frontier.update(ev[2])
+    return fronts, closed
+
+def test_round_trip_of_every_engine_kind():
+    gw = random_grid(130, 50, 40)
+    for engine in ("astar", "jps", "bidir", "flat", "hpa"):
+        for s, t in random_queries(gw, 4, seed=130):
+            events, trace = _recorded(gw, s, t, engine)
+            assert (trace.width, trace.height, trace.start, trace.goal, trace.engine) == \
+                (gw.width, gw.height, s, t, engine)
+            assert list(trace.events()) == events
+            assert len(trace) == len(events) - 1
+
+def test_record_search_matches_find_path(tmp_path):
+    gw = add_terrain(random_grid(131, 30, 30), 131)
+    for s, t in random_queries(gw, 5, seed=131):
+        path = tmp_path / "t.astt"
+        with open(path, "wb") as f:
+            res = record_search(gw, s, t, f, engine="astar")
+        ref = find_path(gw, s, t, engine="astar")
+        assert (res.path, res.cost, res.nodes_expanded, res.heap_pushes) == \
+            (ref.path, ref.cost, ref.nodes_expanded, ref.heap_pushes)
+        with open(path, "rb") as f:
+            trace = read_trace(f)
+        assert trace.heuristic == "octile" and len(trace) == res.nodes_expanded
+
+def test_replayer_seeks_to_the_live_state():
+    gw = random_grid(132, 40, 40)
+    rng = random.Random(132)
+    for engine in ("astar", "bidir"):
+        s, t = random_queries(gw, 1, seed=132)[0]
+        events, trace = _recorded(gw, s, t, engine)
+        replayer = TraceReplayer(trace)
+        for position in [len(trace), 0] + [rng.randrange(len(trace) + 1) for _ in range(25)]:
+            replayer.seek(position)
+            fronts, closed = _consumer_sets(events[:position])
+            assert (replayer.open, replayer.open_back, replayer.closed) == (fronts[0], fronts[1], closed)
+            assert replayer.at_end == (position == len(trace))
+            assert replayer.path == (events[-1][1] if replayer.at_end and events[-1][0] == 'done' else None)
+        replayer.seek(3)
+        replayer.step(-5)
+        assert replayer.position == 0 and not replayer.closed
+
+def test_cut_short_traces_still_replay():
+    gw = random_grid(133, 40, 40)
+    s, t = random_queries(gw, 1, seed=133)[0]
+    buf = io.BytesIO()
+    events = record(engine_steps(gw, s, t, "astar"), TraceWriter(buf, gw.width, gw.height, s, t))
+    taken = [next(events) for _ in range(10)]
+    events.close()
+    trace = read_trace(io.BytesIO(buf.getvalue()))
+    assert trace.final is None and list(trace.events()) == taken
+    replayer = TraceReplayer(trace)
+    replayer.seek(10)
+    assert replayer.at_end and replayer.path is None
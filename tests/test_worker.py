@@ -0,0 +1,135 @@
+import threading
+import time
+
+from a_star import astar, engine_steps
+from a_star.worker import SearchThread
+from conftest import random_grid, random_queries
+
+TIMEOUT = 10
+
+
+def _wait(cond):
+    deadline = time.monotonic() + TIMEOUT
+    while not cond():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.002)
+
+def _drain(th, max_events=None):
+    out = []
+    def done():
+        out.extend(th.poll(max_events))
+        return th.finished
+    _wait(done)
+    return out
+
+def _closed(events):
+    # expanded cells in delivery order, whether they came one by one or coalesced
+    cells = []
+    for ev in events:
+        if ev[0] == 'delta':
+            cells.append(ev[1])
+        elif ev[0] == 'batch':
+            cells.extend(ev[1])
+    return cells
+
+
+class _Script:
+    """n deltas then 'done'; counts what the thread has pulled and whether it was closed."""
+    def __init__(self, n, fail_at=None):
+        self.n = n
+        self.fail_at = fail_at
+        self.produced = 0
+        self.exhausted = threading.Event()
+        self.closed = threading.Event()
+    def __iter__(self):
+        try:
+            for i in range(self.n):
+                if i == self.fail_at:
+                    raise RuntimeError("engine failed")
+                self.produced += 1
+                yield ('delta', i, [i + 1])
+            self.exhausted.set()
+            yield ('done', [], self.n, 0, 0)
+        finally:
+            self.closed.set()
+
+
+def test_paced_delivers_every_event():
+    gw = random_grid(160, 30, 25)
+    for s, t in random_queries(gw, 3, seed=160):
+        expected = list(engine_steps(gw, s, t))
+        th = SearchThread(engine_steps(gw, s, t), maxsize=4).start()
+        got = _drain(th, max_events=3)
+        # the final event ends with its time_ms, which differs between runs
+        assert got[:-1] == expected[:-1] and got[-1][:-1] == expected[-1][:-1]
+        assert not th.fast
+        ref = astar(gw, s, t)
+        assert got[-1][0] == ('no_path' if ref.path is None else 'done')
+
+def test_bounded_queue_applies_back_pressure():
+    script = _Script(1000)
+    th = SearchThread(iter(script), maxsize=5).start()
+    # the worker fills the queue, holds one more event and waits
+    _wait(lambda: script.produced >= 6)
+    time.sleep(0.1)
+    assert script.produced == 6
+    assert [ev[1] for ev in th.poll(2)] == [0, 1]
+    _wait(lambda: script.produced >= 8)
+    time.sleep(0.1)
+    assert script.produced == 8
+    rest = _drain(th)
+    assert _closed(rest) == list(range(2, 1000)) and rest[-1][0] == 'done'
+
+def test_fast_coalesces_what_does_not_fit():
+    script = _Script(1000)
+    th = SearchThread(iter(script), maxsize=2, fast=True).start()
+    # nobody polls, yet the engine runs to the end
+    assert script.exhausted.wait(TIMEOUT)
+    events = _drain(th)
+    assert len(events) <= 4 and events[-1][0] == 'done'
+    assert {ev[0] for ev in events[:-1]} == {'batch'}
+    assert _closed(events) == list(range(1000))
+    assert [c for ev in events[:-1] for c in ev[2]] == list(range(1, 1001))
+
+def test_switch_to_fast_mid_run():
+    script = _Script(2000)
+    th = SearchThread(iter(script), maxsize=3).start()
+    _wait(lambda: script.produced >= 4)
+    first = th.poll(2)
+    assert [ev[0] for ev in first] == ['delta', 'delta']
+    th.run_to_completion()
+    assert th.fast
+    assert script.exhausted.wait(TIMEOUT)
+    rest = _drain(th)
+    assert _closed(first + rest) == list(range(2000))
+    assert len(rest) < 50 and rest[-1][0] == 'done'
+
+def test_cancel_stops_and_closes_the_engine():
+    script = _Script(10 ** 9)
+    th = SearchThread(iter(script), maxsize=3).start()
+    _wait(lambda: script.produced >= 4)
+    th.poll(1)
+    th.cancel()
+    assert script.closed.wait(TIMEOUT)
+    th._thread.join(TIMEOUT)
+    assert not th._thread.is_alive()
+    # what was already queued can still be read; no final event ever comes
+    left = th.poll()
+    assert len(left) <= 3 and all(ev[0] == 'delta' for ev in left)
+    assert not th.finished and script.produced < 10
+
+def test_engine_error_reaches_the_consumer():
+    script = _Script(100, fail_at=40)
+    th = SearchThread(iter(script), maxsize=4).start()
+    events = _drain(th, max_events=1)
+    assert _closed(events[:-1]) == list(range(40))
+    kind, exc = events[-1]
+    assert kind == 'error' and isinstance(exc, RuntimeError) and str(exc) == "engine failed"
+    th._thread.join(TIMEOUT)
+    assert not th._thread.is_alive()
+    # in fast mode too, after the coalesced deltas
+    script = _Script(500, fail_at=300)
+    th = SearchThread(iter(script), maxsize=2, fast=True).start()
+    events = _drain(th)
+    assert events[-1][0] == 'error' and isinstance(events[-1][1], RuntimeError)
+    assert _closed(events[:-1]) == list(range(300))